@@ -0,0 +1,90 @@
+#
+#
+# Homeless worker assignment: assign_worker per unit vs the batched assign_workers
+#
+#   python -m Benchmarks.bench_assignment [--size 32] [--units 50 100 200]
+#
+# Every unit of the player starts without a cluster, as after a wave of
+# worker builds. Cluster units are reset between runs.
+#
+#
+import argparse
+import time
+
+from lux.game import Game
+from Cluster.clusterController import ClusterController
+from Benchmarks.observations import generate_observations
+
+
+def legacy_assignment(controller, workers, game, player, opponent):
+    for worker in workers:
+        cluster = controller.assign_worker(worker, game, player, 0, opponent)
+        if cluster is not None:
+            cluster.add_unit(worker.id)
+
+
+def batched_assignment(controller, workers, game, player, opponent):
+    clusters = controller.assign_workers(workers, game, player, 0, opponent)
+    for worker, cluster in zip(workers, clusters):
+        if cluster is not None:
+            cluster.add_unit(worker.id)
+
+
+def total_score(controller, workers, game, player, opponent):
+    """
+    Sum of the scores of the workers' clusters once everyone is assigned
+    """
+    score = 0
+    for cluster in controller.clusterDict.values():
+        for unit_id in cluster.units:
+            worker = player.units_by_id[unit_id]
+            score += cluster.get_cluster_score_for_worker(worker, game, 0, opponent)
+    return score
+
+
+def time_assignment(assign, controller, workers, game, repeat):
+    player, opponent = game.players
+    elapsed = 0
+    for _ in range(repeat):
+        for cluster in controller.clusterDict.values():
+            cluster.units = []
+        start = time.perf_counter()
+        assign(controller, workers, game, player, opponent)
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat, total_score(controller, workers, game, player, opponent)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for units in args.units:
+        updates = generate_observations(args.size, args.size, units, 1)[0]
+        game = Game()
+        game._initialize(updates, incremental=True)
+        game._update(updates[2:])
+
+        player = game.players[0]
+        controller = ClusterController(args.size, args.size, game)
+        controller.getClustersRolling(args.size, args.size, game)
+        controller.update_clusters(game, player)
+        workers = list(player.units)
+
+        legacy, legacy_score = time_assignment(
+            legacy_assignment, controller, workers, game, args.repeat
+        )
+        batched, batched_score = time_assignment(
+            batched_assignment, controller, workers, game, args.repeat
+        )
+
+        print(f"{len(workers)} homeless workers, {len(controller.clusterDict)} clusters")
+        print(f"assign_worker loop    {legacy * 1000:8.3f} ms   score {legacy_score:10.1f}")
+        print(f"assign_workers        {batched * 1000:8.3f} ms   score {batched_score:10.1f}")
+        print(f"speedup               {legacy / batched:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#
+#
+# Build position ranking: get_build_position_score per candidate and a
+# cmp_to_key sort vs one BuildScoreMap per turn and a top-k gather
+#
+#   python -m Benchmarks.bench_build_scores [--size 32] [--units 60] [--turns 40]
+#
+# Every cluster ranks its exposed perimeter (BUILD_TILE) and its resource
+# cells (GUARD_CLUSTER), keeping as many positions as it has units.
+#
+#
+import argparse
+import time
+from functools import cmp_to_key
+
+from lux.game import Game
+from lux.game_map import Position
+from Cluster.clusterController import ClusterController
+from helperFunctions.helper_functions import get_build_position_score
+from Map.buildScoreMap import BuildScoreMap
+from Benchmarks.observations import generate_observations
+
+
+def legacy_best_positions(game_state, opponent, available_targets, center, count):
+    """
+    The former ranking of get_important_positions
+    """
+
+    def compare(pos1, pos2):
+        return pos2[0] - pos1[0]
+
+    pos_score_vector = []
+    for pos in available_targets:
+        score = get_build_position_score(game_state, opponent, pos, center)
+        pos_score_vector.append([score, pos])
+
+    pos_score_vector.sort(key=cmp_to_key(compare))
+    return [pos_score[1] for pos_score in pos_score_vector][:count]
+
+
+def rankings(controller):
+    """
+    (candidates, center, count) of every cluster and ranked mission type
+    """
+    queries = []
+    for cluster in controller.clusterDict.values():
+        cells = cluster.resource_cells
+        if not cells:
+            continue
+        center = Position(
+            sum(cell.pos.x for cell in cells) / len(cells),
+            sum(cell.pos.y for cell in cells) / len(cells),
+        )
+        count = max(len(cluster.units), 1)
+        queries.append((list(cluster.exposed_perimeter), center, count))
+        queries.append(([cell.pos for cell in cells], center, count))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=60)
+    parser.add_argument("--turns", type=int, default=40)
+    args = parser.parse_args()
+
+    observations = generate_observations(args.size, args.size, args.units, args.turns)
+    game = Game()
+    game._initialize(observations[0], incremental=True)
+    game._update(observations[0][2:])
+    controller = ClusterController(args.size, args.size, game)
+
+    legacy, mapped, candidates, build = 0.0, 0.0, 0, 0.0
+    for updates in observations[1:]:
+        game._update(updates)
+        player, opponent = game.players
+        controller.getClustersRolling(args.size, args.size, game)
+        controller.update_clusters(game, player)
+        queries = rankings(controller)
+        candidates += sum(len(positions) for positions, _, _ in queries)
+
+        start = time.perf_counter()
+        expected = [
+            legacy_best_positions(game, opponent, positions, center, count)
+            for positions, center, count in queries
+        ]
+        legacy += time.perf_counter() - start
+
+        start = time.perf_counter()
+        score_map = BuildScoreMap(game, opponent, controller.resource_types)
+        built = time.perf_counter()
+        ranked = [
+            score_map.best_positions(positions, center, count)
+            for positions, center, count in queries
+        ]
+        mapped += time.perf_counter() - start
+        build += built - start
+        assert ranked == expected
+
+    turns = len(observations) - 1
+    print(f"{args.size}x{args.size} map, {args.units} units per team, {turns} turns")
+    print(f"{candidates / turns:.0f} candidates per turn")
+    print(f"scores + cmp_to_key sort  {legacy / turns * 1000:8.3f} ms/turn")
+    print(f"score map + top-k         {mapped / turns * 1000:8.3f} ms/turn")
+    print(f"  of which map build      {build / turns * 1000:8.3f} ms/turn")
+    print(f"speedup                   {legacy / mapped:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
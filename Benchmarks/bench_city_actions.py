@@ -0,0 +1,88 @@
+#
+#
+# City actions: closest cluster search per citytile vs the ownership grid
+#
+#   python -m Benchmarks.bench_city_actions [--size 32] [--citytiles 100 300]
+#
+# A synthetic game gets an extra city of `citytiles` actionable tiles on
+# the free cells of the map.
+#
+#
+import argparse
+import time
+
+from lux.game import Game
+from Cluster.clusterController import ClusterController
+from helperFunctions.helper_functions import get_city_actions, update_game_stats
+from Benchmarks.observations import generate_observations
+
+
+def city_game(size, citytiles, seed=0):
+    updates = generate_observations(size, size, 5, 1, seed)[0]
+    game = Game()
+    game._initialize(updates, incremental=True)
+    game._update(updates[2:])
+
+    lines = list(updates[2:-1]) + ["c 0 c_bench 10000 0"]
+    placed = 0
+    for x in range(size):
+        for y in range(size):
+            cell = game.map.get_cell(x, y)
+            if placed < citytiles and not cell.has_resource() and cell.citytile is None:
+                lines.append(f"ct 0 c_bench {x} {y} 0")
+                placed += 1
+    game._update(lines + ["D_DONE"])
+    return game
+
+
+def time_city_actions(game, controller, grid, repeat):
+    player, opponent = game.players
+    stats = update_game_stats(0)
+    features = controller.features if grid else None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ownership = controller.ownership_grid() if grid else None
+        actions = get_city_actions(
+            game,
+            stats,
+            player,
+            controller.clusterDict,
+            0,
+            opponent,
+            1,
+            features=features,
+            ownership=ownership,
+        )
+    return (time.perf_counter() - start) / repeat, actions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--citytiles", type=int, nargs="+", default=[100, 300])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    for citytiles in args.citytiles:
+        game = city_game(args.size, citytiles)
+        player = game.players[0]
+        controller = ClusterController(args.size, args.size, game)
+        controller.getClustersRolling(args.size, args.size, game)
+        controller.update_clusters(game, player)
+
+        legacy, legacy_actions = time_city_actions(game, controller, False, args.repeat)
+        start = time.perf_counter()
+        controller.ownership_grid()
+        grid_build = time.perf_counter() - start
+        lookup, lookup_actions = time_city_actions(game, controller, True, args.repeat)
+        assert lookup_actions == legacy_actions
+
+        print(f"{player.city_tile_count} citytiles, {len(controller.clusterDict)} clusters")
+        print(f"closest cluster search  {legacy * 1000:8.3f} ms/turn")
+        print(f"ownership grid lookup   {lookup * 1000:8.3f} ms/turn")
+        print(f"grid refresh            {grid_build * 1000:8.3f} ms (when clusters change)")
+        print(f"speedup                 {legacy / lookup:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#
+#
+# Cluster detection: recursive DFS vs connected-component labelling
+#
+#   python -m Benchmarks.bench_clusters [--size 32] [--maps 20]
+#
+# Runs on synthetic maps and on a map fully covered with wood, where the
+# recursive DFS goes size * size frames deep.
+#
+#
+import argparse
+import sys
+import time
+
+from lux.game import Game
+from lux.game_map import Cell
+from Map.mapService import get_cell_neighbours_eight
+from Resources.resourceService import same_resource
+from Cluster.clusterLabelling import label_resource_clusters
+from Benchmarks.observations import generate_observations
+
+
+def legacy_clusters(game_state):
+    """
+    The former getClustersRolling search, without the DSU bookkeeping
+    """
+    width, height = game_state.map.width, game_state.map.height
+    visited_cell = [[False for _ in range(height)] for _ in range(width)]
+
+    def dfs(x, y, cluster_cells):
+        visited_cell[x][y] = True
+        real_cell = game_state.map.get_cell(x, y)
+        cluster_cells.append(real_cell)
+
+        for cell in get_cell_neighbours_eight(Cell(x, y), game_state):
+            if not visited_cell[cell.pos.x][cell.pos.y]:
+                neighbour_cell = game_state.map.get_cell(cell.pos.x, cell.pos.y)
+
+                if neighbour_cell.has_resource() and same_resource(
+                    real_cell, neighbour_cell
+                ):
+                    dfs(neighbour_cell.pos.x, neighbour_cell.pos.y, cluster_cells)
+
+    clusters = []
+    for x in range(width):
+        for y in range(height):
+            cell = game_state.map.get_cell(x, y)
+            if cell.has_resource() and not visited_cell[x][y]:
+                cluster_cells = []
+                dfs(x, y, cluster_cells)
+                clusters.append((cell.resource.type, cluster_cells))
+    return clusters
+
+
+def signature(clusters):
+    """
+    Cluster types and members, independent of the order inside a cluster
+    """
+    return [
+        (resource_type, sorted((cell.pos.x, cell.pos.y) for cell in cells))
+        for resource_type, cells in clusters
+    ]
+
+
+def time_detection(detect, games, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for game in games:
+            detect(game)
+    return (time.perf_counter() - start) / (repeat * len(games))
+
+
+def forest(size):
+    game = Game()
+    game._initialize(["0", f"{size} {size}"])
+    lines = [f"r wood {x} {y} 500" for x in range(size) for y in range(size)]
+    game._update(lines + ["D_DONE"])
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--maps", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    games = []
+    for seed in range(args.maps):
+        updates = generate_observations(args.size, args.size, 5, 1, seed)[0]
+        game = Game()
+        game._initialize(updates)
+        game._update(updates[2:])
+        games.append(game)
+
+    for game in games:
+        assert signature(label_resource_clusters(game)) == signature(
+            legacy_clusters(game)
+        )
+
+    legacy = time_detection(legacy_clusters, games, args.repeat)
+    labelling = time_detection(label_resource_clusters, games, args.repeat)
+    print(f"{args.maps} synthetic {args.size}x{args.size} maps")
+    print(f"recursive DFS         {legacy * 1000:8.3f} ms/map")
+    print(f"component labelling   {labelling * 1000:8.3f} ms/map")
+    print(f"speedup               {legacy / labelling:8.2f}x")
+
+    dense = [forest(args.size)]
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), args.size * args.size * 4))
+    legacy = time_detection(legacy_clusters, dense, args.repeat)
+    labelling = time_detection(label_resource_clusters, dense, args.repeat)
+    print(f"{args.size}x{args.size} map full of wood")
+    print(f"recursive DFS         {legacy * 1000:8.3f} ms/map")
+    print(f"component labelling   {labelling * 1000:8.3f} ms/map")
+    print(f"speedup               {legacy / labelling:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
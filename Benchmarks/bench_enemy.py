@@ -0,0 +1,101 @@
+#
+#
+# Opponent units / citytiles inside the cluster areas:
+# scan of every opponent unit vs the occupancy index
+#
+#   python -m Benchmarks.bench_enemy [--size 32] [--units 60]
+#
+#
+import argparse
+import time
+
+from lux.game import Game
+from lux.occupancy import OccupancyIndex
+from Cluster.clusterController import ClusterController
+from Enemy.enemyService import get_enemy_tiles
+from Benchmarks.observations import generate_observations
+
+
+def legacy_enemy_tiles(cells, opponent, opponent_id):
+    """
+    The former get_enemy_tiles: every unit is compared with every cell
+    """
+    opponent_citytiles = []
+    for cell in cells:
+        if cell.citytile is not None:
+            if cell.citytile.team == opponent_id:
+                opponent_citytiles.append(cell.citytile)
+
+    cell_positions = [cell.pos for cell in cells]
+    opponent_units = []
+    for unit in opponent.units:
+        pos = next(
+            (p for p in cell_positions if p.equals(unit.pos)),
+            None,
+        )
+
+        if pos is not None:
+            opponent_units.append(unit)
+
+    return opponent_citytiles, opponent_units
+
+
+def cluster_areas(game, controller):
+    areas = []
+    for cluster in controller.clusterDict.values():
+        area = [game.map.get_cell(x, y) for x, y in cluster.perimeter]
+        area.extend(cluster.resource_cells)
+        areas.append(area)
+    return areas
+
+
+def time_queries(query, areas, opponent, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        counts = [
+            tuple(map(len, query(area, opponent, opponent.team))) for area in areas
+        ]
+    return (time.perf_counter() - start) / repeat, counts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    updates = generate_observations(args.size, args.size, args.units, 1)[0]
+    game = Game()
+    game._initialize(updates, incremental=True)
+    game._update(updates[2:])
+    player, opponent = game.players
+
+    controller = ClusterController(args.size, args.size, game)
+    controller.getClustersRolling(args.size, args.size, game)
+    controller.update_clusters(game, player)
+    areas = cluster_areas(game, controller)
+
+    legacy, legacy_counts = time_queries(legacy_enemy_tiles, areas, opponent, args.repeat)
+    indexed, indexed_counts = time_queries(get_enemy_tiles, areas, opponent, args.repeat)
+    assert indexed_counts == legacy_counts
+
+    units = player.units + opponent.units
+    teams = [unit.team for unit in units]
+    xs = [unit.pos.x for unit in units]
+    ys = [unit.pos.y for unit in units]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        occupancy = OccupancyIndex(args.size, args.size, game.players)
+        occupancy._set_units(teams, xs, ys)
+    build = (time.perf_counter() - start) / args.repeat
+
+    print(f"{len(opponent.units)} opponent units, {len(areas)} cluster areas")
+    print(f"unit scan per area    {legacy * 1000:8.3f} ms (all areas)")
+    print(f"position lookups      {indexed * 1000:8.3f} ms (all areas)")
+    print(f"occupancy grid build  {build * 1000:8.3f} ms (once per turn)")
+    print(f"speedup               {legacy / indexed:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#
+#
+# Mission targets: one assignment per cluster and mission type vs one
+# global assignment per mission type
+#
+#   python -m Benchmarks.bench_global_assignment [--size 32] [--units 60]
+#
+# The game runs through agent() with the global planner. On every call both
+# approaches are replayed on copies of the clusters and missions, and the
+# solver calls, time and travel distance (unit to target, over the
+# negotiable missions) are summed. Every negotiation is also checked
+# against a cold linear_sum_assignment of the same costs: "worse" counts
+# the ones that came out strictly more expensive (calls with more units
+# than targets are not checked).
+#
+#
+import argparse
+import copy
+import time
+from collections import defaultdict
+
+import agent as agent_module
+import Cluster.Cluster as cluster_module
+import Missions.MissionController as mission_controller
+import Missions.MissionPlanner as mission_planner
+from Missions.MissionPlanner import assign_targets_globally
+from Missions.constants import BUILD_TILE, GUARD_CLUSTER, EXPLORE
+from Units.unitsService import get_unit_by_id
+from Benchmarks.observations import generate_observations, agent_observations
+
+MISSION_NAMES = {
+    BUILD_TILE: "BUILD_TILE",
+    GUARD_CLUSTER: "GUARD_CLUSTER",
+    EXPLORE: "EXPLORE",
+}
+
+
+def travel(registry, player, mission_type):
+    """
+    (missions with a target, total distance to the targets)
+    """
+    missions, distance = 0, 0
+    for mission in registry.of_type(mission_type):
+        if mission.allow_target_change and mission.target_pos is not None:
+            unit = get_unit_by_id(mission.responsible_unit, player)
+            missions += 1
+            distance += unit.pos.distance_to(mission.target_pos)
+    return missions, distance
+
+
+def matching_cost(missions, units, targets, penalties):
+    """
+    Cost of the targets assigned to the units (distance plus penalty)
+    """
+    costs = mission_controller.manhattan_cost_matrix(
+        [(unit.pos.x, unit.pos.y) for unit in units], targets
+    )
+    if penalties is not None:
+        costs = costs + penalties
+    columns = {}
+    for column, target in enumerate(targets):
+        columns.setdefault(target, column)
+
+    by_unit = {mission.responsible_unit: mission for mission in missions}
+    cost = 0
+    for row, unit in enumerate(units):
+        target = by_unit[unit.id].target_pos
+        if target is not None and (target.x, target.y) in columns:
+            cost += costs[row, columns[(target.x, target.y)]]
+    return cost, costs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=60)
+    parser.add_argument("--turns", type=int, default=60)
+    args = parser.parse_args()
+
+    calls = [0]
+    solve = mission_controller.linear_sum_assignment
+
+    def counted_solve(*solve_args, **kwargs):
+        calls[0] += 1
+        return solve(*solve_args, **kwargs)
+
+    totals = defaultdict(lambda: [0, 0.0, 0, 0, 0])
+    worse, checking = [0], [0.0]
+    negotiate = mission_controller.negotiate_missions
+
+    def checked_negotiate(missions, units, targets, penalties=None):
+        targets = [
+            (target[0], target[1]) if isinstance(target, tuple) else (target.x, target.y)
+            for target in targets
+        ]
+        result = negotiate(missions, units, targets, penalties)
+
+        # The check is left out of the timings. With more units than
+        # targets the units left out keep stale targets, skip these calls.
+        start = time.perf_counter()
+        if len(units) <= len(set(targets)):
+            cost, costs = matching_cost(missions, units, targets, penalties)
+            rows, columns = solve(costs)
+            if cost > costs[rows, columns].sum():
+                worse[0] += 1
+        checking[0] += time.perf_counter() - start
+        return result
+
+    def record(name, mission_type, run, registry, player):
+        calls[0], worse[0], checking[0] = 0, 0, 0.0
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start - checking[0]
+        missions, distance = travel(registry, player, mission_type)
+        total = totals[(name, mission_type)]
+        total[0] += calls[0]
+        total[1] += elapsed
+        total[2] += missions
+        total[3] += distance
+        total[4] += worse[0]
+
+    def compared(
+        clusters, registry, game_state, player, opponent, mission_type, build_scores
+    ):
+        local_clusters, local_registry = copy.deepcopy((clusters, registry))
+        record(
+            "per cluster",
+            mission_type,
+            lambda: [
+                cluster.assign_targets_to_missions(
+                    game_state, player, opponent, mission_type, 0, build_scores
+                )
+                for cluster in local_clusters
+            ],
+            local_registry,
+            player,
+        )
+        global_clusters, global_registry = copy.deepcopy((clusters, registry))
+        record(
+            "global",
+            mission_type,
+            lambda: assign_targets_globally(
+                global_clusters,
+                global_registry,
+                game_state,
+                player,
+                opponent,
+                mission_type,
+                build_scores,
+            ),
+            global_registry,
+            player,
+        )
+        return assign_targets_globally(
+            clusters, registry, game_state, player, opponent, mission_type, build_scores
+        )
+
+    mission_controller.linear_sum_assignment = counted_solve
+    cluster_module.negotiate_missions = checked_negotiate
+    mission_planner.negotiate_missions = checked_negotiate
+    agent_module.assign_targets_globally = compared
+    try:
+        observations = generate_observations(
+            args.size, args.size, args.units, args.turns
+        )
+        for observation in agent_observations(observations):
+            agent_module.agent(observation, {"actTimeout": float("inf")})
+    finally:
+        mission_controller.linear_sum_assignment = solve
+        cluster_module.negotiate_missions = negotiate
+        mission_planner.negotiate_missions = negotiate
+        agent_module.assign_targets_globally = assign_targets_globally
+
+    print(f"{args.size}x{args.size} map, {args.units} units per team")
+    print(f"{args.turns} turns")
+    print(
+        f"{'':28s} {'solves':>7s} {'ms/turn':>8s}"
+        f" {'targets':>8s} {'distance':>9s} {'mean':>6s} {'worse':>6s}"
+    )
+    for mission_type, name in MISSION_NAMES.items():
+        for approach in ("per cluster", "global"):
+            solves, elapsed, missions, distance, suboptimal = totals[
+                (approach, mission_type)
+            ]
+            per_turn = elapsed / args.turns * 1000
+            print(
+                f"{name + ' ' + approach:28s} {solves:7d} {per_turn:8.3f}"
+                f" {missions:8d} {distance:9d} {distance / max(missions, 1):6.2f}"
+                f" {suboptimal:6d}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#
+#
+# Per-turn I/O overhead: input()/print loop vs the buffered TurnDriver
+#
+#   python -m Benchmarks.bench_io [--size 32] [--units 250] [--turns 360]
+#
+# Both loops replay the same synthetic game from a file with an agent that
+# returns canned actions, so only reading, splitting and writing is timed.
+#
+#
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from Driver.turnDriver import TurnDriver
+from Benchmarks.observations import generate_observations
+
+ACTIONS = ["m u_1 n", "m u_2 s", "bcity u_3", "r 3 4"]
+
+
+def canned_agent(observation, configuration):
+    return ACTIONS
+
+
+def legacy_loop(agent):
+    """
+    The former main.py loop
+    """
+
+    def read_input():
+        try:
+            return input()
+        except EOFError as eof:
+            raise SystemExit(eof)
+
+    class Observation(dict):
+        def __init__(self, player=0):
+            self.player = player
+
+    step = 0
+    observation = Observation()
+    observation["updates"] = []
+    observation["step"] = 0
+    while True:
+        inputs = read_input()
+        observation["updates"].append(inputs)
+
+        if step == 0:
+            observation.player = int(observation["updates"][0])
+        if inputs == "D_DONE":
+            actions = agent(observation, None)
+            observation["updates"] = []
+            step += 1
+            observation["step"] = step
+            print(",".join(actions))
+            print("D_FINISH")
+
+
+def time_legacy(path, turns):
+    stdin, stdout = sys.stdin, sys.stdout
+    with open(path) as source, open(os.devnull, "w") as sink:
+        sys.stdin, sys.stdout = source, sink
+        start = time.perf_counter()
+        try:
+            legacy_loop(canned_agent)
+        except SystemExit:
+            pass
+        elapsed = time.perf_counter() - start
+    sys.stdin, sys.stdout = stdin, stdout
+    return elapsed / turns
+
+
+def time_driver(path, turns):
+    with open(path, "rb", buffering=0) as source, open(os.devnull, "w") as sink:
+        start = time.perf_counter()
+        TurnDriver(canned_agent, stdin=source, stdout=sink).run()
+        return (time.perf_counter() - start) / turns
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=250)
+    parser.add_argument("--turns", type=int, default=360)
+    args = parser.parse_args()
+
+    observations = generate_observations(args.size, args.size, args.units, args.turns)
+    lines = sum(len(updates) for updates in observations)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as stream:
+        for updates in observations:
+            stream.write("\n".join(updates) + "\n")
+        path = stream.name
+
+    try:
+        legacy = time_legacy(path, args.turns)
+        driver = time_driver(path, args.turns)
+    finally:
+        os.remove(path)
+
+    print(f"{args.turns} turns, {lines / args.turns:.0f} lines/turn")
+    print(f"input()/print loop   {legacy * 1000:8.3f} ms/turn")
+    print(f"TurnDriver           {driver * 1000:8.3f} ms/turn")
+    print(f"speedup              {legacy / driver:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
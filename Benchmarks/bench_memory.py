@@ -0,0 +1,108 @@
+#
+#
+# Memory and allocation churn of the game objects
+#
+#   python -m Benchmarks.bench_memory [--size 32] [--units 60] [--turns 100]
+#
+# Reports the size of the __slots__ game objects next to dict-backed
+# equivalents, then the per-turn peak / retained traced memory of agent()
+# and how many Position objects had to be allocated (interned ones are free).
+#
+#
+import argparse
+import sys
+import tracemalloc
+
+from lux.game_map import Position, Cell, Resource
+from lux.game_objects import Unit, Cargo, CityTile, City
+from Benchmarks.observations import generate_observations, agent_observations
+
+
+class DictObject:
+    """
+    Dict-backed object with the same attributes as a slotted one
+    """
+
+    def __init__(self, slotted):
+        for name in type(slotted).__slots__:
+            setattr(self, name, getattr(slotted, name))
+
+
+def object_size(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def print_object_sizes():
+    samples = [
+        Position._create(3, 4),
+        Cell(3, 4),
+        Resource("wood", 400),
+        Unit(0, 0, "u_1", 3, 4, 0.0, 10, 0, 0),
+        Cargo(),
+        CityTile(0, "c_1", 3, 4, 0.0),
+        City(0, "c_1", 100.0, 23.0),
+    ]
+    print(f"{'object':12}{'__slots__':>12}{'__dict__':>12}")
+    for sample in samples:
+        print(
+            f"{type(sample).__name__:12}"
+            f"{object_size(sample):10} B"
+            f"{object_size(DictObject(sample)):10} B"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=60)
+    parser.add_argument("--turns", type=int, default=100)
+    args = parser.parse_args()
+
+    print_object_sizes()
+
+    import agent as agent_module
+
+    observations = generate_observations(args.size, args.size, args.units, args.turns)
+
+    created_positions = 0
+    create = Position._create.__func__
+
+    def counting_create(cls, x, y):
+        nonlocal created_positions
+        created_positions += 1
+        return create(cls, x, y)
+
+    Position._create = classmethod(counting_create)
+
+    peaks = []
+    retained = []
+    positions = []
+    tracemalloc.start()
+    try:
+        for observation in agent_observations(observations):
+            created_positions = 0
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            agent_module.agent(observation, None)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+            retained.append(current)
+            positions.append(created_positions)
+    finally:
+        tracemalloc.stop()
+        Position._create = classmethod(create)
+
+    # The first turn builds the flyweights and the clusters
+    peaks, retained, positions = peaks[1:], retained[1:], positions[1:]
+    print()
+    print(f"agent() on {args.size}x{args.size}, {args.units} units/team, {args.turns} turns")
+    print(f"peak memory per turn      {sum(peaks) / len(peaks) / 1024:10.1f} KiB (max {max(peaks) / 1024:.1f})")
+    print(f"retained memory           {retained[-1] / 1024:10.1f} KiB")
+    print(f"new Positions per turn    {sum(positions) / len(positions):10.1f}")
+
+
+if __name__ == "__main__":
+    main()
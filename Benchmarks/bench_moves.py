@@ -0,0 +1,172 @@
+#
+#
+# Move resolution on congested maps: negotiate_actions vs the
+# space-time reservation resolver
+#
+#   python -m Benchmarks.bench_moves [--size 24] [--units 100] [--turns 30]
+#
+# Our units walk to random targets while the opponent units stand still.
+# The approved moves are applied with the engine's collision rules (a unit
+# moving onto a cell another unit ends the turn on is sent back, except on
+# our citytiles), the cancelled moves are counted as collisions.
+#
+#
+import argparse
+import copy
+import random
+import time
+
+from lux.game import Game
+from lux.game_map import Position
+from lux.game_constants import GAME_CONSTANTS
+from Missions.Mission import Mission
+from Missions.constants import EXPLORE
+from Map.pathfinding import Pathfinder
+from Map.moveResolver import MoveResolver
+from helperFunctions.helper_functions import negotiate_actions
+from Benchmarks.observations import generate_observations
+
+COOLDOWN = GAME_CONSTANTS["PARAMETERS"]["UNIT_ACTION_COOLDOWN"]["WORKER"]
+
+
+def apply_moves(actions, units, shared):
+    """
+    Move the units of the actions, cancelling the collisions
+    Return the number of cancelled moves
+    """
+    by_id = {unit.id: unit for unit in units}
+    moves = {}
+    for action in actions:
+        _, unit_id, direction = action.split()
+        unit = by_id[unit_id]
+        moves[unit_id] = unit.pos.translate(direction, 1)
+
+    starts = {}
+    for unit in units:
+        starts.setdefault(unit.pos, []).append(unit.id)
+
+    cancelled = set()
+    while True:
+        ends = {}
+        for unit in units:
+            end = unit.pos if unit.id in cancelled else moves.get(unit.id, unit.pos)
+            ends.setdefault(end, []).append(unit.id)
+
+        collisions = {
+            unit_id
+            for end, unit_ids in ends.items()
+            if len(unit_ids) > 1 and end not in shared
+            for unit_id in unit_ids
+            if unit_id in moves and unit_id not in cancelled
+        }
+        # Head-on swaps
+        for unit_id, end in moves.items():
+            start = by_id[unit_id].pos
+            for other_id in starts.get(end, []):
+                if moves.get(other_id) == start and unit_id not in cancelled:
+                    collisions.add(unit_id)
+        if not collisions:
+            break
+        cancelled.update(collisions)
+
+    for unit_id, end in moves.items():
+        unit = by_id[unit_id]
+        if unit_id not in cancelled:
+            unit.pos = end
+            unit.cooldown = COOLDOWN
+    return len(cancelled)
+
+
+def run(game, resolve, turns, seed):
+    """
+    Walk our units to random targets for `turns` turns
+    Return (seconds per turn, moves, cancelled moves, arrivals)
+    """
+    game = copy.deepcopy(game)
+    player, opponent = game.players
+    width, height = game.map.width, game.map.height
+    rng = random.Random(seed)
+
+    walls = {ct.pos for city in opponent.cities.values() for ct in city.citytiles}
+    shared = {ct.pos for city in player.cities.values() for ct in city.citytiles}
+    missions = {}
+    for unit in player.units:
+        while True:
+            target = Position(rng.randrange(width), rng.randrange(height))
+            if target not in walls:
+                break
+        missions[unit.id] = Mission(unit.id, EXPLORE, target)
+
+    pathfinder = Pathfinder(width, height)
+    pathfinder.update(game, player.team)
+    elapsed, moves, cancelled = 0.0, 0, 0
+    for _ in range(turns):
+        units = player.units + opponent.units
+        game.occupancy.unit_count[:] = 0
+        game.occupancy._set_units(
+            [unit.team for unit in units],
+            [unit.pos.x for unit in units],
+            [unit.pos.y for unit in units],
+        )
+
+        occupied_positions = set(walls)
+        required_moves = []
+        for unit in player.units:
+            mission = missions[unit.id]
+            if not unit.can_act() or unit.pos.equals(mission.target_pos):
+                occupied_positions.add(unit.pos)
+            else:
+                required_moves.append(mission.get_moves(player, pathfinder))
+        occupied_positions -= shared
+
+        start = time.perf_counter()
+        actions = resolve(occupied_positions, required_moves, game, pathfinder)
+        elapsed += time.perf_counter() - start
+
+        moves += len(actions)
+        cancelled += apply_moves(actions, units, shared)
+        for unit in player.units:
+            unit.cooldown = max(unit.cooldown - 1, 0)
+
+    arrivals = sum(
+        unit.pos.equals(missions[unit.id].target_pos) for unit in player.units
+    )
+    return elapsed / turns, moves, cancelled, arrivals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=24)
+    parser.add_argument("--units", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    updates = generate_observations(args.size, args.size, args.units, 1, args.seed)[0]
+    game = Game()
+    game._initialize(updates, incremental=True)
+    game._update(updates[2:])
+    player = game.players[0]
+    for unit in player.units:
+        unit.cooldown = 0
+
+    resolver = MoveResolver(args.size, args.size)
+
+    def greedy(occupied_positions, required_moves, game_state, pathfinder):
+        return negotiate_actions(occupied_positions, required_moves)
+
+    def planned(occupied_positions, required_moves, game_state, pathfinder):
+        return resolver.resolve(
+            occupied_positions, required_moves, game_state, player.team, pathfinder
+        )
+
+    print(f"{args.size}x{args.size} map, {len(player.units)} units per team")
+    print(f"{args.turns} turns")
+    print(f"{'':20s} {'ms/turn':>8s} {'moves':>7s} {'cancelled':>9s} {'arrived':>7s}")
+    for name, resolve in (("negotiate_actions", greedy), ("MoveResolver", planned)):
+        per_turn, moves, cancelled, arrivals = run(game, resolve, args.turns, args.seed)
+        print(f"{name:20s} {per_turn * 1000:8.3f} {moves:7d} {cancelled:9d} {arrivals:7d}")
+
+
+if __name__ == "__main__":
+    main()
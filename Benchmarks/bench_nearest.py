@@ -0,0 +1,62 @@
+#
+#
+# Nearest cell queries: get_nearest_position scans vs distance transform lookups
+#
+#   python -m Benchmarks.bench_nearest [--size 32] [--cells 100] [--queries 60]
+#
+# A transform is built once per turn, it pays off as soon as a few units
+# query the same set.
+#
+#
+import argparse
+import random
+import time
+
+from lux.game_map import Position
+from Map.mapService import get_nearest_position
+from Map.distanceTransform import NearestPositionMap
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--cells", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cells = [
+        Position(rng.randrange(args.size), rng.randrange(args.size))
+        for _ in range(args.cells)
+    ]
+    queries = [
+        Position(rng.randrange(args.size), rng.randrange(args.size))
+        for _ in range(args.queries)
+    ]
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        scanned = [get_nearest_position(pos, cells)[1] for pos in queries]
+    scan = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        transform = NearestPositionMap(cells, args.size, args.size)
+    build = (time.perf_counter() - start) / args.repeat
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        looked_up = [transform.lookup(pos)[1] for pos in queries]
+    lookup = (time.perf_counter() - start) / args.repeat
+    assert looked_up == scanned
+
+    print(f"{args.size}x{args.size} map, {args.cells} cells, {args.queries} queries")
+    print(f"get_nearest_position     {scan * 1000:8.3f} ms")
+    print(f"transform build          {build * 1000:8.3f} ms")
+    print(f"transform lookups        {lookup * 1000:8.3f} ms")
+    print(f"speedup (with build)     {scan / (build + lookup):8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#
+#
+# Mission target negotiation: cdist with a Python metric vs the broadcast
+# cost matrix
+#
+#   python -m Benchmarks.bench_negotiation [--size 32] [--units 60] [--targets 80]
+#
+#
+import argparse
+import random
+import time
+
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial.distance import cdist
+
+from lux.game_map import Position
+from lux.game_objects import Unit
+from lux.constants import Constants
+from Missions.Mission import Mission
+from Missions.MissionController import negotiate_missions, manhattan_cost_matrix
+from Missions.constants import GUARD_CLUSTER
+
+UNIT_TYPES = Constants.UNIT_TYPES
+
+
+def legacy_negotiate_missions(missions, units, targets):
+    """
+    The former negotiate_missions: a Python metric per pair and a linear
+    search of the missions for every assigned unit
+    """
+    unit_positions = [(unit.pos.x, unit.pos.y) for unit in units]
+    target_positions = [(target.x, target.y) for target in targets]
+
+    def distance_to(pos1, pos2):
+        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+
+    distance_matrix = cdist(unit_positions, target_positions, distance_to)
+
+    row_ind, col_ind = linear_sum_assignment(distance_matrix)
+    for i in range(len(row_ind)):
+        key = units[row_ind[i]].id
+        target = target_positions[col_ind[i]]
+        for mission in missions:
+            if mission.responsible_unit == key:
+                mission.change_target_pos(Position(target[0], target[1]))
+
+    return missions
+
+
+def total_distance(missions, units):
+    by_unit = {mission.responsible_unit: mission for mission in missions}
+    return sum(unit.pos.distance_to(by_unit[unit.id].target_pos) for unit in units)
+
+
+def timed(negotiate, missions, units, targets, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        negotiate(missions, units, targets)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=60)
+    parser.add_argument("--targets", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    cells = [(x, y) for x in range(args.size) for y in range(args.size)]
+    rng.shuffle(cells)
+    units = [
+        Unit(0, UNIT_TYPES.WORKER, f"u_{i}", x, y, 0, 0, 0, 0)
+        for i, (x, y) in enumerate(cells[: args.units])
+    ]
+    targets = [Position(x, y) for x, y in cells[-args.targets :]]
+    missions = [Mission(unit.id, GUARD_CLUSTER) for unit in units]
+
+    legacy = timed(legacy_negotiate_missions, missions, units, targets, args.repeat)
+    legacy_total = total_distance(missions, units)
+    broadcast = timed(negotiate_missions, missions, units, targets, args.repeat)
+    assert total_distance(missions, units) == legacy_total
+
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        manhattan_cost_matrix(
+            [(unit.pos.x, unit.pos.y) for unit in units],
+            [(target.x, target.y) for target in targets],
+        )
+    matrix = (time.perf_counter() - start) / args.repeat
+
+    print(f"{args.units} units x {args.targets} targets")
+    print(f"cdist + Python metric    {legacy * 1000:8.3f} ms")
+    print(f"broadcast cost matrix    {broadcast * 1000:8.3f} ms")
+    print(f"cost matrix alone        {matrix * 1000:8.3f} ms")
+    print(f"speedup                  {legacy / broadcast:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#
+#
+# Observation parsing: line by line if/elif chain vs table-driven parse_updates
+#
+#   python -m Benchmarks.bench_parser [--size 32] [--units 500] [--turns 360]
+#   python -m Benchmarks.bench_parser --recording game.jsonl.gz
+#
+# Only the late game (the last --late turns) is measured, where a turn
+# carries thousands of lines.
+#
+#
+import argparse
+import time
+
+from lux.constants import Constants
+from lux.parser import parse_updates
+from Replay.recorder import read_recording
+from Benchmarks.observations import generate_observations
+
+INPUT_CONSTANTS = Constants.INPUT_CONSTANTS
+
+
+def legacy_parse(messages):
+    """
+    The former Game._update parsing loop, collecting the same columns as parse_updates
+    """
+    columns = {
+        INPUT_CONSTANTS.RESEARCH_POINTS: [[], []],
+        INPUT_CONSTANTS.RESOURCES: [[], [], [], []],
+        INPUT_CONSTANTS.UNITS: [[], [], [], [], [], [], [], [], []],
+        INPUT_CONSTANTS.CITY: [[], [], [], []],
+        INPUT_CONSTANTS.CITY_TILES: [[], [], [], [], []],
+        INPUT_CONSTANTS.ROADS: [[], [], []],
+    }
+    for update in messages:
+        if update == "D_DONE":
+            break
+        strs = update.split(" ")
+        input_identifier = strs[0]
+        if input_identifier == INPUT_CONSTANTS.RESEARCH_POINTS:
+            values = (int(strs[1]), int(strs[2]))
+        elif input_identifier == INPUT_CONSTANTS.RESOURCES:
+            values = (strs[1], int(strs[2]), int(strs[3]), int(float(strs[4])))
+        elif input_identifier == INPUT_CONSTANTS.UNITS:
+            values = (
+                int(strs[1]),
+                int(strs[2]),
+                strs[3],
+                int(strs[4]),
+                int(strs[5]),
+                float(strs[6]),
+                int(strs[7]),
+                int(strs[8]),
+                int(strs[9]),
+            )
+        elif input_identifier == INPUT_CONSTANTS.CITY:
+            values = (int(strs[1]), strs[2], float(strs[3]), float(strs[4]))
+        elif input_identifier == INPUT_CONSTANTS.CITY_TILES:
+            values = (
+                int(strs[1]),
+                strs[2],
+                int(strs[3]),
+                int(strs[4]),
+                float(strs[5]),
+            )
+        elif input_identifier == INPUT_CONSTANTS.ROADS:
+            values = (int(strs[1]), int(strs[2]), float(strs[3]))
+        else:
+            continue
+        for column, value in zip(columns[input_identifier], values):
+            column.append(value)
+    return columns
+
+
+def time_parser(parse, observations, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for updates in observations:
+            parse(updates)
+    return (time.perf_counter() - start) / (repeat * len(observations))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=360)
+    parser.add_argument("--late", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--recording", help="recorded game, see Replay/recorder.py")
+    args = parser.parse_args()
+
+    if args.recording:
+        observations = [record["updates"] for record in read_recording(args.recording)]
+        source = args.recording
+    else:
+        observations = generate_observations(
+            args.size, args.size, args.units, args.turns
+        )
+        source = f"map {args.size}x{args.size}"
+    late_game = observations[-args.late:]
+
+    for updates in late_game:
+        assert parse_updates(updates) == legacy_parse(updates)
+
+    lines = sum(len(updates) for updates in late_game) / len(late_game)
+    legacy = time_parser(legacy_parse, late_game, args.repeat)
+    table = time_parser(parse_updates, late_game, args.repeat)
+
+    print(f"{source}, {lines:.0f} lines/turn over the last {args.late} turns")
+    print(f"if/elif chain     {legacy * 1000:8.3f} ms/turn")
+    print(f"parse_updates     {table * 1000:8.3f} ms/turn")
+    print(f"speedup           {legacy / table:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
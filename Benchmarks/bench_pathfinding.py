@@ -0,0 +1,66 @@
+#
+#
+# BFS distance fields: cost of a field and cache behaviour over a game
+#
+#   python -m Benchmarks.bench_pathfinding [--size 32] [--units 60] [--turns 100]
+#
+# The game runs through agent(), so the fields requested are the ones of
+# the real missions.
+#
+#
+import argparse
+import time
+
+import numpy as np
+
+import agent as agent_module
+import Map.pathfinding as pathfinding
+from Benchmarks.observations import generate_observations, agent_observations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=60)
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    # One field on a map with 10% walls
+    walls = np.random.default_rng(0).random((args.size, args.size)) < 0.1
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        pathfinding.bfs_distance_field(walls, [(0, 0)])
+    field = (time.perf_counter() - start) / args.repeat
+
+    # Fields built during a game
+    built = [0.0]
+    bfs_distance_field = pathfinding.bfs_distance_field
+
+    def timed_field(*field_args):
+        field_start = time.perf_counter()
+        result = bfs_distance_field(*field_args)
+        built[0] += time.perf_counter() - field_start
+        return result
+
+    pathfinding.bfs_distance_field = timed_field
+    try:
+        observations = generate_observations(args.size, args.size, args.units, args.turns)
+        for observation in agent_observations(observations):
+            agent_module.agent(observation, {"actTimeout": float("inf")})
+    finally:
+        pathfinding.bfs_distance_field = bfs_distance_field
+
+    pathfinder = agent_module.pathfinder
+    lookups = pathfinder.hits + pathfinder.misses
+    print(f"{args.size}x{args.size} map")
+    print(f"one distance field       {field * 1000:8.3f} ms")
+    print(f"{args.turns} turns, {args.units} units per team")
+    print(f"field lookups            {lookups:8d}")
+    print(f"cache hit rate           {pathfinder.hits / max(lookups, 1):8.2%}")
+    print(f"wall changes             {pathfinder.version:8d}")
+    print(f"BFS time per turn        {built[0] / args.turns * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#
+#
+# Unit lookups by id: linear scan of player.units vs the Player index
+#
+#   python -m Benchmarks.bench_unit_index [--units 120] [--size 32]
+#
+#
+import argparse
+import time
+
+from lux.game import Game
+from Units.unitsService import get_unit_by_id
+from Benchmarks.observations import generate_observations
+
+# get_unit_by_id call sites that loop over every mission of a turn:
+# assign_targets_to_missions (x3), handle_explore_missions, get_build_actions,
+# get_required_moves, Mission.get_moves, get_occupied_positions (x2)
+# and the three remove_finished_* functions
+PASSES_PER_TURN = 12
+
+
+def linear_get_unit_by_id(id1, player):
+    for unit in player.units:
+        if unit.id == id1:
+            return unit
+
+
+def time_lookups(lookup, player, unit_ids, turns):
+    start = time.perf_counter()
+    for _ in range(turns):
+        for _ in range(PASSES_PER_TURN):
+            for unit_id in unit_ids:
+                lookup(unit_id, player)
+    return (time.perf_counter() - start) / turns
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=120)
+    parser.add_argument("--turns", type=int, default=50)
+    args = parser.parse_args()
+
+    observations = generate_observations(args.size, args.size, args.units, 1)
+    game = Game()
+    game._initialize(observations[0])
+    game._update(observations[0][2:])
+
+    player = game.players[0]
+    # One mission per unit, looked up in mission order
+    unit_ids = [unit.id for unit in reversed(player.units)]
+
+    linear = time_lookups(linear_get_unit_by_id, player, unit_ids, args.turns)
+    indexed = time_lookups(get_unit_by_id, player, unit_ids, args.turns)
+
+    print(f"{len(player.units)} units, {PASSES_PER_TURN} mission passes per turn")
+    print(f"linear scan   {linear * 1000:8.3f} ms/turn")
+    print(f"id index      {indexed * 1000:8.3f} ms/turn")
+    print(f"speedup       {linear / indexed:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
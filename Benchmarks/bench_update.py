@@ -0,0 +1,73 @@
+#
+#
+# Game._update: full rebuild vs incremental update, object vs array map
+#
+#   python -m Benchmarks.bench_update [--size 32] [--units 60] [--turns 200]
+#
+#
+import argparse
+import time
+
+from lux.game import Game
+from lux.testing import snapshot
+from Resources.resourceService import get_resources
+from Benchmarks.observations import generate_observations
+
+
+def run_updates(observations, incremental, array_map=False):
+    """
+    Feed `observations` to a new Game
+    Return the per-turn update times, get_resources times and states
+    """
+    game = Game()
+    game._initialize(observations[0], incremental=incremental, array_map=array_map)
+    timings = []
+    scan_timings = []
+    states = []
+    for turn, updates in enumerate(observations):
+        if turn == 0:
+            updates = updates[2:]
+        start = time.perf_counter()
+        game._update(updates)
+        timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        get_resources(game)
+        scan_timings.append(time.perf_counter() - start)
+
+        states.append(snapshot(game))
+    return timings, scan_timings, states
+
+
+def mean_ms(timings):
+    return sum(timings) / len(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--units", type=int, default=60)
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    observations = generate_observations(args.size, args.size, args.units, args.turns)
+
+    runs = {
+        "full rebuild": run_updates(observations, incremental=False),
+        "incremental update": run_updates(observations, incremental=True),
+        "incremental, array map": run_updates(
+            observations, incremental=True, array_map=True
+        ),
+    }
+
+    reference_states = runs["full rebuild"][2]
+    for name, (_, _, states) in runs.items():
+        assert states == reference_states, f"{name} diverged from the full rebuild"
+
+    print(f"map {args.size}x{args.size}, {args.units} units/team, {args.turns} turns")
+    print(f"{'':24}{'_update':>12}{'get_resources':>16}")
+    for name, (timings, scan_timings, _) in runs.items():
+        print(f"{name:24}{mean_ms(timings):9.3f} ms{mean_ms(scan_timings):13.3f} ms")
+
+if __name__ == "__main__":
+    main()
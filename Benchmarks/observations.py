@@ -0,0 +1,222 @@
+#
+#
+# Synthetic observation streams for the benchmarks
+#
+# The generated lines follow the engine protocol (see lux/constants.py)
+# and evolve turn by turn: resources get mined and regrow, units walk,
+# spawn and die, cities grow.
+#
+#
+import random
+
+from lux.constants import Constants
+from Driver.turnDriver import Observation
+
+INPUT_CONSTANTS = Constants.INPUT_CONSTANTS
+RESOURCE_TYPES = Constants.RESOURCE_TYPES
+
+MAP_SIZES = [12, 16, 24, 32]
+
+# Units per team for each density level
+UNIT_COUNTS = {"low": 5, "medium": 25, "high": 60}
+
+
+class GameSimulator:
+    """
+    Tiny stand-in for the Lux engine that only produces observations
+
+    width, height       int             Map size
+    units_per_team      int             Number of units each team keeps alive
+    seed                int             Seed of the random generator
+    """
+
+    def __init__(self, width, height, units_per_team, seed=0, player_id=0):
+        self.width = width
+        self.height = height
+        self.units_per_team = units_per_team
+        self.player_id = player_id
+        self.random = random.Random(seed)
+        self.step = 0
+
+        self.resources = {}
+        self.units = {}
+        self.cities = {}
+        self.citytiles = {}
+        self.research_points = [0, 0]
+        self.next_unit_id = 1
+        self.next_city_id = 1
+
+        self._place_resources()
+        self._place_cities()
+        for team in range(2):
+            for _ in range(units_per_team):
+                self._spawn_unit(team)
+
+    def _free_position(self):
+        while True:
+            pos = (
+                self.random.randrange(self.width),
+                self.random.randrange(self.height),
+            )
+            if pos not in self.resources and pos not in self.citytiles:
+                return pos
+
+    def _place_blob(self, r_type, size, amount):
+        x, y = self._free_position()
+        for _ in range(size):
+            if 0 <= x < self.width and 0 <= y < self.height:
+                if (x, y) not in self.citytiles:
+                    self.resources[(x, y)] = [r_type, amount]
+            x += self.random.choice((-1, 0, 1))
+            y += self.random.choice((-1, 0, 1))
+
+    def _place_resources(self):
+        area = self.width * self.height
+        for _ in range(max(2, area // 90)):
+            self._place_blob(RESOURCE_TYPES.WOOD, self.random.randint(4, 14), 500)
+        for _ in range(max(1, area // 300)):
+            self._place_blob(RESOURCE_TYPES.COAL, self.random.randint(3, 8), 350)
+        for _ in range(max(1, area // 400)):
+            self._place_blob(RESOURCE_TYPES.URANIUM, self.random.randint(2, 6), 300)
+
+    def _place_cities(self):
+        for team in range(2):
+            for _ in range(max(1, self.width // 8)):
+                self._add_city(team)
+
+    def _add_city(self, team):
+        cityid = f"c_{self.next_city_id}"
+        self.next_city_id += 1
+        self.cities[cityid] = [team, 0.0, 23.0]
+        self.citytiles[self._free_position()] = [team, cityid, 0.0]
+
+    def _grow_city(self, team):
+        tiles = [pos for pos, tile in self.citytiles.items() if tile[0] == team]
+        if not tiles:
+            return
+        x, y = self.random.choice(tiles)
+        dx, dy = self.random.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+        pos = (x + dx, y + dy)
+        if (
+            0 <= pos[0] < self.width
+            and 0 <= pos[1] < self.height
+            and pos not in self.resources
+            and pos not in self.citytiles
+        ):
+            self.citytiles[pos] = [team, self.citytiles[(x, y)][1], 0.0]
+
+    def _spawn_unit(self, team):
+        unitid = f"u_{self.next_unit_id}"
+        self.next_unit_id += 1
+        x, y = self._free_position()
+        self.units[unitid] = [
+            0 if self.random.random() < 0.9 else 1,
+            team,
+            x,
+            y,
+            float(self.random.randint(0, 2)),
+            self.random.randint(0, 100),
+            0,
+            0,
+        ]
+
+    def _advance(self):
+        self.step += 1
+        rand = self.random
+
+        for team in range(2):
+            self.research_points[team] = min(
+                self.research_points[team] + rand.randint(0, 2), 250
+            )
+
+        # Mining and regrowth
+        for pos, resource in list(self.resources.items()):
+            if rand.random() < 0.15:
+                resource[1] -= rand.randint(10, 60)
+                if resource[1] <= 0:
+                    del self.resources[pos]
+            elif resource[0] == RESOURCE_TYPES.WOOD and resource[1] < 500:
+                resource[1] = min(500, resource[1] + max(1, resource[1] // 40))
+
+        # Units walk, some die and some get spawned
+        for unitid, unit in list(self.units.items()):
+            if rand.random() < 0.01:
+                del self.units[unitid]
+                continue
+            unit[2] = min(max(unit[2] + rand.choice((-1, 0, 1)), 0), self.width - 1)
+            unit[3] = min(max(unit[3] + rand.choice((-1, 0, 1)), 0), self.height - 1)
+            unit[4] = float(rand.randint(0, 2))
+            unit[5] = rand.randint(0, 100)
+        for team in range(2):
+            alive = sum(1 for unit in self.units.values() if unit[1] == team)
+            for _ in range(self.units_per_team - alive):
+                self._spawn_unit(team)
+
+        # Cities grow over time
+        for team in range(2):
+            if rand.random() < 0.3:
+                self._grow_city(team)
+        for tile in self.citytiles.values():
+            tile[2] = float(rand.randint(0, 10))
+        for city in self.cities.values():
+            city[1] = float(rand.randint(0, 1000))
+
+    def updates(self):
+        """
+        Lines of the current turn, terminated by D_DONE
+        """
+        lines = []
+        for team in range(2):
+            lines.append(
+                f"{INPUT_CONSTANTS.RESEARCH_POINTS} {team} {self.research_points[team]}"
+            )
+        for (x, y), (r_type, amount) in self.resources.items():
+            lines.append(f"{INPUT_CONSTANTS.RESOURCES} {r_type} {x} {y} {amount}")
+        for unitid, (u_type, team, x, y, cooldown, wood, coal, uranium) in self.units.items():
+            lines.append(
+                f"{INPUT_CONSTANTS.UNITS} {u_type} {team} {unitid} {x} {y} "
+                f"{cooldown} {wood} {coal} {uranium}"
+            )
+        for cityid, (team, fuel, upkeep) in self.cities.items():
+            if any(tile[1] == cityid for tile in self.citytiles.values()):
+                lines.append(f"{INPUT_CONSTANTS.CITY} {team} {cityid} {fuel} {upkeep}")
+        for (x, y), (team, cityid, cooldown) in self.citytiles.items():
+            lines.append(
+                f"{INPUT_CONSTANTS.CITY_TILES} {team} {cityid} {x} {y} {cooldown}"
+            )
+        for (x, y) in self.citytiles:
+            lines.append(f"{INPUT_CONSTANTS.ROADS} {x} {y} 6")
+        lines.append(INPUT_CONSTANTS.DONE)
+        return lines
+
+    def observations(self, turns):
+        """
+        Yield the `updates` block of `turns` consecutive turns.
+        The first one carries the player id and the map size like the engine does.
+        """
+        for turn in range(turns):
+            if turn > 0:
+                self._advance()
+            updates = self.updates()
+            if turn == 0:
+                updates = [str(self.player_id), f"{self.width} {self.height}"] + updates
+            yield updates
+
+
+def generate_observations(width, height, units_per_team, turns, seed=0):
+    """
+    List of the `updates` blocks of a synthetic game
+    """
+    simulator = GameSimulator(width, height, units_per_team, seed)
+    return list(simulator.observations(turns))
+
+
+def agent_observations(observations, player_id=0):
+    """
+    Wrap `updates` blocks into the observations agent() expects
+    """
+    for step, updates in enumerate(observations):
+        observation = Observation(player_id)
+        observation["updates"] = updates
+        observation["step"] = step
+        yield observation
@@ -0,0 +1,203 @@
+#
+#
+# Benchmark suite: per-stage timings of agent() across map sizes and unit counts
+#
+#   python -m Benchmarks.suite [--turns 60] [--output bench_results.json]
+#   python -m Benchmarks.suite --baseline baseline.json [--threshold 1.25]
+#   python -m Benchmarks.suite --recording game.jsonl.gz
+#
+# Every stage is timed inside real agent() turns: the stage functions are
+# wrapped with timers for the duration of the run, so the suite always
+# follows the agent's actual control flow.
+# Results are written as JSON; when a baseline is given, stages slower than
+# `threshold` times their baseline are reported and the exit code is 1.
+#
+#
+import argparse
+import json
+import platform
+import time
+
+import agent as agent_module
+from lux.game import Game
+from Cluster.Cluster import Cluster
+from Cluster.clusterController import ClusterController
+from Map.moveResolver import MoveResolver
+from Replay.recorder import read_games
+from Benchmarks.observations import (
+    MAP_SIZES,
+    UNIT_COUNTS,
+    generate_observations,
+    agent_observations,
+)
+
+# Stage name -> (owner, attribute) of the function to time
+STAGES = {
+    "Game._update": (Game, "_update"),
+    "getClustersRolling": (ClusterController, "getClustersRolling"),
+    "update_clusters": (ClusterController, "update_clusters"),
+    "update_missions": (ClusterController, "update_missions"),
+    "assign_workers": (ClusterController, "assign_workers"),
+    "assign_targets_globally": (agent_module, "assign_targets_globally"),
+    "get_occupied_positions": (agent_module, "get_occupied_positions"),
+    "get_required_moves": (Cluster, "get_required_moves"),
+    "resolve_moves": (MoveResolver, "resolve"),
+    "get_city_actions": (agent_module, "get_city_actions"),
+}
+
+# Stages faster than this are not reported as regressions (timer noise)
+NOISE_FLOOR_MS = 0.05
+
+# Replay without cutting phases
+CONFIGURATION = {"actTimeout": float("inf")}
+
+
+class StageTimer:
+    """
+    Wraps the STAGES functions and sums their time per turn
+    """
+
+    def __init__(self):
+        self.turn = {}
+        self.turns = []
+        self.originals = {}
+
+    def wrap(self, name, function):
+        turn = self.turn
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                turn[name] = turn.get(name, 0.0) + time.perf_counter() - start
+
+        return timed
+
+    def __enter__(self):
+        for name, (owner, attribute) in STAGES.items():
+            original = getattr(owner, attribute)
+            self.originals[name] = original
+            setattr(owner, attribute, self.wrap(name, original))
+        return self
+
+    def __exit__(self, *exc):
+        for name, (owner, attribute) in STAGES.items():
+            setattr(owner, attribute, self.originals[name])
+
+    def end_turn(self, total):
+        record = dict(self.turn)
+        record["agent"] = total
+        self.turns.append(record)
+        self.turn.clear()
+
+
+def run_scenario(observations):
+    """
+    Run agent() over a game and return the per-stage statistics
+    """
+    with StageTimer() as timer:
+        for observation in observations:
+            start = time.perf_counter()
+            agent_module.agent(observation, CONFIGURATION)
+            timer.end_turn(time.perf_counter() - start)
+
+    stats = {}
+    for name in list(STAGES) + ["agent"]:
+        samples = sorted(turn[name] * 1000 for turn in timer.turns if name in turn)
+        if not samples:
+            continue
+        stats[name] = {
+            "mean_ms": sum(samples) / len(samples),
+            "p95_ms": samples[min(int(len(samples) * 0.95), len(samples) - 1)],
+            "max_ms": samples[-1],
+            "turns": len(samples),
+        }
+    return stats
+
+
+def synthetic_scenarios(sizes, densities, turns, seed):
+    for size in sizes:
+        for density in densities:
+            observations = generate_observations(
+                size, size, UNIT_COUNTS[density], turns, seed
+            )
+            yield f"{size}x{size}/{density}", agent_observations(observations)
+
+
+def recorded_scenarios(path):
+    for index, records in enumerate(read_games(path)):
+        yield f"recording/{index}", agent_observations(
+            [record["updates"] for record in records], records[0]["player"]
+        )
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the results next to the baseline, return the regressions
+    """
+    regressions = []
+    for scenario, stages in results.items():
+        print(scenario)
+        for name, stats in stages.items():
+            line = f"  {name:28}{stats['mean_ms']:10.3f} ms"
+            reference = baseline.get(scenario, {}).get(name)
+            if reference is not None:
+                ratio = stats["mean_ms"] / max(reference["mean_ms"], 1e-9)
+                line += f"{reference['mean_ms']:10.3f} ms{ratio:8.2f}x"
+                if ratio > threshold and stats["mean_ms"] > NOISE_FLOOR_MS:
+                    regressions.append((scenario, name, ratio))
+                    line += "  REGRESSION"
+            print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=MAP_SIZES)
+    parser.add_argument(
+        "--densities", nargs="+", default=list(UNIT_COUNTS), choices=list(UNIT_COUNTS)
+    )
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--recording", help="also run a recorded game")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", help="results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args()
+
+    scenarios = list(
+        synthetic_scenarios(args.sizes, args.densities, args.turns, args.seed)
+    )
+    if args.recording:
+        scenarios.extend(recorded_scenarios(args.recording))
+
+    results = {name: run_scenario(observations) for name, observations in scenarios}
+
+    with open(args.output, "w") as stream:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "turns": args.turns,
+                "seed": args.seed,
+                "results": results,
+            },
+            stream,
+            indent=2,
+        )
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as stream:
+            baseline = json.load(stream)["results"]
+
+    regressions = compare(results, baseline, args.threshold)
+    print(f"results written to {args.output}")
+    if regressions:
+        print(f"{len(regressions)} regressions above {args.threshold}x")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,16 @@
 import logging
 import math
 
+import numpy as np
+
 from lux.game_map import Cell, Position
 from lux.constants import Constants
 from lux.game_constants import GAME_CONSTANTS
 from helperFunctions.helper_functions import *
 from Map.mapService import get_cell_neighbours_four, get_nearest_position
+from Map.distanceTransform import NearestPositionMap
 from Units.unitsService import get_unit_by_id
-from Enemy.enemyService import get_enemy_tiles
+from Cluster.clusterFeatures import ClusterFeatureTable
 
 from Resources.resourceService import get_resources_from_cells
 
@@ -24,22 +27,43 @@ class Cluster:
     The cluster is basically a connected component of resources
     Each cluster consists of only one type of resources (Wood / Coal / Uranium)
 
-    clusterID           int             Representative Cell DSU Rank
+    clusterID           int             Representative cell index (DSU root)
     cells               List(Cells)     List of this cluster's cells
     units               List(Str)       List of this cluster's units (workers / carts)
     perimeter           List(Cells)     List of this cluster's perimeter cells
     exposed_perimeter   List(Cells)     List of this cluster's perimeter cells without citytiles
-    missions            List(Mission)   List of this cluster's missions
+    perimeter_citytiles List(int)       Number of citytiles of each team on the perimeter
+    total_fuel          int             Cached get_total_fuel() (None when stale)
+    centroid            Position        Cached get_centroid() (None when stale)
+    perimeter_transform NearestPositionMap  Nearest perimeter cell of every cell
+    exposed_transform   NearestPositionMap  Nearest exposed perimeter cell of every cell
+    registry            MissionRegistry Missions of every cluster (shared with the controller)
+    missions            View(Mission)   Live view of this cluster's missions in the registry
+
+    The perimeter, exposed perimeter and citytile counts are cached, they are
+    only recomputed when one of the watched cells (resource cells and their
+    four neighbours) changed.
     """
 
-    def __init__(self, resource_type, cluster_id, cells):
+    def __init__(self, resource_type, cluster_id, cells, registry):
         self.resource_type = resource_type
         self.clusterID = cluster_id
         self.resource_cells = cells
         self.units = []
         self.perimeter = []
         self.exposed_perimeter = []
-        self.missions = []
+        self.perimeter_citytiles = [0, 0]
+        self.watched_cells = None
+        self.total_fuel = None
+        self.centroid = None
+        self.perimeter_transform = None
+        self.exposed_transform = None
+        assert registry is not None, "a cluster needs the controller's MissionRegistry"
+        self.registry = registry
+
+    @property
+    def missions(self):
+        return self.registry.view(self)
 
     def get_perimeter(self, gamestate) -> list[Cell]:
         """
@@ -56,6 +80,58 @@ class Cluster:
         distinct_cells = sorted(list(distinct_cells))
         return distinct_cells
 
+    def invalidate_perimeter(self):
+        self.watched_cells = None
+
+    def perimeter_changed(self, changed_cells) -> bool:
+        """
+        Whether the perimeter cache is stale
+
+        changed_cells   bool[width, height]     Cells whose resource or citytile
+                                                changed this turn (None: unknown)
+        """
+        if self.watched_cells is None or changed_cells is None:
+            return True
+        return bool(changed_cells[self.watched_cells].any())
+
+    def refresh_perimeter(self, gamestate):
+        """
+        Recompute the perimeter, exposed perimeter and citytile counts
+        and the cells they depend on
+        """
+        perimeter = set()
+        watched = set()
+        for cell in self.resource_cells:
+            watched.add((cell.pos.x, cell.pos.y))
+            for neighbour in get_cell_neighbours_four(cell, gamestate):
+                watched.add((neighbour.pos.x, neighbour.pos.y))
+                if not neighbour.has_resource():
+                    perimeter.add((neighbour.pos.x, neighbour.pos.y))
+
+        self.perimeter = sorted(perimeter)
+
+        exposed = []
+        citytile_counts = [0, 0]
+        for cell in self.perimeter:
+            citytile = gamestate.map.get_cell(cell[0], cell[1]).citytile
+            if citytile is None:
+                exposed.append(cell)
+            else:
+                citytile_counts[citytile.team] += 1
+
+        self.exposed_perimeter = exposed
+        self.perimeter_citytiles = citytile_counts
+        self.centroid = None
+        self.total_fuel = None
+
+        width, height = gamestate.map.width, gamestate.map.height
+        self.perimeter_transform = NearestPositionMap(self.perimeter, width, height)
+        self.exposed_transform = NearestPositionMap(self.exposed_perimeter, width, height)
+
+        xs = np.fromiter((x for x, _ in watched), dtype=np.intp, count=len(watched))
+        ys = np.fromiter((y for _, y in watched), dtype=np.intp, count=len(watched))
+        self.watched_cells = (xs, ys)
+
     def get_total_fuel(self) -> int:
         """
         Get total cluster fuel
@@ -86,6 +162,22 @@ class Cluster:
 
         return Position(round(sum_x / k), round(sum_y / k))
 
+    def cached_total_fuel(self):
+        """
+        get_total_fuel, cached until the cluster cells or their amounts change
+        """
+        if self.total_fuel is None:
+            self.total_fuel = self.get_total_fuel()
+        return self.total_fuel
+
+    def cached_centroid(self):
+        """
+        get_centroid, cached until the cluster cells change
+        """
+        if self.centroid is None:
+            self.centroid = self.get_centroid()
+        return self.centroid
+
     def get_cluster_area(self, gamestate):
         """
         Get whole cluster area
@@ -118,126 +210,85 @@ class Cluster:
         except ValueError:
             pass
 
-    def get_cluster_score_for_worker(self, worker, gamestate, player_id, opponent):
+    def get_cluster_score_for_worker(
+        self, worker, gamestate, player_id, opponent, features=None
+    ):
         """
         Check the score of this cluster for worker
         If the score is high enough, the worker should work for this cluster
+        features is this turn's ClusterFeatureTable (built for this cluster if None)
         TODO: Look for a more sophisticated way to calculate the score
         """
-        opponent_id = 1 - player_id
-
         if len(self.resource_cells) == 0:
             return 0
 
-        perimeter = self.get_perimeter(gamestate)
-        nearest_position, distance = get_nearest_position(worker.pos, perimeter)
+        if features is None:
+            features = ClusterFeatureTable([self], player_id, gamestate)
+        row = features.row(self)
 
-        # cluster_area represents all of the cluster cells (including its perimeter)
-        cluster_area = [
-            gamestate.map.get_cell_by_pos(Position(pos[0], pos[1])) for pos in perimeter
-        ]
-
-        cluster_area.extend(self.resource_cells)
-
-        opponent_tiles, opponent_units = get_enemy_tiles(
-            cluster_area,
-            opponent,
-            opponent_id,
-        )
-
-        # And how many of the perimeter are our citytiles.
-        player_citytiles = []
-        for cell in perimeter:
-            cell = gamestate.map.get_cell_by_pos(Position(cell[0], cell[1]))
-            if cell.citytile is not None:
-                if cell.citytile.team == player_id:
-                    player_citytiles.append(cell.citytile)
+        nearest_position, distance = self.nearest_perimeter(worker.pos, self.perimeter)
 
         cluster_score = (
             distance * cluster_weights["DISTANCE"]
-            + len(self.resource_cells) * cluster_weights["RESOURCE_CELLS"]
-            + len(perimeter) * cluster_weights["PERIMETER"]
-            + len(player_citytiles) * cluster_weights["OUR_CITYTILES"]
+            + features.resource_cells[row] * cluster_weights["RESOURCE_CELLS"]
+            + features.perimeter[row] * cluster_weights["PERIMETER"]
+            + features.player_citytiles[row] * cluster_weights["OUR_CITYTILES"]
             + len(self.units) * cluster_weights["OUR_UNITS"]
-            + len(opponent_units) * cluster_weights["OPPONENT_UNITS"]
-            + len(opponent_tiles) * cluster_weights["OPPONENT_CITYTILES"]
+            + features.opponent_units[row] * cluster_weights["OPPONENT_UNITS"]
+            + features.opponent_citytiles[row] * cluster_weights["OPPONENT_CITYTILES"]
         )
 
         return cluster_score
 
-    def update_cluster(self, game_state, player):
+    def update_cluster(self, game_state, player, changed_cells=None, delta=None):
         """
         Update this cluster
         1- Update Resource Cells (Some cells get consumed)
         2- Update Cluster Units (Some units die)
-        3- Update Perimeter and Exposed Perimeter
-        """
-
-        # Update Cluster Resource Cells
-        new_resource_cells = get_resources_from_cells(
-            game_state, [cell.pos for cell in self.resource_cells]
-        )
-        self.resource_cells = new_resource_cells
-
-        # Update Cluster Units
-        player_all_units = list(unit.id for unit in player.units)
+        3- Update Perimeter and Exposed Perimeter (only if a watched cell changed)
 
-        cluster_units = list(
-            unit_id for unit_id in self.units if unit_id in player_all_units
-        )
-
-        self.units = cluster_units
-
-        # Update Perimeter
-        self.perimeter = self.get_perimeter(game_state)
-
-        # Update Perimeter Cells without CityTiles
-        exposed = []
-        for cell in self.perimeter:
-            pos = Position(cell[0], cell[1])
-            if (
-                game_state.map.get_cell_by_pos(pos).citytile is None
-                and not game_state.map.get_cell_by_pos(pos).has_resource()
-            ):
-                exposed.append(cell)
-
-        self.exposed_perimeter = exposed
-
-    def remove_finished_missions(self, game_state, player):
+        With the turn delta (incremental updates) the cells are the same
+        objects as last turn and the re-clustering already removed the
+        consumed ones, only the dead units and their missions are dropped.
         """
-        Remove all finished missions from this cluster
+        if delta is None:
+            # Update Cluster Resource Cells
+            new_resource_cells = get_resources_from_cells(
+                game_state, [cell.pos for cell in self.resource_cells]
+            )
+            self.resource_cells = new_resource_cells
+            self.total_fuel = None
 
-        - Remove all finished BUILD_TILE missions
-        - Remove all finished EXPLORE missions
-        - Remove all finished GUARD_CLUSTER missions
+            # Update Cluster Units
+            cluster_units = list(
+                unit_id for unit_id in self.units if unit_id in player.units_by_id
+            )
 
-        """
-        remove_finished_tile_missions(self.missions, game_state)
-        remove_finished_explore_missions(self.missions, player)
-        remove_finished_guard_missions(self.missions, player)
+            self.units = cluster_units
 
-    def remove_missions_with_no_units(self, missions, units):
-        for key in missions.copy():
-            if key not in units:
-                del missions[missions.index(key)]
+        elif delta.dead_units[player.team]:
+            dead_units = delta.dead_units[player.team]
+            for unit_id in self.units:
+                if unit_id in dead_units:
+                    self.registry.remove_unit(unit_id)
+            self.units = [unit_id for unit_id in self.units if unit_id not in dead_units]
 
-    def update_missions(self, game_state, player):
-        """
-        Update the missions for this cluster
+        # Update Perimeter, Perimeter Cells without CityTiles and CityTile counts
+        if self.perimeter_changed(changed_cells):
+            self.refresh_perimeter(game_state)
 
-        1- Remove all finished missions
-        2- Remove all missions with no responsible units
-        3- Issue new missions:
+    def issue_missions(self):
+        """
+        Issue new missions to the units of the cluster without one, once
+        ClusterController.update_missions removed the finished missions:
             - If the cluster has no tiles, issue a BUILD_TILE mission (First Priority)
             - If the cluster has units, issue a GUARD_CLUSTER mission (Second Priority)
-        """
-        self.remove_missions_with_no_units(self.missions, self.units)
-        self.remove_finished_missions(game_state, player)
 
+        Return the ids of the units that left the cluster
+        """
+        registry = self.registry
         units_without_missions = [
-            unit_id
-            for unit_id in self.units
-            if unit_id not in [mission.responsible_unit for mission in self.missions]
+            unit_id for unit_id in self.units if registry.of_unit(unit_id) is None
         ]
 
         cells_without_tiles = self.exposed_perimeter
@@ -252,14 +303,12 @@ class Cluster:
                 mission_type=BUILD_TILE,
             )
 
-            self.missions.append(mission)
+            registry.add(mission, self)
 
             build_mission_count += 1
 
         units_without_missions = [
-            unit_id
-            for unit_id in self.units
-            if unit_id not in [mission.responsible_unit for mission in self.missions]
+            unit_id for unit_id in self.units if registry.of_unit(unit_id) is None
         ]
 
         guard_mission_count = 0
@@ -272,27 +321,44 @@ class Cluster:
                 mission_type=GUARD_CLUSTER,
             )
 
-            self.missions.append(mission)
+            registry.add(mission, self)
             guard_mission_count += 1
 
         # Remove units that are not assigned to any mission
         released_units = [
-            unit_id
-            for unit_id in self.units
-            if unit_id not in [mission.responsible_unit for mission in self.missions]
+            unit_id for unit_id in self.units if registry.of_unit(unit_id) is None
         ]
 
         for unit_id in released_units:
             self.remove_unit(unit_id)
 
         if len(self.resource_cells) == 0:
+            released_units.extend(self.units)
             self.units = []
-            self.missions = []
+            registry.clear(self)
+
+        return released_units
 
     def assign_targets_to_missions(
-        self, game_state, player, opponent, mission_type, step
+        self, game_state, player, opponent, mission_type, step, build_scores=None
     ):
+        units, target_positions = self.get_mission_targets(
+            game_state, player, opponent, mission_type, build_scores
+        )
 
+        if len(units) == 0 or len(target_positions) == 0:
+            return
+
+        negotiate_missions(self.missions, units, target_positions)
+
+    def get_mission_targets(
+        self, game_state, player, opponent, mission_type, build_scores=None
+    ):
+        """
+        Units of the negotiable missions of mission_type and their candidate
+        target positions
+        build_scores is this turn's BuildScoreMap, shared by the clusters
+        """
         units = []
 
         for mission in self.missions:
@@ -300,14 +366,19 @@ class Cluster:
                 units.append(get_unit_by_id(mission.responsible_unit, player))
 
         if len(units) == 0:
-            return
+            return units, []
 
         target_positions = []
 
         if mission_type == BUILD_TILE:
             target_positions.extend(
                 get_important_positions(
-                    game_state, opponent, self.exposed_perimeter, self.missions, player
+                    game_state,
+                    opponent,
+                    self.exposed_perimeter,
+                    self.missions,
+                    player,
+                    build_scores,
                 )
             )
 
@@ -319,16 +390,14 @@ class Cluster:
                     [cell.pos for cell in self.resource_cells],
                     self.missions,
                     player,
+                    build_scores,
                 )
             )
 
         if mission_type == EXPLORE:
             target_positions = self.exposed_perimeter
 
-        if len(target_positions) == 0:
-            return
-
-        self.missions = negotiate_missions(self.missions, units, target_positions)
+        return units, target_positions
 
     def get_build_actions(self, game_stats, player):
         actions = []
@@ -347,7 +416,7 @@ class Cluster:
 
         return actions
 
-    def get_required_moves(self, player):
+    def get_required_moves(self, player, pathfinder=None):
         moves = []
 
         for mission in self.missions:
@@ -358,16 +427,33 @@ class Cluster:
                 continue
 
             if unit.can_act() and not unit.pos.equals(target_pos):
-                moves.append(mission.get_moves(player))
+                moves.append(mission.get_moves(player, pathfinder))
 
         return moves
 
-    def handle_explore_missions(self, game_state_info, resource_cells, player):
+    def nearest_perimeter(self, pos, perimeter):
+        """
+        get_nearest_position(pos, perimeter) for the perimeter or the exposed
+        perimeter, looked up in their distance transforms when built
+        """
+        if perimeter is self.perimeter and self.perimeter_transform is not None:
+            return self.perimeter_transform.lookup(pos)
+        if perimeter is self.exposed_perimeter and self.exposed_transform is not None:
+            return self.exposed_transform.lookup(pos)
+        return get_nearest_position(pos, perimeter)
+
+    def handle_explore_missions(
+        self, game_state_info, resource_cells, player, resource_transform=None
+    ):
+        """
+        resource_transform is the NearestPositionMap of resource_cells
+        (get_nearest_position is used without it)
+        """
         for mission in self.missions:
             if mission.mission_type == EXPLORE and mission.responsible_unit is not None:
                 unit = get_unit_by_id(mission.responsible_unit, player)
 
-                closest_perimeter, distance = get_nearest_position(
+                closest_perimeter, distance = self.nearest_perimeter(
                     unit.pos, self.exposed_perimeter
                 )
 
@@ -388,9 +474,14 @@ class Cluster:
                 # If the worker doesn't have enough fuel
                 # Refill from the nearest resource cell
                 if unit_fuel < night_fuel_required:
-                    closest_resource_cell, distance = get_nearest_position(
-                        unit.pos, resource_cells
-                    )
+                    if resource_transform is not None:
+                        closest_resource_cell, distance = resource_transform.lookup(
+                            unit.pos
+                        )
+                    else:
+                        closest_resource_cell, distance = get_nearest_position(
+                            unit.pos, resource_cells
+                        )
 
                     # Get to an adjacent cell
                     if closest_resource_cell is not None:
@@ -0,0 +1,70 @@
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from Weights.Cluster import cluster_weights
+
+# Score of a cluster the worker cannot reach (no perimeter)
+UNREACHABLE = -1e9
+
+
+def worker_score_matrix(workers, features, columns=None):
+    """
+    Score of every cluster for every worker (workers x clusters), the
+    vectorized get_cluster_score_for_worker
+
+    features    ClusterFeatureTable     This turn's cluster features
+    columns     int[clusters]           Rows of the table to score (all by default)
+
+    Return (scores, empty)
+    """
+    if columns is None:
+        columns = np.arange(len(features))
+
+    constant = (
+        features.resource_cells * cluster_weights["RESOURCE_CELLS"]
+        + features.perimeter * cluster_weights["PERIMETER"]
+        + features.player_citytiles * cluster_weights["OUR_CITYTILES"]
+        + features.units() * cluster_weights["OUR_UNITS"]
+        + features.opponent_units * cluster_weights["OPPONENT_UNITS"]
+        + features.opponent_citytiles * cluster_weights["OPPONENT_CITYTILES"]
+    )
+    distances = features.perimeter_distances([worker.pos for worker in workers])
+
+    scores = distances[:, columns] * cluster_weights["DISTANCE"] + constant[columns]
+    empty = features.empty[columns]
+    scores[:, empty] = 0
+    return scores, empty
+
+
+def assign_workers_to_clusters(scores, empty):
+    """
+    Assign every worker a cluster, maximizing the total score
+
+    Each worker added to a cluster lowers the cluster's score for the next
+    one by the OUR_UNITS weight (as add_unit does for the greedy loop), so
+    every cluster is split in slots, slot k scoring k times the OUR_UNITS
+    weight less, and the workers are matched to the slots.
+
+    Clusters only get `depth` slots, starting from twice their fair share of
+    the workers. A cluster with a slot left free could not take one more
+    worker for a better score, so the matching is optimal unless a cluster
+    filled all of its slots, in which case the depth is doubled.
+
+    Return the column of the cluster of every worker
+    """
+    workers, clusters = scores.shape
+    scores = np.where(np.isfinite(scores), scores, UNREACHABLE)
+
+    depth = min(workers, 2 * -(-workers // max(clusters, 1)))
+    while True:
+        slot_penalty = np.outer(~empty, np.arange(depth)) * cluster_weights["OUR_UNITS"]
+        slots = (scores[:, :, None] + slot_penalty[None, :, :]).reshape(
+            workers, clusters * depth
+        )
+
+        rows, columns = linear_sum_assignment(slots, maximize=True)
+        assigned = np.empty(workers, dtype=np.intp)
+        assigned[rows] = columns // depth
+        if depth == workers or np.bincount(assigned, minlength=clusters).max() < depth:
+            return assigned
+        depth = min(workers, 2 * depth)
@@ -1,13 +1,24 @@
 import math
 
+import numpy as np
+
 # from typing import List, Dict, Tuple
 from Cluster.Cluster import Cluster
-
-# from agent import game_state
-from lux.game_map import Cell
-
-from Resources.resourceService import same_resource
-from Map.mapService import get_cell_neighbours_eight
+from Missions.MissionRegistry import MissionRegistry
+from Missions.MissionController import (
+    remove_finished_explore_missions,
+    remove_finished_guard_missions,
+    remove_finished_tile_missions,
+)
+
+from lux.array_map import NO_RESOURCE, RESOURCE_CODES
+from Cluster.clusterFeatures import ClusterFeatureTable
+from Cluster.clusterAssignment import assign_workers_to_clusters, worker_score_matrix
+from Cluster.clusterLabelling import (
+    citytile_team_plane,
+    label_resource_clusters,
+    resource_type_plane,
+)
 
 # logging.basicConfig(filename="ClusterController.log", level=logging.INFO)
 
@@ -16,121 +27,347 @@ class ClusterController:
     """
     This Class is a DSU Data Structure for Clusters
 
-    parent:         List(List(int))         Cluster Representative of each Cell Cluster
-    rank:           List(int)               Cell Rank (for finding Cluster Rep.)
-    clustersDict:   Dict[int -> Cluster]    Mapping of Each Cluster Representative to Cluster
+    parent:         int32[width * height]   Parent of each cell index (y * width + x)
+    rank:           int32[width * height]   Cell Rank (for finding Cluster Rep.)
+    clustersDict:   Dict[int -> Cluster]    Mapping of the index of each cluster's
+                                            first cell (x-major scan) to Cluster
+    resource_types: int8[width, height]     Resource plane the clusters were built from
+    citytile_teams: int8[width, height]     Citytile plane of the last update_clusters
+    features:       ClusterFeatureTable     Cluster features of this turn
+    delta:          TurnDelta               Pending turn delta (see on_delta)
+    version:        int                     Bumped whenever cluster cells change
+    ownership:      int32[width, height]    Feature row of the closest cluster of
+                                            every cell (see ownership_grid)
+    missions:       MissionRegistry         Missions of every cluster, shared with
+                                            the clusters and agent()
+    homeless:       Dict[str -> None]       Ids of the player's units without a
+                                            cluster, kept up to date from the turn
+                                            deltas (None: scan the clusters)
     """
 
-    def __init__(self, width, height, gamestate):
+    def __init__(self, width, height, gamestate, missions=None):
         self.width = width
         self.height = height
+        self.missions = missions if missions is not None else MissionRegistry()
 
-        self.parent = []
-        for x in range(width):
-            for y in range(height):
-                self.parent.append(self.get_cell_value(x, y))
-
-        self.rank = [0 for i in range(width * height)]
+        self.parent = np.arange(width * height, dtype=np.int32)
+        self.rank = np.zeros(width * height, dtype=np.int32)
         self.clusterDict = dict()
         self.woodClusters = []
         self.coalClusters = []
         self.uraniumClusters = []
+        self.resource_types = None
+        self.citytile_teams = None
+        self.features = None
+        self.delta = None
+        self.version = 0
+        self.ownership = None
+        self.ownership_version = -1
+        self.homeless = None
 
     def get_cell_value(self, x: int, y: int):
-        return x * self.width + y
+        return y * self.width + x
+
+    def get_cell_indices(self, cells):
+        return np.fromiter(
+            (cell.pos.y * self.width + cell.pos.x for cell in cells),
+            dtype=np.int32,
+            count=len(cells),
+        )
 
     # This method is only called once (at the game start)
     def getClustersRolling(self, width, height, game_state):
-        visited_cell = [[False for _ in range(height)] for _ in range(width)]
-
-        def dfs(x, y, cluster_cells, gamestate):
-            visited_cell[x][y] = True
-            real_cell = game_state.map.get_cell(x, y)
-            cluster_cells.append(real_cell)
-
-            for cell in get_cell_neighbours_eight(Cell(x, y), gamestate):
-                if not visited_cell[cell.pos.x][cell.pos.y]:
-                    neighbour_cell = game_state.map.get_cell(cell.pos.x, cell.pos.y)
-
-                    if neighbour_cell.has_resource() and same_resource(
-                        real_cell, neighbour_cell
-                    ):
-                        dfs(
-                            neighbour_cell.pos.x,
-                            neighbour_cell.pos.y,
-                            cluster_cells,
-                            gamestate,
-                        )
-
-        for x in range(width):
-            for y in range(height):
-                cell = game_state.map.get_cell(x, y)
-
-                if cell.has_resource() and not visited_cell[x][y]:
-                    cluster_cells = []
-
-                    # Start DFS for this cluster
-                    dfs(x, y, cluster_cells, game_state)
-
-                    # Union all cells found in this cluster
-                    for i in range(1, len(cluster_cells)):
-                        self.unionClusters(cluster_cells[0], cluster_cells[i])
-
-                    current_cluster = Cluster(
-                        cell.resource.type,
-                        self.rank[self.get_cell_value(x, y)],
-                        cluster_cells,
-                    )
-                    if cell.resource.type == "wood":
-                        self.woodClusters.append(current_cluster)
-                    elif cell.resource.type == "coal":
-                        self.coalClusters.append(current_cluster)
-                    else:
-                        self.uraniumClusters.append(current_cluster)
-
-                    self.clusterDict[self.get_cell_value(x, y)] = current_cluster
+        """
+        Find the resource clusters through connected-component labelling
+        of the resource planes (see clusterLabelling.py)
+        """
+        self.resource_types = resource_type_plane(game_state)
+
+        for resource_type, cluster_cells in label_resource_clusters(
+            game_state, self.resource_types
+        ):
+            current_cluster = self.new_cluster(resource_type, cluster_cells)
+            self.clusterDict[current_cluster.clusterID] = current_cluster
+
+    def new_cluster(self, resource_type, cluster_cells):
+        cluster = Cluster(
+            resource_type, self.link_cells(cluster_cells), cluster_cells, self.missions
+        )
+        self.get_type_clusters(resource_type).append(cluster)
+        return cluster
+
+    def get_type_clusters(self, resource_type):
+        if resource_type == "wood":
+            return self.woodClusters
+        if resource_type == "coal":
+            return self.coalClusters
+        return self.uraniumClusters
+
+    def link_cells(self, cluster_cells):
+        """
+        Make the first cell the representative of all cluster_cells
+        Return the representative index
+        """
+        indices = self.get_cell_indices(cluster_cells)
+        root = int(indices[0])
+        self.parent[indices] = root
+        self.rank[indices] = 0
+        self.rank[root] = 1 if len(indices) > 1 else 0
+        return root
+
+    def find(self, index: int) -> int:
+        """
+        Representative of a cell index, iterative with path compression
+        """
+        parent = self.parent
+        root = index
+        while parent[root] != root:
+            root = int(parent[root])
+        while index != root:
+            parent[index], index = root, int(parent[index])
+        return root
 
     # find unique Cluster by its representative cell
     def findCluster(self, cell):
-        cell_value = self.get_cell_value(cell.pos.x, cell.pos.y)
-
-        if self.parent[cell_value] != cell_value:
-            # Convert the parent index back to x, y coordinates to call findCluster recursively
-            parent_x = self.parent[cell_value] // self.width
-            parent_y = self.parent[cell_value] % self.width
-            # Recursively call findCluster and apply path compression
-            self.parent[cell_value] = self.findCluster(Cell(parent_x, parent_y))
-
-        return self.parent[cell_value]
+        return self.find(self.get_cell_value(cell.pos.x, cell.pos.y))
 
     # Check if two cells belong to the same cluster
-    def isSameCluster(self, cell1: Cell, cell2: Cell):
+    def isSameCluster(self, cell1, cell2):
         return self.findCluster(cell1) == self.findCluster(cell2)
 
     # Union two Clusters
-    def unionClusters(self, cell1: Cell, cell2: Cell):
-        if self.isSameCluster(cell1, cell2):
-            return
-
-        # Find the Cluster Representative of each cell
+    def unionClusters(self, cell1, cell2):
         ClusterRep1 = self.findCluster(cell1)
         ClusterRep2 = self.findCluster(cell2)
+        if ClusterRep1 == ClusterRep2:
+            return
 
         if self.rank[ClusterRep1] > self.rank[ClusterRep2]:
             ClusterRep1, ClusterRep2 = ClusterRep2, ClusterRep1
 
-        self.parent[ClusterRep1] = self.parent[ClusterRep2]
+        self.parent[ClusterRep1] = ClusterRep2
 
         if self.rank[ClusterRep1] == self.rank[ClusterRep2]:
             self.rank[ClusterRep2] += 1
 
+    def on_delta(self, delta):
+        """
+        Game listener (Game.subscribe): keep the turn delta for update_clusters
+        """
+        self.delta = delta
+
+    def recluster(self, game_state, delta=None):
+        """
+        Incremental re-clustering
+
+        Compare the resource plane with the one the clusters were built from:
+        - a cluster that lost cells may have been cut in pieces, the largest
+          piece stays the same Cluster (units / missions), the others
+          become new clusters
+        - cells that gained resources (wood regrowth) join, and possibly
+          merge, the clusters around them
+        Only the affected clusters are relabelled, fully consumed clusters
+        are left empty.
+        With the turn delta only the cells it lists are read from the map.
+
+        Return the bool[width, height] mask of the cells whose resource changed
+        """
+        if delta is None or delta.full:
+            types = resource_type_plane(game_state)
+        else:
+            types = self.resource_types.copy()
+            for x, y in delta.depleted:
+                types[x, y] = NO_RESOURCE
+            for x, y in delta.regrown:
+                cell = game_state.map.get_cell(x, y)
+                if cell.has_resource():
+                    types[x, y] = RESOURCE_CODES[cell.resource.type]
+        previous = self.resource_types
+        self.resource_types = types
+
+        changed = types != previous
+        if not changed.any():
+            return changed
+
+        lost = changed & (previous != NO_RESOURCE)
+        gained = changed & (types != NO_RESOURCE)
+
+        # Representatives of the clusters touched by the changes
+        affected_roots = set()
+        for x, y in zip(*np.nonzero(lost)):
+            affected_roots.add(self.find(self.get_cell_value(int(x), int(y))))
+
+        gained_xs, gained_ys = np.nonzero(gained)
+        for x, y in zip(gained_xs.tolist(), gained_ys.tolist()):
+            for nx in range(max(x - 1, 0), min(x + 2, self.width)):
+                for ny in range(max(y - 1, 0), min(y + 2, self.height)):
+                    if previous[nx, ny] == types[x, y] and not changed[nx, ny]:
+                        affected_roots.add(self.find(self.get_cell_value(nx, ny)))
+
+        clusters_by_root = {
+            cluster.clusterID: key for key, cluster in self.clusterDict.items()
+        }
+        affected_keys = [
+            clusters_by_root[root] for root in affected_roots if root in clusters_by_root
+        ]
+
+        # Relabel the cells of the affected clusters plus the gained cells
+        region = gained.copy()
+        for key in affected_keys:
+            for cell in self.clusterDict[key].resource_cells:
+                region[cell.pos.x, cell.pos.y] = True
+        region &= types != NO_RESOURCE
+
+        # Which old cluster every piece comes from (cells counted per cluster)
+        pieces = []
+        for resource_type, cells in label_resource_clusters(game_state, types, region):
+            indices = self.get_cell_indices(cells)
+            overlap = {}
+            for index in indices.tolist():
+                if previous.T.flat[index] == NO_RESOURCE:
+                    continue
+                key = clusters_by_root.get(self.find(index))
+                if key is not None:
+                    overlap[key] = overlap.get(key, 0) + 1
+            pieces.append((resource_type, cells, overlap))
+
+        lost_indices = np.nonzero(lost.T.ravel())[0]
+        self.parent[lost_indices] = lost_indices
+        self.rank[lost_indices] = 0
+
+        # Each old cluster lives on in its largest piece
+        main_piece = {}
+        for piece, (_, _, overlap) in enumerate(pieces):
+            for key, count in overlap.items():
+                if key not in main_piece or count > pieces[main_piece[key]][2][key]:
+                    main_piece[key] = piece
+
+        # Fully consumed clusters are left empty
+        for key in affected_keys:
+            if key not in main_piece:
+                self.clusterDict[key].resource_cells = []
+                self.clusterDict[key].invalidate_perimeter()
+
+        replaced = {}
+        new_clusters = []
+        for piece, (resource_type, cells, overlap) in enumerate(pieces):
+            owners = sorted(
+                (key for key in overlap if main_piece[key] == piece),
+                key=lambda key: -overlap[key],
+            )
+            if not owners:
+                new_clusters.append(self.new_cluster(resource_type, cells))
+                continue
+
+            # The piece keeps the cluster it overlaps most, the others merge into it
+            cluster = self.clusterDict[owners[0]]
+            for key in owners[1:]:
+                merged = self.clusterDict[key]
+                cluster.units.extend(merged.units)
+                self.missions.merge(merged, cluster)
+                self.get_type_clusters(merged.resource_type).remove(merged)
+                replaced[key] = None
+
+            cluster.resource_cells = cells
+            cluster.clusterID = self.link_cells(cells)
+            cluster.invalidate_perimeter()
+            replaced[owners[0]] = cluster
+
+        # Rebuild the dictionary in the same order, keyed by the new representatives
+        cluster_dict = {}
+        for key, cluster in self.clusterDict.items():
+            if key in replaced:
+                cluster = replaced[key]
+                if cluster is None:
+                    continue
+                key = cluster.clusterID
+            cluster_dict[key] = cluster
+        for cluster in new_clusters:
+            cluster_dict[cluster.clusterID] = cluster
+        self.clusterDict = cluster_dict
+        return changed
+
     def update_clusters(self, game_state, player):
+        """
+        Re-cluster, then update every cluster, the cluster perimeters are
+        only recomputed around the cells whose resource or citytile changed.
+        Finally build this turn's feature table for the scorers.
+        When the controller listens to the game (on_delta) the changes are
+        taken from the turn delta instead of rescanning the map.
+        """
+        delta, self.delta = self.delta, None
+        if delta is not None and delta.full:
+            delta = None
+
+        changed = self.recluster(game_state, delta)
+        if changed.any():
+            self.version += 1
+
+        citytile_teams = citytile_team_plane(game_state)
+        if self.citytile_teams is None:
+            changed = None
+        elif delta is None:
+            changed |= citytile_teams != self.citytile_teams
+        else:
+            for x, y in delta.new_citytiles + delta.removed_citytiles:
+                changed[x, y] = True
+        self.citytile_teams = citytile_teams
+
+        if delta is not None:
+            # Mined cells: only their clusters recompute the fuel
+            clusters_by_root = {
+                cluster.clusterID: cluster for cluster in self.clusterDict.values()
+            }
+            for x, y in delta.amount_changed:
+                cluster = clusters_by_root.get(self.find(self.get_cell_value(x, y)))
+                if cluster is not None:
+                    cluster.total_fuel = None
+
         for Clusterid, cluster in self.clusterDict.items():
-            cluster.update_cluster(game_state, player)
+            cluster.update_cluster(game_state, player, changed, delta)
+
+        if delta is None or self.homeless is None:
+            self.homeless = dict.fromkeys(
+                unit.id for unit in self.scan_units_without_clusters(player)
+            )
+        else:
+            for unit_id in delta.spawned_units[player.team]:
+                self.homeless[unit_id] = None
+            for unit_id in delta.dead_units[player.team]:
+                self.homeless.pop(unit_id, None)
+
+        self.features = ClusterFeatureTable(
+            self.clusterDict.values(), player.team, game_state
+        )
+
+    def ownership_grid(self):
+        """
+        Feature row of the closest live cluster of every cell, [x, y]
+        Recomputed only when the clusters changed (the feature rows keep
+        their order as long as the clusters do not change)
+        """
+        if self.ownership_version != self.version:
+            self.ownership = self.features.ownership_grid(self.width, self.height)
+            self.ownership_version = self.version
+        return self.ownership
 
     def update_missions(self, game_state, player):
+        """
+        Update the missions of every cluster
+
+        1- Remove all missions whose unit left (or never joined) their cluster
+        2- Remove all finished missions, in one sweep over the registry per type
+        3- Issue new missions (Cluster.issue_missions)
+        """
+        self.missions.remove_orphans()
+        remove_finished_tile_missions(self.missions, game_state)
+        remove_finished_explore_missions(self.missions, player)
+        remove_finished_guard_missions(self.missions, player)
+
         for cluster in self.clusterDict.values():
-            cluster.update_missions(game_state, player)
+            for unit_id in cluster.issue_missions():
+                if self.homeless is not None:
+                    self.homeless[unit_id] = None
 
     def assign_worker(self, worker, game_state, player, player_id, opponent):
         # Scores[Int -> Score]
@@ -147,12 +384,18 @@ class ClusterController:
             if not player.researched_uranium() and cluster.resource_type == "uranium":
                 del copyDict[id]
 
+        features = self.features
+        if features is None:
+            features = ClusterFeatureTable(
+                self.clusterDict.values(), player_id, game_state
+            )
+
         maximum_score = -math.inf
         assigned_cluster = None
 
         for cluster in copyDict.values():
             current_cluster_score = cluster.get_cluster_score_for_worker(
-                worker, game_state, player_id, opponent
+                worker, game_state, player_id, opponent, features
             )
 
             if current_cluster_score > maximum_score:
@@ -161,10 +404,58 @@ class ClusterController:
 
         return assigned_cluster
 
+    def assign_workers(self, workers, game_state, player, player_id, opponent):
+        """
+        Batched assign_worker: score every cluster for every worker at once
+        and solve the assignment of all the workers together, taking into
+        account that each added worker makes its cluster less attractive
+
+        Return the assigned cluster of every worker (None without clusters)
+        """
+        features = self.features
+        if features is None:
+            features = ClusterFeatureTable(
+                self.clusterDict.values(), player_id, game_state
+            )
+
+        columns = [
+            row
+            for row, cluster in enumerate(features.clusters)
+            if (player.researched_coal() or cluster.resource_type != "coal")
+            and (player.researched_uranium() or cluster.resource_type != "uranium")
+        ]
+        if not columns or not workers:
+            return [None] * len(workers)
+
+        scores, empty = worker_score_matrix(workers, features, columns)
+        assigned = assign_workers_to_clusters(scores, empty)
+        return [features.clusters[columns[column]] for column in assigned]
+
+    def add_unit(self, cluster, unit_id):
+        """
+        Home a unit in cluster
+        """
+        cluster.add_unit(unit_id)
+        if self.homeless is not None:
+            self.homeless.pop(unit_id, None)
+
     def get_units_without_clusters(self, player):
-        units_with_clusters = []
+        """
+        The player's units that are not in any cluster (in player.units
+        order), from the homeless ids once update_clusters tracks them,
+        else by scanning the clusters
+        """
+        homeless = self.homeless
+        if homeless is not None:
+            if not homeless:
+                return []
+            return [unit for unit in player.units if unit.id in homeless]
+        return self.scan_units_without_clusters(player)
+
+    def scan_units_without_clusters(self, player):
+        units_with_clusters = set()
         for cluster in self.clusterDict.values():
-            units_with_clusters.extend(cluster.units)
+            units_with_clusters.update(cluster.units)
 
         units_without_clusters = []
         for unit in player.units:
@@ -0,0 +1,163 @@
+import numpy as np
+
+
+def nonempty_segments(starts, total):
+    """
+    Segments (given by their start offsets in an array of length total)
+    that hold at least one element
+    """
+    ends = np.append(starts[1:], total)
+    return np.nonzero(ends > starts)[0]
+
+
+def segment_sums(values, starts):
+    """
+    Sum of every segment of values, 0 for empty segments
+    """
+    sums = np.zeros(len(starts), dtype=np.int32)
+    nonempty = nonempty_segments(starts, len(values))
+    if len(nonempty):
+        sums[nonempty] = np.add.reduceat(values, starts[nonempty])
+    return sums
+
+
+class ClusterFeatureTable:
+    """
+    Per-turn facts about the clusters, one row per cluster (clusterDict order)
+
+    Built once per turn by ClusterController.update_clusters and read by every
+    scorer (assign_workers, get_cluster_score_for_worker, get_citytile_score,
+    get_closest_cluster_by_centroid) so each fact is computed once.
+
+    clusters                    List(Cluster)
+    rows                        Dict[int -> int]    clusterID -> row
+    resource_cells              int[clusters]       Number of resource cells
+    fuel                        float[clusters]     Cluster.get_total_fuel()
+    centroid                    float[clusters, 2]  Cluster.get_centroid() (inf when consumed)
+    perimeter                   int[clusters]       Number of perimeter cells
+    player_citytiles            int[clusters]       Our citytiles on the perimeter
+    opponent_citytiles          int[clusters]       Opponent citytiles on the perimeter
+    opponent_units              int[clusters]       Opponent units in the cluster area
+                                                    (resource cells and perimeter),
+                                                    summed on the occupancy grid
+    perimeter_opponent_units    int[clusters]       Opponent units on the perimeter
+    empty                       bool[clusters]      Clusters without resource cells
+    perimeter_cells             int[cells, 2]       Perimeter cells of all the clusters
+    perimeter_starts            int[clusters]       First perimeter_cells row of each cluster
+    """
+
+    def __init__(self, clusters, player_id, game_state):
+        opponent_id = 1 - player_id
+        count = len(clusters)
+
+        self.clusters = list(clusters)
+        self.rows = {}
+        self.resource_cells = np.zeros(count, dtype=np.int32)
+        self.fuel = np.zeros(count)
+        self.centroid = np.full((count, 2), np.inf)
+        self.perimeter = np.zeros(count, dtype=np.int32)
+        self.player_citytiles = np.zeros(count, dtype=np.int32)
+        self.opponent_citytiles = np.zeros(count, dtype=np.int32)
+        self.empty = np.zeros(count, dtype=bool)
+        self.perimeter_starts = np.zeros(count, dtype=np.intp)
+
+        perimeter_cells = []
+        area_cells = []
+        area_starts = np.zeros(count, dtype=np.intp)
+        for row, cluster in enumerate(self.clusters):
+            self.rows[cluster.clusterID] = row
+            self.perimeter_starts[row] = len(perimeter_cells)
+            area_starts[row] = len(area_cells)
+
+            self.resource_cells[row] = len(cluster.resource_cells)
+            self.perimeter[row] = len(cluster.perimeter)
+            self.player_citytiles[row] = cluster.perimeter_citytiles[player_id]
+            self.opponent_citytiles[row] = cluster.perimeter_citytiles[opponent_id]
+            if len(cluster.resource_cells) == 0:
+                self.empty[row] = True
+                continue
+
+            self.fuel[row] = cluster.cached_total_fuel()
+            centroid = cluster.cached_centroid()
+            self.centroid[row] = (centroid.x, centroid.y)
+            perimeter_cells.extend(cluster.perimeter)
+            area_cells.extend((cell.pos.x, cell.pos.y) for cell in cluster.resource_cells)
+
+        self.perimeter_cells = np.array(perimeter_cells, dtype=np.intp).reshape(-1, 2)
+        area_cells = np.array(area_cells, dtype=np.intp).reshape(-1, 2)
+
+        # Opponent units per cluster from the occupancy grid, one segment per cluster
+        unit_count = game_state.occupancy.unit_count[opponent_id]
+        self.perimeter_opponent_units = segment_sums(
+            unit_count[self.perimeter_cells[:, 0], self.perimeter_cells[:, 1]],
+            self.perimeter_starts,
+        )
+        self.opponent_units = self.perimeter_opponent_units + segment_sums(
+            unit_count[area_cells[:, 0], area_cells[:, 1]], area_starts
+        )
+
+    def __len__(self):
+        return len(self.clusters)
+
+    def row(self, cluster) -> int:
+        return self.rows[cluster.clusterID]
+
+    def units(self):
+        """
+        Units working for every cluster, read live (workers join during the turn)
+        """
+        return np.fromiter(
+            (len(cluster.units) for cluster in self.clusters),
+            dtype=np.int32,
+            count=len(self.clusters),
+        )
+
+    def perimeter_distances(self, positions):
+        """
+        Distance from every position to the nearest perimeter cell of every
+        cluster (positions x clusters, inf for clusters without perimeter),
+        gathered from the clusters' distance transforms
+        """
+        xs = np.fromiter((pos.x for pos in positions), dtype=np.intp)
+        ys = np.fromiter((pos.y for pos in positions), dtype=np.intp)
+        distances = np.full((len(xs), len(self.clusters)), np.inf)
+
+        for row in nonempty_segments(self.perimeter_starts, len(self.perimeter_cells)):
+            distances[:, row] = self.clusters[row].perimeter_transform.distance[xs, ys]
+        return distances
+
+    def closest_by_centroid(self, pos):
+        """
+        Closest cluster to pos by the distance to the cluster centroid
+
+        Return (clusterID, distance), (None, inf) when every cluster is consumed
+        """
+        if len(self.clusters) == 0:
+            return None, np.inf
+
+        distances = np.abs(self.centroid[:, 0] - pos.x) + np.abs(
+            self.centroid[:, 1] - pos.y
+        )
+        row = int(np.argmin(distances))
+        if not np.isfinite(distances[row]):
+            return None, np.inf
+        return self.clusters[row].clusterID, int(distances[row])
+
+    def ownership_grid(self, width, height):
+        """
+        Row of the closest cluster (by centroid, first row on ties as in
+        get_closest_cluster_by_centroid) of every cell, indexed [x, y],
+        -1 when every cluster is consumed
+        """
+        grid = np.full((width, height), -1, dtype=np.int32)
+        live = np.nonzero(~self.empty)[0]
+        if len(live) == 0:
+            return grid
+
+        xs = np.arange(width)[:, None, None]
+        ys = np.arange(height)[None, :, None]
+        distances = np.abs(xs - self.centroid[live, 0]) + np.abs(
+            ys - self.centroid[live, 1]
+        )
+        grid[:, :] = live[np.argmin(distances, axis=2)]
+        return grid
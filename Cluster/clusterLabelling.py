@@ -0,0 +1,102 @@
+import numpy as np
+from scipy import ndimage
+
+from lux.array_map import (
+    ArrayGameMap,
+    RESOURCE_CODES,
+    RESOURCE_NAMES,
+    NO_RESOURCE,
+)
+
+# Cells touching by a side or a corner belong to the same cluster
+EIGHT_CONNECTED = np.ones((3, 3), dtype=bool)
+
+
+def resource_type_plane(game_state):
+    """
+    Resource code of every cell with resources left (NO_RESOURCE elsewhere)
+    The plane is indexed [x, y], so np.nonzero walks it in the same order
+    as the `for x: for y:` scans of the cluster code
+    """
+    game_map = game_state.map
+
+    if isinstance(game_map, ArrayGameMap):
+        return np.where(game_map.resource_mask(), game_map.resource_type, NO_RESOURCE)
+
+    plane = np.full((game_map.width, game_map.height), NO_RESOURCE, dtype=np.int8)
+    for x in range(game_map.width):
+        for y in range(game_map.height):
+            cell = game_map.get_cell(x, y)
+            if cell.has_resource():
+                plane[x, y] = RESOURCE_CODES[cell.resource.type]
+    return plane
+
+
+def citytile_team_plane(game_state):
+    """
+    Team of the citytile on every cell (NO_TEAM elsewhere), indexed [x, y]
+    Read from the turn's occupancy index (rebuilt by every update)
+    """
+    return game_state.occupancy.citytile_team
+
+
+def label_resource_planes(types):
+    """
+    Label the 8-connected components of every resource type
+
+    types       int[width, height]      resource_type_plane()
+    Return (labels, count): labels[x, y] is 0 outside clusters, labels of
+    different resource types never collide
+    """
+    labels = np.zeros(types.shape, dtype=np.int32)
+    count = 0
+    for code in RESOURCE_NAMES:
+        type_labels, type_count = ndimage.label(types == code, structure=EIGHT_CONNECTED)
+        if type_count == 0:
+            continue
+        mask = type_labels > 0
+        labels[mask] = type_labels[mask] + count
+        count += type_count
+    return labels, count
+
+
+def label_resource_clusters(game_state, types=None, region=None):
+    """
+    Find the resource clusters of the map
+
+    types       int[width, height]      resource_type_plane(), computed when None
+    region      bool[width, height]     Only label the cells inside this mask
+
+    Return a list of (resource_type, cells), ordered by the first cell of
+    each cluster in the x-major scan, cells are in the same scan order
+    """
+    if types is None:
+        types = resource_type_plane(game_state)
+    if region is not None:
+        types = np.where(region, types, NO_RESOURCE)
+    labels, count = label_resource_planes(types)
+    if count == 0:
+        return []
+
+    xs, ys = np.nonzero(labels)
+    cell_labels = labels[xs, ys]
+
+    # Group the cells by label, keeping the scan order inside each group
+    order = np.argsort(cell_labels, kind="stable")
+    xs, ys, cell_labels = xs[order], ys[order], cell_labels[order]
+    starts = np.flatnonzero(np.diff(cell_labels, prepend=0))
+    ends = np.append(starts[1:], len(cell_labels))
+
+    # Clusters are discovered by their first cell in scan order
+    first_cells = order[starts]
+    game_map = game_state.map
+    clusters = []
+    for group in np.argsort(first_cells, kind="stable").tolist():
+        start, end = starts[group], ends[group]
+        cells = [
+            game_map.get_cell(x, y)
+            for x, y in zip(xs[start:end].tolist(), ys[start:end].tolist())
+        ]
+        resource_type = RESOURCE_NAMES[int(types[xs[start], ys[start]])]
+        clusters.append((resource_type, cells))
+    return clusters
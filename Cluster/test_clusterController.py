@@ -1,5 +1,6 @@
 from lux.game_map import Position, Resource
 from Cluster.clusterController import ClusterController
+from lux.testing import game_from_lines
 
 
 # TODO: Refactor Game API for these classes
@@ -54,7 +55,8 @@ class TestClass:
         height = 6
 
         # Variables to be compared in Unit Test
-        cluster = [[[1, 1], [2, 1], [2, 2], [2, 3], [2, 4], [1, 4], [1, 3], [1, 2]]]
+        # Cluster cells come in x-major scan order
+        cluster = [[[1, 1], [1, 2], [1, 3], [1, 4], [2, 1], [2, 2], [2, 3], [2, 4]]]
         perimeter = [
             [0, 1],
             [0, 2],
@@ -84,13 +86,13 @@ class TestClass:
                 mapp.map[i][j] = Cell(resource=Resource("uranium", 1), x=i, y=j)
 
         game_state = GameState(mapp)
-        Controller = ClusterController(width, height)
+        Controller = ClusterController(width, height, game_state)
         Controller.getClustersRolling(width, height, game_state)
 
         return_result = []
         for key, val in Controller.clusterDict.items():
             current_cluster = []
-            for cell in val.cells:
+            for cell in val.resource_cells:
                 current_cluster.append([cell.pos.x, cell.pos.y])
             return_result.append(current_cluster)
 
@@ -98,10 +100,250 @@ class TestClass:
 
         perimeter_returned = [
             [cell[0], cell[1]]
-            for cell in Controller.clusterDict[0].get_perimeter(game_state)
+            for cell in Controller.clusterDict[
+                Controller.get_cell_value(1, 1)
+            ].get_perimeter(game_state)
         ]
         assert perimeter_returned == perimeter
 
 
 test_instance = TestClass()
 test_instance.test_one()
+
+
+def wood_game(width, height, cells):
+    return game_from_lines(width, height, [f"r wood {x} {y} 100" for x, y in cells])
+
+
+def cluster_cells(controller):
+    return [
+        [(cell.pos.x, cell.pos.y) for cell in cluster.resource_cells]
+        for cluster in controller.clusterDict.values()
+    ]
+
+
+def test_recluster_splits_and_merges():
+    # Non-square map: cell indices are y * width + x
+    game = wood_game(6, 3, [(0, 1), (1, 1), (2, 1), (3, 1), (5, 1)])
+    controller = ClusterController(6, 3, game)
+    controller.getClustersRolling(6, 3, game)
+    assert cluster_cells(controller) == [[(0, 1), (1, 1), (2, 1), (3, 1)], [(5, 1)]]
+    assert list(controller.clusterDict) == [6, 11]
+
+    big = controller.clusterDict[6]
+    big.add_unit("u_1")
+
+    # (1, 1) is consumed: the cluster is cut in two, the larger piece keeps its units
+    game._update([f"r wood {x} {y} 100" for x, y in [(0, 1), (2, 1), (3, 1), (5, 1)]])
+    controller.recluster(game)
+    assert cluster_cells(controller) == [[(2, 1), (3, 1)], [(5, 1)], [(0, 1)]]
+    assert controller.clusterDict[8] is big
+    assert big.units == ["u_1"]
+    assert len(controller.woodClusters) == 3
+
+    # Wood grows on (4, 1): both clusters on the right merge
+    game._update(
+        [f"r wood {x} {y} 100" for x, y in [(0, 1), (2, 1), (3, 1), (4, 1), (5, 1)]]
+    )
+    controller.recluster(game)
+    assert cluster_cells(controller) == [[(2, 1), (3, 1), (4, 1), (5, 1)], [(0, 1)]]
+    assert controller.clusterDict[8] is big
+    assert controller.isSameCluster(
+        game.map.get_cell(2, 1), game.map.get_cell(5, 1)
+    )
+    assert len(controller.woodClusters) == 2
+
+
+def test_perimeter_cache_follows_changes():
+    wood = [f"r wood {x} {y} 100" for x, y in [(1, 1), (2, 1)]]
+    game = wood_game(5, 3, [(1, 1), (2, 1)])
+    player = game.players[0]
+    controller = ClusterController(5, 3, game)
+    controller.getClustersRolling(5, 3, game)
+    controller.update_clusters(game, player)
+
+    cluster = controller.clusterDict[controller.get_cell_value(1, 1)]
+    assert cluster.perimeter == cluster.get_perimeter(game)
+    assert cluster.exposed_perimeter == cluster.perimeter
+    perimeter = cluster.perimeter
+
+    # A citytile far from the cluster leaves the cache alone
+    game._update(wood + ["c 0 c_1 0 0", "ct 0 c_1 4 2 0", "D_DONE"])
+    controller.update_clusters(game, player)
+    assert cluster.perimeter is perimeter
+
+    # A citytile on the perimeter is picked up
+    game._update(
+        wood + ["c 0 c_1 0 0", "ct 0 c_1 4 2 0", "ct 0 c_1 1 0 0", "D_DONE"]
+    )
+    controller.update_clusters(game, player)
+    assert cluster.perimeter_citytiles == [1, 0]
+    assert (1, 0) not in cluster.exposed_perimeter
+    assert len(cluster.exposed_perimeter) == len(cluster.perimeter) - 1
+
+
+def test_assign_workers_matches_scores_and_spreads():
+    from Cluster.clusterAssignment import worker_score_matrix
+
+    # Two wood clusters, three workers between them
+    game = wood_game(8, 3, [(1, 1), (6, 1), (7, 1)])
+    game._update(
+        [f"r wood {x} {y} 100" for x, y in [(1, 1), (6, 1), (7, 1)]]
+        + [f"u 0 0 u_{i} 3 {i} 0 0 0 0" for i in range(3)]
+        + ["u 0 1 u_9 6 0 0 0 0 0", "D_DONE"]
+    )
+    player, opponent = game.players
+    controller = ClusterController(8, 3, game)
+    controller.getClustersRolling(8, 3, game)
+    controller.update_clusters(game, player)
+
+    clusters = list(controller.clusterDict.values())
+    scores, _ = worker_score_matrix(player.units, controller.features)
+    for i, worker in enumerate(player.units):
+        for j, cluster in enumerate(clusters):
+            assert scores[i, j] == cluster.get_cluster_score_for_worker(
+                worker, game, 0, opponent
+            )
+
+    # Every added worker costs its cluster 3 points: the close cluster
+    # does not take all of them
+    assigned = controller.assign_workers(player.units, game, player, 0, opponent)
+    assert len(assigned) == 3
+    assert set(assigned) == set(clusters)
+
+
+def test_assign_workers_to_clusters_matches_unlimited_slots():
+    import numpy as np
+    from scipy.optimize import linear_sum_assignment
+    from Cluster.clusterAssignment import UNREACHABLE, assign_workers_to_clusters
+    from Weights.Cluster import cluster_weights
+
+    def total(scores, empty, assigned):
+        counts = np.bincount(assigned, minlength=scores.shape[1])
+        penalty = (counts * (counts - 1) // 2 * ~empty).sum()
+        return scores[np.arange(len(assigned)), assigned].sum() + penalty * (
+            cluster_weights["OUR_UNITS"]
+        )
+
+    rng = np.random.default_rng(0)
+    for workers, clusters, spread in [(12, 4, 10), (30, 5, 100), (40, 3, 1000)]:
+        scores = rng.uniform(-spread, spread, (workers, clusters))
+        # One cluster far ahead of the others, so it fills its first slots
+        scores[:, 0] += spread
+        scores[rng.random(scores.shape) < 0.1] = -np.inf
+        empty = np.zeros(clusters, dtype=bool)
+        empty[-1] = True
+        scores[:, empty] = 0
+
+        # Reference: one slot per worker in every cluster
+        finite = np.where(np.isfinite(scores), scores, UNREACHABLE)
+        penalty = np.outer(~empty, np.arange(workers)) * cluster_weights["OUR_UNITS"]
+        slots = (finite[:, :, None] + penalty[None, :, :]).reshape(workers, -1)
+        rows, columns = linear_sum_assignment(slots, maximize=True)
+        expected = np.empty(workers, dtype=np.intp)
+        expected[rows] = columns // workers
+
+        assigned = assign_workers_to_clusters(scores, empty)
+        assert np.isclose(
+            total(finite, empty, assigned), total(finite, empty, expected)
+        )
+
+
+def test_homeless_units_follow_the_turn_deltas():
+    def units(ids):
+        return [f"u 0 0 {unit_id} 3 1 0 0 0 0" for unit_id in ids]
+
+    wood = [f"r wood {x} {y} 100" for x, y in [(1, 1), (6, 1)]]
+    game = game_from_lines(8, 3, wood + units(["u_0", "u_1"]))
+    player = game.players[0]
+    controller = ClusterController(8, 3, game)
+    controller.getClustersRolling(8, 3, game)
+    game.subscribe(controller.on_delta)
+
+    def homeless():
+        ids = [unit.id for unit in controller.get_units_without_clusters(player)]
+        scanned = controller.scan_units_without_clusters(player)
+        assert ids == [unit.id for unit in scanned]
+        return ids
+
+    controller.update_clusters(game, player)
+    assert homeless() == ["u_0", "u_1"]
+    left = controller.clusterDict[controller.get_cell_value(1, 1)]
+    controller.add_unit(left, "u_0")
+    controller.update_missions(game, player)
+    assert homeless() == ["u_1"]
+
+    # u_1 dies and u_2 spawns
+    game._update(wood + units(["u_0", "u_2"]) + ["D_DONE"])
+    controller.update_clusters(game, player)
+    assert controller.delta is None
+    assert homeless() == ["u_2"]
+
+    # The cluster of u_0 is consumed: u_0 is released
+    game._update(wood[1:] + units(["u_0", "u_2"]) + ["D_DONE"])
+    controller.update_clusters(game, player)
+    controller.update_missions(game, player)
+    assert left.units == []
+    assert homeless() == ["u_0", "u_2"]
+
+
+def test_feature_table_matches_cluster_methods():
+    from helperFunctions.helper_functions import get_closest_cluster_by_centroid
+
+    game = wood_game(8, 4, [(1, 1), (1, 2), (2, 2), (6, 1), (7, 1)])
+    player = game.players[0]
+    controller = ClusterController(8, 4, game)
+    controller.getClustersRolling(8, 4, game)
+    controller.update_clusters(game, player)
+
+    features = controller.features
+    for cluster in controller.clusterDict.values():
+        row = features.row(cluster)
+        assert features.fuel[row] == cluster.get_total_fuel()
+        centroid = cluster.get_centroid()
+        assert tuple(features.centroid[row]) == (centroid.x, centroid.y)
+        assert features.perimeter[row] == len(cluster.perimeter)
+
+    citytile = game.map.get_cell(4, 3)
+    assert get_closest_cluster_by_centroid(
+        citytile, controller.clusterDict, features
+    ) == get_closest_cluster_by_centroid(citytile, controller.clusterDict)
+
+
+def test_ownership_grid_matches_closest_cluster():
+    from helperFunctions.helper_functions import (
+        get_citytile_score,
+        get_citytile_scores,
+        get_closest_cluster_by_centroid,
+    )
+
+    cells = [(1, 1), (1, 2), (2, 2), (6, 1), (7, 1), (4, 3)]
+    game = wood_game(8, 4, cells)
+    player, opponent = game.players
+    controller = ClusterController(8, 4, game)
+    controller.getClustersRolling(8, 4, game)
+    controller.update_clusters(game, player)
+
+    grid = controller.ownership_grid()
+    features = controller.features
+    for x in range(8):
+        for y in range(4):
+            closest, _ = get_closest_cluster_by_centroid(
+                game.map.get_cell(x, y), controller.clusterDict
+            )
+            assert features.clusters[grid[x, y]].clusterID == closest
+
+    scores = get_citytile_scores(features)
+    for row, cluster in enumerate(features.clusters):
+        assert scores[row] == get_citytile_score(cluster, game, 0, opponent, 1)
+
+    # Same clusters next turn: the grid is not recomputed
+    game._update([f"r wood {x} {y} 100" for x, y in cells] + ["D_DONE"])
+    controller.update_clusters(game, player)
+    assert controller.ownership_grid() is grid
+
+    # (4, 3) is consumed: its cells now belong to the other clusters
+    game._update([f"r wood {x} {y} 100" for x, y in cells[:-1]] + ["D_DONE"])
+    controller.update_clusters(game, player)
+    grid = controller.ownership_grid()
+    assert controller.features.empty[grid].sum() == 0
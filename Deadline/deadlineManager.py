@@ -0,0 +1,88 @@
+import time
+
+from lux.game_constants import GAME_CONSTANTS
+
+# Kaggle grants 3 seconds per turn plus a 60 seconds overage bank per game
+DEFAULT_TURN_BUDGET = 3.0
+DEFAULT_OVERAGE = 60.0
+
+
+class DeadlineManager:
+    """
+    Tracks the time spent in a turn against the per-turn budget
+
+    turn_budget     float       Seconds granted by the engine for each turn
+    overage         float       Seconds left in the overage bank
+    safety_margin   float       Share of the turn budget kept for the phases that
+                                always run (moves, city actions, I/O)
+    max_turns       int         Turns in a game, the bank is spread over the turns left
+
+    Anytime phases poll `expired()` between units of work and stop early,
+    keeping what they computed so far (or the previous turn's answer).
+    """
+
+    def __init__(
+        self,
+        turn_budget=DEFAULT_TURN_BUDGET,
+        overage=DEFAULT_OVERAGE,
+        safety_margin=0.25,
+        max_turns=GAME_CONSTANTS["PARAMETERS"]["MAX_DAYS"],
+        clock=time.perf_counter,
+    ):
+        self.turn_budget = turn_budget
+        self.overage = overage
+        self.safety_margin = safety_margin
+        self.max_turns = max_turns
+        self.clock = clock
+
+        self.turn_start = clock()
+        self.turn_deadline = self.turn_start + turn_budget
+        self.expired_phases = []
+
+    def start_turn(self, step, remaining_overage=None):
+        """
+        Start the clock of a new turn
+
+        remaining_overage: the engine's view of the overage bank, when it
+        reports one (it wins over our own bookkeeping)
+        """
+        self.turn_start = self.clock()
+        if remaining_overage is not None:
+            self.overage = remaining_overage
+
+        turns_left = max(self.max_turns - step, 1)
+        overage_share = max(self.overage, 0) / turns_left
+        self.turn_deadline = (
+            self.turn_start
+            + self.turn_budget * (1 - self.safety_margin)
+            + overage_share
+        )
+        self.expired_phases = []
+
+    def elapsed(self):
+        return self.clock() - self.turn_start
+
+    def remaining(self):
+        return self.turn_deadline - self.clock()
+
+    def expired(self):
+        return self.clock() >= self.turn_deadline
+
+    def check(self, phase):
+        """
+        expired() that also remembers which phase ran out of time
+        """
+        if self.clock() < self.turn_deadline:
+            return False
+        if phase not in self.expired_phases:
+            self.expired_phases.append(phase)
+        return True
+
+    def end_turn(self):
+        """
+        Stop the clock and charge the time above the turn budget to the bank
+        """
+        used = self.elapsed()
+        if used > self.turn_budget:
+            self.overage -= used - self.turn_budget
+        return used
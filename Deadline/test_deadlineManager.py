@@ -0,0 +1,34 @@
+from Deadline.deadlineManager import DeadlineManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClass:
+    def test_budget_and_overage(self):
+        clock = FakeClock()
+        deadline = DeadlineManager(
+            turn_budget=3.0, overage=10.0, safety_margin=0.5, max_turns=10, clock=clock
+        )
+
+        # 1.5 seconds of the turn budget + 10 / 10 seconds of overage
+        deadline.start_turn(0)
+        clock.now = 2.4
+        assert not deadline.check("assign_targets")
+        clock.now = 2.5
+        assert deadline.check("assign_targets")
+        assert deadline.expired_phases == ["assign_targets"]
+
+        clock.now = 4.0
+        assert deadline.end_turn() == 4.0
+        assert deadline.overage == 9.0
+
+        # The engine's overage counter wins over our bookkeeping
+        deadline.start_turn(5, remaining_overage=5.0)
+        assert deadline.expired_phases == []
+        assert deadline.remaining() == 1.5 + 1.0
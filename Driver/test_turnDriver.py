@@ -0,0 +1,50 @@
+import io
+import os
+import threading
+
+from Driver.turnDriver import TurnReader, TurnDriver
+
+STREAM = b"0\n12 12\nrp 0 0\nD_DONE\nrp 0 1\nu 0 0 u_1 1 1 0 0 0 0\nD_DONE\n"
+TURNS = [
+    ["0", "12 12", "rp 0 0", "D_DONE"],
+    ["rp 0 1", "u 0 0 u_1 1 1 0 0 0 0", "D_DONE"],
+]
+
+
+def echo_agent(observation, configuration):
+    return [f"{observation.player} {observation['step']} {len(observation['updates'])}"]
+
+
+class TestClass:
+    def test_reader_splits_turns_across_chunks(self):
+        for chunk_size in (1, 3, 7, 1 << 16):
+            reader = TurnReader(io.BytesIO(STREAM), chunk_size=chunk_size)
+            assert list(reader) == TURNS
+
+    def test_driver_writes_one_block_per_turn(self):
+        stdout = io.StringIO()
+        TurnDriver(echo_agent, stdin=io.BytesIO(STREAM), stdout=stdout).run()
+        assert stdout.getvalue() == "0 0 4\nD_FINISH\n0 1 3\nD_FINISH\n"
+
+    def test_selector_mode_runs_background_work(self):
+        read_fd, write_fd = os.pipe()
+        stdout = io.StringIO()
+        slices = []
+
+        def background():
+            slices.append(1)
+            # Let the engine speak once some background work was done
+            if len(slices) == 3:
+                os.write(write_fd, STREAM)
+                os.close(write_fd)
+            return True
+
+        with os.fdopen(read_fd, "rb", buffering=0) as stdin:
+            driver = TurnDriver(echo_agent, stdin=stdin, stdout=stdout)
+            thread = threading.Thread(target=driver.run_selector, args=(background,))
+            thread.start()
+            thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert len(slices) >= 3
+        assert stdout.getvalue() == "0 0 4\nD_FINISH\n0 1 3\nD_FINISH\n"
@@ -0,0 +1,162 @@
+#
+#
+# stdin / stdout driver between the Lux engine and agent()
+#
+# The engine writes one observation per turn, line by line, terminated by
+# D_DONE, and waits for our actions terminated by D_FINISH.
+#
+#
+import os
+import selectors
+import sys
+from typing import Dict
+
+from lux.constants import Constants
+
+INPUT_CONSTANTS = Constants.INPUT_CONSTANTS
+
+CHUNK_SIZE = 1 << 16
+DONE = INPUT_CONSTANTS.DONE.encode()
+
+
+class Observation(Dict[str, any]):
+    def __init__(self, player=0) -> None:
+        self.player = player
+
+
+class TurnReader:
+    """
+    Splits the raw engine input into turn blocks
+
+    Input is read in large chunks and cut at D_DONE, each block is the list
+    of the turn lines including the final D_DONE (what input() used to collect).
+
+    stream      Binary stream with a file descriptor (stdin) or any object
+                with `read1` / `read` (tests, benchmarks)
+    """
+
+    def __init__(self, stream=None, chunk_size=CHUNK_SIZE):
+        if stream is None:
+            stream = sys.stdin.buffer
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = b""
+        self.eof = False
+
+        try:
+            self.fd = stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            self.fd = None
+
+    def read_chunk(self) -> bytes:
+        """
+        Read whatever is available (at least one byte unless EOF)
+        os.read on the descriptor returns as soon as the engine wrote
+        something, it never waits for a whole chunk.
+        """
+        if self.fd is not None:
+            chunk = os.read(self.fd, self.chunk_size)
+        elif hasattr(self.stream, "read1"):
+            chunk = self.stream.read1(self.chunk_size)
+        else:
+            chunk = self.stream.read(self.chunk_size)
+
+        if not chunk:
+            self.eof = True
+        return chunk
+
+    def feed(self, chunk: bytes):
+        """
+        Add raw input, return the turn blocks completed by it
+        """
+        # Only the new bytes (and a possible split D_DONE) need to be searched
+        start = max(len(self.buffer) - len(DONE), 0)
+        self.buffer += chunk
+        turns = []
+        while True:
+            end = self.buffer.find(DONE, start)
+            if end < 0:
+                break
+            end += len(DONE)
+            # The line break after the previous D_DONE may arrive with this block
+            block = self.buffer[:end].lstrip(b"\r\n").decode()
+            self.buffer = self.buffer[end:]
+            turns.append([line.rstrip("\r") for line in block.split("\n")])
+            start = 0
+        return turns
+
+    def __iter__(self):
+        while not self.eof:
+            for turn in self.feed(self.read_chunk()):
+                yield turn
+
+
+def write_actions(stream, actions):
+    """
+    Write one turn of actions with a single write and flush
+    """
+    stream.write(",".join(actions) + "\n" + "D_FINISH\n")
+    stream.flush()
+
+
+class TurnDriver:
+    """
+    Feeds the turn blocks to agent() and writes its actions back
+
+    agent       agent(observation, configuration) -> List(str)
+    recorder    Optional ObservationRecorder saving every turn
+    """
+
+    def __init__(
+        self, agent, stdin=None, stdout=None, configuration=None, recorder=None
+    ):
+        self.agent = agent
+        self.recorder = recorder
+        self.reader = TurnReader(stdin)
+        self.stdout = stdout if stdout is not None else sys.stdout
+        self.configuration = configuration
+        self.observation = Observation()
+        self.observation["step"] = 0
+
+    def play_turn(self, updates):
+        observation = self.observation
+        if observation["step"] == 0:
+            observation.player = int(updates[0])
+
+        observation["updates"] = updates
+        actions = self.agent(observation, self.configuration)
+        write_actions(self.stdout, actions)
+        if self.recorder is not None:
+            self.recorder.record(observation, actions)
+        observation["step"] += 1
+        return actions
+
+    def run(self):
+        """
+        Blocking loop: read a turn, act, repeat until the engine closes stdin
+        """
+        for updates in self.reader:
+            self.play_turn(updates)
+
+    def run_selector(self, background=None, poll_interval=0.0):
+        """
+        Non-blocking loop: while no observation is pending, call `background()`
+
+        background      Callable doing a small slice of work, returns True
+                        while it has more work to do. When it is idle the
+                        loop blocks until the engine writes again.
+        """
+        if self.reader.fd is None:
+            raise ValueError("run_selector needs a stream with a file descriptor")
+
+        has_work = background is not None
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.reader.fd, selectors.EVENT_READ)
+            while not self.reader.eof:
+                timeout = poll_interval if has_work else None
+                if selector.select(timeout):
+                    for updates in self.reader.feed(self.reader.read_chunk()):
+                        self.play_turn(updates)
+                    has_work = background is not None
+                elif has_work:
+                    has_work = background()
@@ -2,25 +2,9 @@ def get_enemy_coverage(cells, opponent, opponent_id):
     """
     This returns the number of opponent units and
     the number of citytiles in a list of cells given.
+    Units are looked up by position (Player.units_by_pos): O(|cells|)
     """
-    opponent_citytiles = []
-    for cell in cells:
-        if cell.citytile is not None:
-            if cell.citytile.team == opponent_id:
-                opponent_citytiles.append(cell.citytile)
-
-    cell_positions = [cell.pos for cell in cells]
-    opponent_units = []
-    for unit in opponent.units:
-        pos = next(
-            (p for p in cell_positions if p.equals(unit.pos)),
-            None,
-        )
-
-        if pos is not None:
-            opponent_units.append(unit)
-
-    return opponent_citytiles, opponent_units
+    return get_enemy_tiles(cells, opponent, opponent_id)
 
 
 def get_opponent_tiles(opponent):
@@ -35,22 +19,16 @@ def get_opponent_tiles(opponent):
 def get_enemy_tiles(cells, opponent, opponent_id):
     """
     Get the opponent citytiles and units in a list of cells
+    Units are looked up by position (Player.units_by_pos): O(|cells|)
     """
     opponent_citytiles = []
+    opponent_units = []
+    for pos in dict.fromkeys(cell.pos for cell in cells):
+        opponent_units.extend(opponent.units_by_pos.get(pos, ()))
+
     for cell in cells:
         if cell.citytile is not None:
             if cell.citytile.team == opponent_id:
                 opponent_citytiles.append(cell.citytile)
 
-    cell_positions = [cell.pos for cell in cells]
-    opponent_units = []
-    for unit in opponent.units:
-        pos = next(
-            (p for p in cell_positions if p.equals(unit.pos)),
-            None,
-        )
-
-        if pos is not None:
-            opponent_units.append(unit)
-
     return opponent_citytiles, opponent_units
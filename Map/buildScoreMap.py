@@ -0,0 +1,96 @@
+import numpy as np
+from scipy.ndimage import convolve
+
+from lux.array_map import NO_RESOURCE, NO_TEAM
+from Cluster.clusterLabelling import resource_type_plane
+
+# Four neighbours of a cell (the cell itself excluded)
+NEIGHBOURS = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]])
+
+
+def opponent_distance_sums(width, height, opponent):
+    """
+    Sum of the Manhattan distances from every cell to every opponent unit,
+    [x, y]. The distance is separable: the sums over the columns and over
+    the rows are added.
+    """
+    xs = np.array([unit.pos.x for unit in opponent.units], dtype=np.int64)
+    ys = np.array([unit.pos.y for unit in opponent.units], dtype=np.int64)
+    column_sums = np.abs(np.arange(width)[:, None] - xs[None, :]).sum(axis=1)
+    row_sums = np.abs(np.arange(height)[:, None] - ys[None, :]).sum(axis=1)
+    return column_sums[:, None] + row_sums[None, :]
+
+
+class BuildScoreMap:
+    """
+    get_build_position_score of every cell of the board, built once per turn
+
+    citytile_neighbours int[width, height]      Citytiles (both teams) among the four
+                                                neighbours without resources
+    opponent_score      float[width, height]    10 * opponent units / (sum of the
+                                                distances to them + 1)
+    base                float[width, height]    2 * citytile_neighbours + opponent_score
+
+    The score of a position is base plus the distance-to-center term, which
+    depends on the missions of each cluster and is added on the candidates only.
+    resource_types is the [x, y] resource plane kept up to date by the
+    ClusterController, the map is only scanned for it when not given.
+    """
+
+    def __init__(self, game_state, opponent, resource_types=None):
+        width, height = game_state.map.width, game_state.map.height
+        self.width = width
+        self.height = height
+
+        if resource_types is None:
+            resource_types = resource_type_plane(game_state)
+        citytiles = (game_state.occupancy.citytile_team != NO_TEAM) & (
+            resource_types == NO_RESOURCE
+        )
+        self.citytile_neighbours = convolve(
+            citytiles.astype(np.int32), NEIGHBOURS, mode="constant", cval=0
+        )
+
+        self.opponent_score = (10 * len(opponent.units)) / (
+            opponent_distance_sums(width, height, opponent) + 1
+        )
+        self.base = 2 * self.citytile_neighbours + self.opponent_score
+
+    def scores(self, positions, center):
+        """
+        get_build_position_score(game_state, opponent, pos, center) of every position
+        """
+        xs, ys = positions_to_arrays(positions)
+        travel_distance = np.abs(xs - center.x) + np.abs(ys - center.y)
+        return self.base[xs, ys] + 100 / ((travel_distance**2) + 1)
+
+    def best_positions(self, positions, center, count):
+        """
+        The `count` best scored positions, best first (ties keep the order
+        of `positions`, as a stable sort would)
+        """
+        if count <= 0 or len(positions) == 0:
+            return []
+
+        scores = self.scores(positions, center)
+        candidates = np.arange(len(scores))
+        if count < len(scores):
+            kth = scores[np.argpartition(-scores, count - 1)[count - 1]]
+            candidates = np.flatnonzero(scores >= kth)
+
+        order = candidates[np.argsort(-scores[candidates], kind="stable")][:count]
+        return [positions[index] for index in order]
+
+
+def positions_to_arrays(positions):
+    xs = np.fromiter(
+        (pos[0] if isinstance(pos, tuple) else pos.x for pos in positions),
+        dtype=np.intp,
+        count=len(positions),
+    )
+    ys = np.fromiter(
+        (pos[1] if isinstance(pos, tuple) else pos.y for pos in positions),
+        dtype=np.intp,
+        count=len(positions),
+    )
+    return xs, ys
@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+
+from lux.game_map import Position
+
+
+def to_position(cell) -> Position:
+    """
+    Position of a Position, Cell (anything with a pos, as a CellView) or
+    (x, y) tuple, as in get_nearest_position
+    """
+    if isinstance(cell, tuple):
+        return Position(cell[0], cell[1])
+    if hasattr(cell, "pos"):
+        return cell.pos
+    return cell
+
+
+class NearestPositionMap:
+    """
+    Manhattan distance transform of a set of cells, with back-pointers
+
+    positions   List(Position)      The cells, in the caller's order
+                                    (Cells and (x, y) tuples are converted)
+    distance    int32[width, height]    Distance from every cell to the closest one
+    nearest     int[width, height]      Index in positions of the closest one
+                                        (first one on ties, as get_nearest_position)
+
+    Built once, then every get_nearest_position(pos, positions) is the
+    O(1) lookup(pos).
+    """
+
+    def __init__(self, positions, width, height):
+        self.positions = [to_position(pos) for pos in positions]
+        self.distance = None
+        self.nearest = None
+        if not self.positions:
+            return
+
+        xs = np.fromiter((pos.x for pos in self.positions), dtype=np.int32)
+        ys = np.fromiter((pos.y for pos in self.positions), dtype=np.int32)
+        distances = np.abs(np.arange(width, dtype=np.int32)[:, None, None] - xs) + np.abs(
+            np.arange(height, dtype=np.int32)[None, :, None] - ys
+        )
+
+        self.nearest = distances.argmin(axis=2)
+        self.distance = np.take_along_axis(distances, self.nearest[:, :, None], axis=2)[
+            :, :, 0
+        ]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def lookup(self, pos):
+        """
+        (closest position, distance) to pos, (None, inf) for an empty set
+        """
+        if self.distance is None:
+            return None, math.inf
+        return (
+            self.positions[self.nearest[pos.x, pos.y]],
+            int(self.distance[pos.x, pos.y]),
+        )
@@ -1,6 +1,5 @@
 from lux.game_map import Cell, Position
 from lux.constants import Constants
-from copy import deepcopy
 from typing import List
 import math
 
@@ -27,8 +26,7 @@ def get_cell_neighbours_four(cell: Cell, gamestate):
     """
     neighbours = []
     for dir in [DIRECTIONS.NORTH, DIRECTIONS.EAST, DIRECTIONS.SOUTH, DIRECTIONS.WEST]:
-        pos = deepcopy(cell.pos)
-        pos = pos.translate(dir, 1)
+        pos = cell.pos.translate(dir, 1)
 
         if inside_map(pos, gamestate.map.width, gamestate.map.height):
             translated_cell = gamestate.map.get_cell(pos.x, pos.y)
@@ -54,8 +52,7 @@ def get_cell_neighbours_eight(cell: Cell, gamestate):
             DIRECTIONS.SOUTH,
             DIRECTIONS.WEST,
         ]
-        pos = deepcopy(cell.pos)
-        pos = pos.translate(directions[dir1], 1)
+        pos = cell.pos.translate(directions[dir1], 1)
         pos = pos.translate(directions[dir2], 1)
 
         dir1 = (dir1 + 1) % len(directions)
@@ -81,7 +78,7 @@ def get_nearest_position(C: Position, cells: List[Position]):
     for cell in cells:
         if type(cell) == tuple:
             cell = Position(cell[0], cell[1])
-        elif type(cell) == Cell:
+        elif hasattr(cell, "pos"):
             cell = cell.pos
         current_distance = C.distance_to(cell)
 
@@ -124,33 +121,31 @@ def get_occupied_positions(player, opponent, cluster_controller):
     # Add opponent tiles to occupied positions
     for city in opponent.cities.values():
         for city_tile in city.citytiles:
-            occupied_positions.add((city_tile.pos.x, city_tile.pos.y))
+            occupied_positions.add(city_tile.pos)
 
     # Add disabled units to occupied positions
     for unit in player.units:
         if not unit.can_act():
-            occupied_positions.add((unit.pos.x, unit.pos.y))
+            occupied_positions.add(unit.pos)
 
     # Add units without target positions to occupied positions
-    for cluster in cluster_controller.clusterDict.values():
-        for mission in cluster.missions:
-            if mission.target_pos is None:
-                unit = get_unit_by_id(mission.responsible_unit, player)
+    for mission in cluster_controller.missions:
+        if mission.target_pos is None:
+            unit = get_unit_by_id(mission.responsible_unit, player)
 
-                occupied_positions.add((unit.pos.x, unit.pos.y))
+            occupied_positions.add(unit.pos)
 
     # Add units at target positions to occupied positions
-    for cluster in cluster_controller.clusterDict.values():
-        for mission in cluster.missions:
-            if mission.target_pos is not None and mission.responsible_unit is not None:
-                unit = get_unit_by_id(mission.responsible_unit, player)
-                if mission.target_pos.equals(unit.pos):
-                    occupied_positions.add((unit.pos.x, unit.pos.y))
+    for mission in cluster_controller.missions:
+        if mission.target_pos is not None and mission.responsible_unit is not None:
+            unit = get_unit_by_id(mission.responsible_unit, player)
+            if mission.target_pos.equals(unit.pos):
+                occupied_positions.add(unit.pos)
 
     player_citytiles = set()
     for city in player.cities.values():
         for city_tile in city.citytiles:
-            player_citytiles.add((city_tile.pos.x, city_tile.pos.y))
+            player_citytiles.add(city_tile.pos)
 
     occupied_positions = occupied_positions.difference(player_citytiles)
 
@@ -0,0 +1,322 @@
+import heapq
+
+import numpy as np
+
+from lux.game_constants import GAME_CONSTANTS
+from Map.pathfinding import STEPS, UNREACHABLE
+
+UNIT_ACTION_COOLDOWN = GAME_CONSTANTS["PARAMETERS"]["UNIT_ACTION_COOLDOWN"]
+
+# Turns planned ahead of the current one
+DEFAULT_HORIZON = 4
+
+# Extra passes re-planning the units left waiting (follow-chains)
+DEFAULT_PASSES = 3
+
+WAIT = None
+
+
+class MoveResolver:
+    """
+    Windowed cooperative A* over a space-time reservation table
+
+    width, height   int                Map size
+    horizon         int                Turns planned ahead (the window)
+    passes          int                Re-planning passes for the units left waiting
+    busy            Dict[int -> int]   Cell -> bitmask of the turns it is reserved
+    holders         Dict[int -> Dict]  Cell -> unit -> bitmask of the turns it holds
+    edges           Dict[int -> id]    (turn, from, to) keys -> unit making the move
+    holdings        Dict[id -> Set]    Cells reserved by each unit
+    moves           Dict[id -> List]   Keys of edges used by each unit
+    blocked         Set[int]           Cells blocked for the whole window
+    blocked_next    Set[int]           Cells blocked for the next turn (opponent units)
+    shared          Set[int]           Our citytiles
+
+    Units are planned one after the other (single-option units first, as in
+    negotiate_actions), each one around the reservations of the previous
+    ones, in (cell, turn) space with the action cooldown of its type.
+    The first step of every plan is issued, the rest only keeps the plans
+    of the turn consistent: the window is re-planned every turn.
+
+    - Opponent citytiles and the units that do not move this turn block
+      their cell for the whole window, opponent units only for the next turn.
+    - Our citytiles are never reserved: any number of units can share them.
+    - Head-on swaps are forbidden, following a unit into the cell it leaves
+      is allowed. Units whose plan starts by waiting are re-planned once the
+      others are placed, so whole chains move in the same turn.
+
+    Cells are flattened x-major (index = x * height + y), as the pathfinder.
+    A reservation is a bit per turn in the cell's mask, so checking a cell
+    over several turns is a single AND. The A* heuristic is the Manhattan
+    distance, or the pathfinder's distance field (a flat list indexed by
+    cell) when walls lie between the unit and its target.
+    """
+
+    def __init__(self, width, height, horizon=DEFAULT_HORIZON, passes=DEFAULT_PASSES):
+        self.width = width
+        self.height = height
+        self.horizon = horizon
+        self.passes = passes
+        self.busy = {}
+        self.holders = {}
+        self.edges = {}
+        self.holdings = {}
+        self.moves = {}
+        self.blocked = set()
+        self.blocked_next = set()
+        self.shared = set()
+
+        # spans[first][last]: bitmask of the turns first..last (clipped to the window)
+        turns = horizon + max(UNIT_ACTION_COOLDOWN.values()) + 1
+        self.spans = [
+            [
+                ((1 << (min(last, horizon) + 1)) - 1) & ~((1 << first) - 1)
+                for last in range(turns)
+            ]
+            for first in range(turns)
+        ]
+        xs, ys = np.divmod(np.arange(width * height), height)
+        self.xs = xs.tolist()
+        self.ys = ys.tolist()
+
+    def resolve(
+        self, occupied_positions, requested_movements, game_state, player_id, pathfinder=None
+    ):
+        """
+        Approve the requested movements that fit together
+        Same inputs and outputs as negotiate_actions: the move actions
+        (requested_movement["approved"] is set on the way)
+        """
+        height = self.height
+        occupancy = game_state.occupancy
+        self.busy = {}
+        self.holders = {}
+        self.edges = {}
+        self.holdings = {}
+        self.moves = {}
+        self.shared = set(
+            (occupancy.citytile_team == player_id).ravel().nonzero()[0].tolist()
+        )
+        self.blocked = {pos.x * height + pos.y for pos in occupied_positions}
+        self.blocked_next = set(
+            (occupancy.unit_count[1 - player_id] > 0).ravel().nonzero()[0].tolist()
+        )
+
+        starts = {}
+        for requested_movement in requested_movements:
+            unit = requested_movement["unit"]
+            starts[unit.id] = unit.pos.x * height + unit.pos.y
+
+        # Our other units stay where they are
+        stays = (occupancy.unit_count[player_id] > 0).ravel().nonzero()[0].tolist()
+        self.blocked.update(set(stays).difference(starts.values()))
+        self.blocked.difference_update(self.shared)
+
+        # Until it is planned, a unit holds its cell for the whole window
+        for unit_id, start in starts.items():
+            self._hold(unit_id, start, 0, self.horizon)
+
+        requests = sorted(
+            requested_movements, key=lambda request: len(request["movements"]) != 1
+        )
+        cached = {}
+        fields = {
+            request["unit"].id: self._heuristic(
+                request["unit"], request["mission"].target_pos, pathfinder, cached
+            )
+            for request in requests
+        }
+        plans = {}
+        for request in requests:
+            plans[request["unit"].id] = self._plan_unit(request, starts, fields)
+
+        # Only the waiting units next to a cell left this turn can move now
+        vacated = {starts[unit_id] for unit_id, plan in plans.items() if plan is not WAIT}
+        for _ in range(self.passes):
+            moved = set()
+            for request in requests:
+                unit_id = request["unit"].id
+                if plans[unit_id] is not WAIT or not vacated.intersection(
+                    self._neighbours(starts[unit_id])
+                ):
+                    continue
+                plans[unit_id] = self._plan_unit(request, starts, fields)
+                if plans[unit_id] is not WAIT:
+                    moved.add(starts[unit_id])
+            if not moved:
+                break
+            vacated = moved
+
+        actions = []
+        for request in requested_movements:
+            direction = plans[request["unit"].id]
+            if direction is not WAIT:
+                actions.append(request["unit"].move(direction))
+                request["approved"] = True
+        return actions
+
+    def _hold(self, unit_id, cell, first, last):
+        """
+        Reserve cell from turn first to turn last (within the window)
+        """
+        if cell in self.shared or first > self.horizon:
+            return
+        turns = self.spans[first][last]
+        self.busy[cell] = self.busy.get(cell, 0) | turns
+        holders = self.holders.setdefault(cell, {})
+        holders[unit_id] = holders.get(unit_id, 0) | turns
+        self.holdings.setdefault(unit_id, set()).add(cell)
+
+    def _release(self, unit_id):
+        busy, holders = self.busy, self.holders
+        for cell in self.holdings.pop(unit_id, ()):
+            del holders[cell][unit_id]
+            turns = 0
+            for other in holders[cell].values():
+                turns |= other
+            busy[cell] = turns
+        for key in self.moves.pop(unit_id, []):
+            del self.edges[key]
+
+    def _heuristic(self, unit, target, pathfinder, fields):
+        """
+        Moves left to the target: the pathfinder's distance field (a list
+        indexed by cell, cached per target in fields for the turn) when
+        walls lie in the way, None for the Manhattan distance
+        """
+        height = self.height
+        if pathfinder is not None and pathfinder.walls_between(unit.pos, target):
+            field = pathfinder.distance_field(target).ravel()
+            if field[unit.pos.x * height + unit.pos.y] != UNREACHABLE:
+                key = (target.x, target.y)
+                if key not in fields:
+                    fields[key] = field.tolist()
+                return fields[key]
+        return None
+
+    def _neighbours(self, cell):
+        height = self.height
+        x, y = divmod(cell, height)
+        return [
+            cell + dx * height + dy
+            for _, dx, dy in STEPS
+            if 0 <= x + dx < self.width and 0 <= y + dy < height
+        ]
+
+    def _plan_unit(self, request, starts, fields):
+        """
+        (Re-)plan the unit around the other reservations, reserve its plan
+        Return its action for this turn (a direction or WAIT)
+        """
+        unit = request["unit"]
+        self._release(unit.id)
+        target = request["mission"].target_pos
+        start = starts[unit.id]
+        cooldown = UNIT_ACTION_COOLDOWN["WORKER" if unit.is_worker() else "CART"]
+
+        steps = self._search(
+            start,
+            target.x * self.height + target.y,
+            cooldown,
+            fields[unit.id],
+        )
+        self._reserve(unit.id, start, steps, cooldown)
+        return steps[0][0] if steps else WAIT
+
+    def _search(self, start, target, cooldown, field=None):
+        """
+        A* in (cell, turn) space from (start, 0) to the target or the end
+        of the window, around the reservations (the unit's own are released)
+
+        Return the steps of the plan (none when the unit cannot even wait)
+        """
+        width, height, horizon = self.width, self.height, self.horizon
+        cells = width * height
+        busy, edges, spans = self.busy, self.edges, self.spans
+        blocked, blocked_next = self.blocked, self.blocked_next
+        xs, ys = self.xs, self.ys
+        tx, ty = xs[target], ys[target]
+
+        # Entries: (turns + cooldown * moves left, sequence, cell, turn)
+        if field:
+            left = field[start]
+        else:
+            left = abs(xs[start] - tx) + abs(ys[start] - ty)
+        heap = [(cooldown * left, 0, start, 0)]
+        came_from = {(start, 0): None}
+        sequence = 1
+        while heap:
+            _, _, cell, turn = heapq.heappop(heap)
+            if turn >= horizon or (
+                cell == target and not busy.get(cell, 0) & spans[turn][horizon]
+            ):
+                return self._steps(came_from, (cell, turn))
+
+            # Steps in get_directions order, so that ties keep its choice
+            x, y = xs[cell], ys[cell]
+            arrival = turn + cooldown
+            window = spans[turn + 1][arrival]
+            for direction, dx, dy in STEPS:
+                if not (0 <= x + dx < width and 0 <= y + dy < height):
+                    continue
+                neighbour = cell + dx * height + dy
+                if (
+                    neighbour in blocked
+                    or (turn == 0 and neighbour in blocked_next)
+                    or (neighbour, arrival) in came_from
+                    or (turn * cells + neighbour) * cells + cell in edges
+                    or busy.get(neighbour, 0) & window
+                ):
+                    continue
+                came_from[(neighbour, arrival)] = (cell, turn, direction)
+                if field:
+                    left = field[neighbour]
+                else:
+                    left = abs(x + dx - tx) + abs(y + dy - ty)
+                heapq.heappush(
+                    heap, (arrival + cooldown * left, sequence, neighbour, arrival)
+                )
+                sequence += 1
+
+            if (cell, turn + 1) not in came_from and not (
+                busy.get(cell, 0) & spans[turn + 1][turn + 1]
+            ):
+                came_from[(cell, turn + 1)] = (cell, turn, WAIT)
+                left = field[cell] if field else abs(x - tx) + abs(y - ty)
+                heapq.heappush(
+                    heap, (turn + 1 + cooldown * left, sequence, cell, turn + 1)
+                )
+                sequence += 1
+
+        return []
+
+    def _steps(self, came_from, state):
+        """
+        Steps (action, cell, turn, next cell) of the plan ending at state
+        """
+        steps = []
+        while came_from[state] is not None:
+            cell, turn, action = came_from[state]
+            steps.append((action, cell, turn, state[0]))
+            state = (cell, turn)
+        steps.reverse()
+        return steps
+
+    def _reserve(self, unit_id, start, steps, cooldown):
+        """
+        Hold the cells of the plan, then its last cell until the end of the window
+        """
+        cells = self.width * self.height
+        last_cell, last_turn = start, 0
+        self._hold(unit_id, start, 0, 0)
+        for action, cell, turn, destination in steps:
+            if action is WAIT:
+                last_turn = turn + 1
+            else:
+                last_turn = turn + cooldown
+                edge = (turn * cells + cell) * cells + destination
+                self.edges[edge] = unit_id
+                self.moves.setdefault(unit_id, []).append(edge)
+            self._hold(unit_id, destination, turn + 1, last_turn)
+            last_cell = destination
+        self._hold(unit_id, last_cell, last_turn, self.horizon)
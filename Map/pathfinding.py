@@ -0,0 +1,174 @@
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from lux.game_map import Position
+from lux.constants import Constants
+from Map.mapService import get_directions
+
+DIRECTIONS = Constants.DIRECTIONS
+
+# Distance of the cells the targets cannot be reached from
+UNREACHABLE = -1
+
+# Steps in the order of get_directions
+STEPS = [
+    (DIRECTIONS.NORTH, 0, -1),
+    (DIRECTIONS.SOUTH, 0, 1),
+    (DIRECTIONS.EAST, 1, 0),
+    (DIRECTIONS.WEST, -1, 0),
+]
+
+
+def bfs_distance_field(walls, targets):
+    """
+    Multi-source BFS on the grid
+
+    walls       bool[width, height]     Cells units cannot enter
+    targets     List[(x, y)]            Sources of the field (walls or not)
+
+    Return int32[width, height], the number of moves from every cell to
+    the closest target, UNREACHABLE where no target can be reached
+    """
+    width, height = walls.shape
+    blocked = walls.ravel().tolist()
+    distances = [UNREACHABLE] * (width * height)
+
+    # Cells are flattened x-major (index = x * height + y), as the [x, y] planes
+    queue = deque()
+    for x, y in targets:
+        if 0 <= x < width and 0 <= y < height:
+            index = x * height + y
+            if distances[index] == UNREACHABLE:
+                distances[index] = 0
+                queue.append(index)
+
+    last_column = (width - 1) * height
+    while queue:
+        index = queue.popleft()
+        distance = distances[index] + 1
+        y = index % height
+
+        if index >= height:
+            neighbour = index - height
+            if distances[neighbour] == UNREACHABLE and not blocked[neighbour]:
+                distances[neighbour] = distance
+                queue.append(neighbour)
+        if index < last_column:
+            neighbour = index + height
+            if distances[neighbour] == UNREACHABLE and not blocked[neighbour]:
+                distances[neighbour] = distance
+                queue.append(neighbour)
+        if y > 0:
+            neighbour = index - 1
+            if distances[neighbour] == UNREACHABLE and not blocked[neighbour]:
+                distances[neighbour] = distance
+                queue.append(neighbour)
+        if y < height - 1:
+            neighbour = index + 1
+            if distances[neighbour] == UNREACHABLE and not blocked[neighbour]:
+                distances[neighbour] = distance
+                queue.append(neighbour)
+
+    return np.array(distances, dtype=np.int32).reshape(width, height)
+
+
+class Pathfinder:
+    """
+    Obstacle-aware movement through BFS distance fields
+
+    walls       bool[width, height]     Opponent citytiles (units cannot enter them)
+    version     int                     Bumped whenever the walls change
+    fields      OrderedDict             LRU of the distance fields, keyed by
+                                        (version, targets)
+
+    Our citytiles are not walls: any number of our units can share them.
+    Units (ours with cooldown, or waiting) are not baked into the fields,
+    they only block for a turn: next_steps returns every first step of a
+    shortest path and the move resolver picks one that is free.
+    Fields are shared by every unit heading to the same target(s) and only
+    recomputed when the walls change, units with no wall between them and
+    their target do not need one.
+    """
+
+    def __init__(self, width, height, maxsize=256):
+        self.width = width
+        self.height = height
+        self.maxsize = maxsize
+        self.walls = np.zeros((width, height), dtype=bool)
+        self.version = 0
+        self.fields = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def update(self, game_state, player_id):
+        """
+        Refresh the walls from the turn's occupancy index
+        """
+        walls = game_state.occupancy.citytile_team == 1 - player_id
+        if not np.array_equal(walls, self.walls):
+            self.walls = walls
+            self.version += 1
+
+    def distance_field(self, targets):
+        """
+        Distance field of a target Position or of a collection of targets
+        """
+        if isinstance(targets, Position):
+            key = ((targets.x, targets.y),)
+        else:
+            key = tuple(sorted({(pos.x, pos.y) for pos in targets}))
+        key = (self.version, key)
+
+        field = self.fields.get(key)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(key)
+            return field
+
+        self.misses += 1
+        field = bfs_distance_field(self.walls, key[1])
+        self.fields[key] = field
+        if len(self.fields) > self.maxsize:
+            self.fields.popitem(last=False)
+        return field
+
+    def distance(self, pos, targets):
+        """
+        Number of moves from pos to the closest target (UNREACHABLE if none)
+        """
+        return int(self.distance_field(targets)[pos.x, pos.y])
+
+    def walls_between(self, pos, target):
+        """
+        Whether a wall lies in the rectangle between pos and target
+        """
+        xs = sorted((pos.x, target.x))
+        ys = sorted((pos.y, target.y))
+        return bool(self.walls[xs[0] : xs[1] + 1, ys[0] : ys[1] + 1].any())
+
+    def next_steps(self, pos, targets):
+        """
+        Directions of the first steps of all the shortest paths from pos,
+        in get_directions order
+        Return None when no target can be reached from pos
+
+        Towards a single target with no wall in the rectangle between pos
+        and the target, the shortest paths are the straight ones: the
+        get_directions steps are returned without building a field.
+        """
+        if isinstance(targets, Position) and not self.walls_between(pos, targets):
+            return get_directions(pos, targets)
+
+        field = self.distance_field(targets)
+        distance = field[pos.x, pos.y]
+        if distance == UNREACHABLE:
+            return None
+
+        directions = []
+        for direction, dx, dy in STEPS:
+            x, y = pos.x + dx, pos.y + dy
+            if 0 <= x < self.width and 0 <= y < self.height:
+                if field[x, y] == distance - 1:
+                    directions.append(direction)
+        return directions
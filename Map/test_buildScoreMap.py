@@ -0,0 +1,62 @@
+import random
+
+from lux.game_map import Position
+from lux.testing import game_from_lines
+from helperFunctions.helper_functions import get_build_position_score
+from Map.buildScoreMap import BuildScoreMap
+from Cluster.clusterController import ClusterController
+
+
+def random_game(rng, width, height):
+    cells = [(x, y) for x in range(width) for y in range(height)]
+    rng.shuffle(cells)
+    lines = [f"c {team} c_{team} 0 0" for team in (0, 1)]
+    for i, (x, y) in enumerate(cells[:12]):
+        lines.append(f"ct {i % 2} c_{i % 2} {x} {y} 0")
+    for x, y in cells[12:24]:
+        lines.append(f"r wood {x} {y} 100")
+    for i, (x, y) in enumerate(cells[24:30]):
+        lines.append(f"u 0 1 u_{i} {x} {y} 0 0 0 0")
+    return game_from_lines(width, height, lines)
+
+
+class TestClass:
+    def test_matches_get_build_position_score(self):
+        rng = random.Random(0)
+        game = random_game(rng, 10, 8)
+        opponent = game.players[1]
+        score_map = BuildScoreMap(game, opponent)
+
+        # Same map from the cluster controller's resource plane
+        controller = ClusterController(10, 8, game)
+        controller.getClustersRolling(10, 8, game)
+        resource_types = controller.resource_types
+        assert (
+            BuildScoreMap(game, opponent, resource_types).base == score_map.base
+        ).all()
+
+        positions = [Position(x, y) for x in range(10) for y in range(8)]
+        for center in (Position(0, 0), Position(4.5, 3.25)):
+            scores = score_map.scores(positions, center)
+            for pos, score in zip(positions, scores):
+                assert score == get_build_position_score(game, opponent, pos, center)
+
+    def test_best_positions_as_a_stable_sort(self):
+        rng = random.Random(1)
+        game = random_game(rng, 10, 8)
+        opponent = game.players[1]
+        score_map = BuildScoreMap(game, opponent)
+        center = Position(3.5, 2)
+
+        for _ in range(20):
+            # Repeated positions tie: the first one ranks first
+            positions = [
+                (rng.randrange(10), rng.randrange(8)) for _ in range(rng.randrange(1, 30))
+            ]
+            count = rng.randrange(0, 35)
+            expected = sorted(
+                positions,
+                key=lambda pos: -get_build_position_score(game, opponent, pos, center),
+            )[:count]
+            best = score_map.best_positions(positions, center, count)
+            assert [id(pos) for pos in best] == [id(pos) for pos in expected]
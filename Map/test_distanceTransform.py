@@ -0,0 +1,30 @@
+import math
+import random
+
+from lux.game_map import Position
+from Map.mapService import get_nearest_position
+from Map.distanceTransform import NearestPositionMap
+
+
+class TestClass:
+    def test_lookup_matches_get_nearest_position(self):
+        rng = random.Random(0)
+        width, height = 12, 9
+        for size in (1, 3, 20):
+            cells = [
+                (rng.randrange(width), rng.randrange(height)) for _ in range(size)
+            ]
+            transform = NearestPositionMap(cells, width, height)
+            for x in range(width):
+                for y in range(height):
+                    pos = Position(x, y)
+                    nearest, distance = transform.lookup(pos)
+                    expected, expected_distance = get_nearest_position(pos, cells)
+                    assert distance == expected_distance
+                    # Ties go to the first cell, as get_nearest_position
+                    assert nearest.equals(expected)
+
+    def test_empty_set(self):
+        transform = NearestPositionMap([], 4, 4)
+        assert len(transform) == 0
+        assert transform.lookup(Position(1, 1)) == (None, math.inf)
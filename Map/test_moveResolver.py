@@ -0,0 +1,60 @@
+from lux.game_map import Position
+from lux.constants import Constants
+from lux.testing import game_from_lines
+from Missions.Mission import Mission
+from Missions.constants import EXPLORE
+from Map.moveResolver import MoveResolver
+
+DIRECTIONS = Constants.DIRECTIONS
+
+
+def requests(game, targets):
+    """
+    Requested movements of our units towards their targets
+    """
+    player = game.players[0]
+    return [
+        Mission(unit.id, EXPLORE, targets[unit.id]).get_moves(player)
+        for unit in player.units
+    ]
+
+
+def resolve(game, targets, occupied_positions=()):
+    resolver = MoveResolver(game.map.width, game.map.height)
+    return sorted(
+        resolver.resolve(set(occupied_positions), requests(game, targets), game, 0)
+    )
+
+
+class TestClass:
+    def test_follow_chains_and_swaps(self):
+        # Three units in a row heading east: they all move this turn
+        game = game_from_lines(
+            6, 1, [f"u 0 0 u_{x} {x} 0 0 0 0 0" for x in range(3)]
+        )
+        targets = {f"u_{x}": Position(5, 0) for x in range(3)}
+        assert resolve(game, targets) == ["m u_0 e", "m u_1 e", "m u_2 e"]
+
+        # Head-on in a corridor: they cannot swap, only one of them moves
+        game = game_from_lines(
+            4, 1, ["u 0 0 u_1 1 0 0 0 0 0", "u 0 0 u_2 2 0 0 0 0 0"]
+        )
+        targets = {"u_1": Position(3, 0), "u_2": Position(0, 0)}
+        assert len(resolve(game, targets)) <= 1
+
+    def test_contested_cells(self):
+        # Both units want (1, 1): one of them goes round or waits
+        lines = ["u 0 0 u_1 0 1 0 0 0 0", "u 0 0 u_2 2 1 0 0 0 0"]
+        targets = {"u_1": Position(1, 1), "u_2": Position(1, 1)}
+        actions = resolve(game_from_lines(3, 3, lines), targets)
+        assert actions.count("m u_1 e") + actions.count("m u_2 w") == 1
+
+        # Unless (1, 1) is our citytile
+        lines += ["c 0 c_1 0 0", "ct 0 c_1 1 1 0"]
+        assert resolve(game_from_lines(3, 3, lines), targets) == ["m u_1 e", "m u_2 w"]
+
+        # Opponent units and the occupied positions block the cell
+        game = game_from_lines(3, 3, lines[:2] + ["u 0 1 u_3 1 1 0 0 0 0"])
+        assert resolve(game, targets) == []
+        game = game_from_lines(3, 3, lines[:2])
+        assert resolve(game, targets, [Position(1, 1)]) == []
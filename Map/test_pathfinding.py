@@ -0,0 +1,55 @@
+from lux.game_map import Position
+from lux.constants import Constants
+from lux.testing import game_from_lines
+from Map.pathfinding import Pathfinder, UNREACHABLE
+
+DIRECTIONS = Constants.DIRECTIONS
+
+
+def walled_game(width, height, walls):
+    """
+    Opponent (team 1) citytiles on the `walls` cells
+    """
+    lines = ["c 1 c_1 0 0"] + [f"ct 1 c_1 {x} {y} 0" for x, y in walls]
+    return game_from_lines(width, height, lines)
+
+
+class TestClass:
+    def test_paths_go_around_opponent_citytiles(self):
+        # A wall on x = 2 with a gap at y = 4
+        game = walled_game(5, 5, [(2, 0), (2, 1), (2, 2), (2, 3)])
+        pathfinder = Pathfinder(5, 5)
+        pathfinder.update(game, 0)
+
+        source, target = Position(0, 0), Position(4, 0)
+        assert pathfinder.distance(source, target) == 12
+        assert pathfinder.next_steps(source, target) == [DIRECTIONS.SOUTH, DIRECTIONS.EAST]
+        assert pathfinder.next_steps(Position(1, 4), target) == [DIRECTIONS.EAST]
+
+        # No wall in between: straight steps, no field
+        misses = pathfinder.misses
+        assert pathfinder.next_steps(Position(3, 3), target) == [
+            DIRECTIONS.NORTH,
+            DIRECTIONS.EAST,
+        ]
+        assert pathfinder.misses == misses
+
+    def test_fields_are_cached_until_the_walls_change(self):
+        game = walled_game(5, 5, [(2, 0), (2, 1), (2, 2), (2, 3)])
+        pathfinder = Pathfinder(5, 5)
+        pathfinder.update(game, 0)
+
+        target = Position(4, 0)
+        field = pathfinder.distance_field(target)
+        assert pathfinder.distance_field(target) is field
+        pathfinder.update(game, 0)
+        assert pathfinder.distance_field(target) is field
+
+        # The gap is closed: the target cannot be reached any more
+        game._update(
+            ["c 1 c_1 0 0"] + [f"ct 1 c_1 2 {y} 0" for y in range(5)] + ["D_DONE"]
+        )
+        pathfinder.update(game, 0)
+        assert pathfinder.distance(Position(0, 0), target) == UNREACHABLE
+        assert pathfinder.next_steps(Position(0, 0), target) is None
+        assert (pathfinder.hits, pathfinder.misses) == (3, 2)
@@ -30,11 +30,21 @@ class Mission:
             target_pos = Position(target_pos[0], target_pos[1])
         self.target_pos = target_pos
 
-    def get_moves(self, player):
+    def get_moves(self, player, pathfinder=None):
+        """
+        Requested movements of the responsible unit towards the target
+        With a Pathfinder the unit follows the shortest paths around the
+        walls, otherwise (or when the target cannot be reached) it heads
+        straight to the target
+        """
         unit = get_unit_by_id(self.responsible_unit, player)
         target_pos = self.target_pos
 
-        directions = get_directions(unit.pos, target_pos)
+        directions = None
+        if pathfinder is not None:
+            directions = pathfinder.next_steps(unit.pos, target_pos)
+        if directions is None:
+            directions = get_directions(unit.pos, target_pos)
 
         movements = []
         for direction in directions:
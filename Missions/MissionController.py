@@ -1,5 +1,5 @@
+import numpy as np
 from scipy.optimize import linear_sum_assignment
-from scipy.spatial.distance import cdist
 
 from lux.game_map import Position
 
@@ -9,81 +9,83 @@ from Missions.constants import BUILD_TILE, EXPLORE, GUARD_CLUSTER
 from helperFunctions.helper_functions import get_unit_by_id
 
 
-def remove_finished_tile_missions(missions, game_state):
+def remove_finished_tile_missions(registry, game_state):
     """
-    Remove all finished BUILD_TILE missions
+    Remove all finished BUILD_TILE missions of the registry
     """
-    for mission in missions.copy():
-        if mission.target_pos is None:
-            continue
+    missions = registry.of_type(BUILD_TILE)
 
-        if mission.mission_type == BUILD_TILE:
-            target_pos = game_state.map.get_cell_by_pos(mission.target_pos)
+    def finished(mission):
+        if mission.target_pos is None or mission.mission_type != BUILD_TILE:
+            return False
 
-            if target_pos.citytile:
-                del missions[missions.index(mission)]
+        target_pos = game_state.map.get_cell_by_pos(mission.target_pos)
+        return bool(target_pos.citytile)
 
+    registry.remove_where(finished, missions)
 
-def remove_finished_explore_missions(missions, player):
+
+def remove_finished_explore_missions(registry, player):
     """
-    Remove all finished EXPLORE missions
+    Remove all finished EXPLORE missions of the registry
     """
-    for mission in missions.copy():
-        if mission.target_pos is None:
-            continue
+    missions = registry.of_type(EXPLORE)
 
-        if mission.mission_type == EXPLORE:
-            unit = get_unit_by_id(mission.responsible_unit, player)
-            if unit.pos.equals(mission.target_pos) and mission.allow_target_change:
-                del missions[missions.index(mission)]
+    def finished(mission):
+        if mission.target_pos is None or mission.mission_type != EXPLORE:
+            return False
 
+        unit = get_unit_by_id(mission.responsible_unit, player)
+        return unit.pos.equals(mission.target_pos) and mission.allow_target_change
 
-def remove_finished_guard_missions(missions, player):
-    """
-    Remove all finished GUARD_CLUSTER missions
-    """
-    for mission in missions.copy():
-        if mission.target_pos is None:
-            continue
+    registry.remove_where(finished, missions)
 
-        if mission.mission_type == GUARD_CLUSTER:
-            unit = get_unit_by_id(mission.responsible_unit, player)
-            if mission.target_pos == unit.pos:
-                del missions[missions.index(mission)]
 
-
-def remove_missions_with_no_units(missions, units):
+def remove_finished_guard_missions(registry, player):
     """
-    Remove all missions with no responsible units
+    Remove all finished GUARD_CLUSTER missions of the registry
     """
-    for mission in missions.copy():
-        if (
-            mission.responsible_unit is not None
-            and mission.responsible_unit not in units
-        ):
-            del missions[missions.index(mission)]
+    missions = registry.of_type(GUARD_CLUSTER)
 
+    def finished(mission):
+        if mission.target_pos is None or mission.mission_type != GUARD_CLUSTER:
+            return False
 
-def negotiate_missions(missions, units, targets):
-    unit_positions = [(unit.pos.x, unit.pos.y) for unit in units]
+        unit = get_unit_by_id(mission.responsible_unit, player)
+        return mission.target_pos == unit.pos
 
-    targets_to_positions = targets
-    if isinstance(targets[0], tuple):
-        targets_to_positions = [Position(t[0], t[1]) for t in targets]
+    registry.remove_where(finished, missions)
 
-    target_positions = [(target.x, target.y) for target in targets_to_positions]
 
-    def distance_to(pos1, pos2):
-        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+def manhattan_cost_matrix(sources, targets):
+    """
+    Manhattan distances (sources x targets) between two lists of (x, y)
+    """
+    sources = np.asarray(sources, dtype=np.int32).reshape(-1, 2)
+    targets = np.asarray(targets, dtype=np.int32).reshape(-1, 2)
+    return np.abs(sources[:, None, :] - targets[None, :, :]).sum(axis=2)
+
 
-    distance_matrix = cdist(unit_positions, target_positions, distance_to)
+def negotiate_missions(missions, units, targets, penalties=None):
+    """
+    Assign the targets to the units' missions, minimizing the total distance
+    penalties: optional (units x targets) costs added to the distances
+    """
+    target_positions = [
+        (target[0], target[1]) if isinstance(target, tuple) else (target.x, target.y)
+        for target in targets
+    ]
+    by_unit = {mission.responsible_unit: mission for mission in missions}
+
+    distance_matrix = manhattan_cost_matrix(
+        [(unit.pos.x, unit.pos.y) for unit in units], target_positions
+    )
+    if penalties is not None:
+        distance_matrix = distance_matrix + penalties
 
     row_ind, col_ind = linear_sum_assignment(distance_matrix)
-    for i in range(len(row_ind)):
-        key = units[row_ind[i]].id
-        target = target_positions[col_ind[i]]
-        for mission in missions:
-            if mission.responsible_unit == key:
-                mission.change_target_pos(Position(target[0], target[1]))
+    for row, column in zip(row_ind, col_ind):
+        target = target_positions[column]
+        by_unit[units[row].id].change_target_pos(Position(target[0], target[1]))
 
     return missions
@@ -0,0 +1,72 @@
+import numpy as np
+
+from Missions.MissionController import negotiate_missions
+
+# Extra cost (in moves) of a target of another cluster than the unit's
+CLUSTER_TRANSFER_COST = 5
+
+
+def assign_targets_globally(
+    clusters, registry, game_state, player, opponent, mission_type, build_scores=None
+):
+    """
+    Assign the targets of the mission_type missions of all the clusters
+    with a single assignment
+
+    The cost matrix is block structured: units of cluster i x candidate
+    targets of cluster j, with CLUSTER_TRANSFER_COST added outside of the
+    diagonal blocks. A unit matched with a target of another cluster moves
+    to that cluster with its mission.
+    A position that is a candidate of several clusters is only offered once.
+    build_scores is this turn's BuildScoreMap, used to rank the candidates.
+
+    Return the number of units that negotiated a target
+    """
+    units, unit_clusters = [], []
+    targets, target_clusters = [], []
+    seen = set()
+    for cluster in clusters:
+        cluster_units, cluster_targets = cluster.get_mission_targets(
+            game_state, player, opponent, mission_type, build_scores
+        )
+        if not cluster_units:
+            continue
+        units.extend(cluster_units)
+        unit_clusters.extend([cluster] * len(cluster_units))
+
+        for target in cluster_targets:
+            if not isinstance(target, tuple):
+                target = (target.x, target.y)
+            if target not in seen:
+                seen.add(target)
+                targets.append(target)
+                target_clusters.append(cluster)
+
+    if not units or not targets:
+        return 0
+
+    blocks = {}
+    unit_blocks = np.array(
+        [blocks.setdefault(cluster, len(blocks)) for cluster in unit_clusters]
+    )
+    target_blocks = np.array(
+        [blocks.setdefault(cluster, len(blocks)) for cluster in target_clusters]
+    )
+    penalties = np.where(
+        unit_blocks[:, None] != target_blocks[None, :], CLUSTER_TRANSFER_COST, 0
+    )
+
+    missions = [registry.of_unit(unit.id) for unit in units]
+    negotiate_missions(missions, units, targets, penalties)
+
+    owners = dict(zip(targets, target_clusters))
+    for unit, cluster, mission in zip(units, unit_clusters, missions):
+        if mission.target_pos is None:
+            continue
+        owner = owners.get((mission.target_pos.x, mission.target_pos.y))
+        if owner is not None and owner is not cluster:
+            cluster.remove_unit(unit.id)
+            owner.add_unit(unit.id)
+            registry.move(mission, owner)
+
+    return len(units)
@@ -0,0 +1,133 @@
+# Missions of a cluster without any
+NO_MISSIONS = {}
+
+
+class MissionRegistry:
+    """
+    Every mission of the game, indexed
+
+    by_unit         Dict[str -> Mission]                Mission of each unit
+    by_type         Dict[str -> Dict[Mission]]          Missions of each type
+    by_cluster      Dict[Cluster -> Dict[Mission]]      Missions of each cluster
+    owners          Dict[Mission -> Cluster]            Cluster of each mission
+
+    The inner dicts are insertion ordered sets: missions are listed in the
+    order they were added, as the former per-cluster lists.
+    A unit is responsible for at most one mission.
+    """
+
+    def __init__(self):
+        self.by_unit = {}
+        self.by_type = {}
+        self.by_cluster = {}
+        self.owners = {}
+
+    def __len__(self):
+        return len(self.owners)
+
+    def __iter__(self):
+        return iter(list(self.owners))
+
+    def __contains__(self, mission):
+        return mission in self.owners
+
+    def add(self, mission, cluster):
+        """
+        Register the mission of cluster (replacing the unit's former mission)
+        """
+        if mission.responsible_unit is not None:
+            former = self.by_unit.get(mission.responsible_unit)
+            if former is not None and former is not mission:
+                self.remove(former)
+            self.by_unit[mission.responsible_unit] = mission
+        self.by_type.setdefault(mission.mission_type, {})[mission] = None
+        self.by_cluster.setdefault(cluster, {})[mission] = None
+        self.owners[mission] = cluster
+
+    def remove(self, mission):
+        cluster = self.owners.pop(mission, None)
+        if cluster is None:
+            return
+        if self.by_unit.get(mission.responsible_unit) is mission:
+            del self.by_unit[mission.responsible_unit]
+        del self.by_type[mission.mission_type][mission]
+        del self.by_cluster[cluster][mission]
+
+    def remove_unit(self, unit_id):
+        """
+        Remove the mission of the unit, if any
+        """
+        mission = self.by_unit.get(unit_id)
+        if mission is not None:
+            self.remove(mission)
+
+    def remove_where(self, predicate, missions=None):
+        """
+        Remove the missions (all of them by default) matching predicate
+        Return the removed missions
+        """
+        if missions is None:
+            missions = self.owners
+        removed = [mission for mission in list(missions) if predicate(mission)]
+        for mission in removed:
+            self.remove(mission)
+        return removed
+
+    def clear(self, cluster):
+        """
+        Remove all the missions of cluster
+        """
+        for mission in list(self.by_cluster.get(cluster, ())):
+            self.remove(mission)
+        self.by_cluster.pop(cluster, None)
+
+    def merge(self, source, destination):
+        """
+        Move the missions of cluster source to the end of destination's
+        """
+        for mission in self.by_cluster.pop(source, ()):
+            self.owners[mission] = destination
+            self.by_cluster.setdefault(destination, {})[mission] = None
+
+    def move(self, mission, cluster):
+        """
+        Hand the mission over to cluster (at the end of its missions)
+        """
+        former = self.owners.get(mission)
+        if former is None or former is cluster:
+            return
+        del self.by_cluster[former][mission]
+        self.owners[mission] = cluster
+        self.by_cluster.setdefault(cluster, {})[mission] = None
+
+    def of_unit(self, unit_id):
+        return self.by_unit.get(unit_id)
+
+    def of_type(self, mission_type):
+        return list(self.by_type.get(mission_type, ()))
+
+    def of_cluster(self, cluster):
+        return list(self.by_cluster.get(cluster, ()))
+
+    def view(self, cluster):
+        """
+        Live read-only view of the missions of cluster, in insertion order
+        (use of_cluster for a copy when the missions change while iterating)
+        """
+        return self.by_cluster.get(cluster, NO_MISSIONS).keys()
+
+    def cluster_of(self, mission):
+        return self.owners.get(mission)
+
+    def remove_orphans(self):
+        """
+        Remove the missions whose unit left (or never joined) their cluster
+        """
+        units = {}
+        for cluster in self.by_cluster:
+            units[cluster] = set(cluster.units)
+
+        return self.remove_where(
+            lambda mission: mission.responsible_unit is not None
+            and mission.responsible_unit not in units[self.owners[mission]]
+        )
@@ -0,0 +1,103 @@
+import numpy as np
+
+from lux.game_map import Position
+from lux.game_objects import Unit
+from lux.constants import Constants
+from Missions.Mission import Mission
+from Missions.MissionController import negotiate_missions, manhattan_cost_matrix
+from Missions.MissionPlanner import assign_targets_globally
+from Missions.MissionRegistry import MissionRegistry
+from Missions.constants import BUILD_TILE, GUARD_CLUSTER
+
+UNIT_TYPES = Constants.UNIT_TYPES
+
+
+class StubCluster:
+    def __init__(self, units, targets):
+        self.units = [unit.id for unit in units]
+        self.targets = (units, targets)
+
+    def get_mission_targets(
+        self, game_state, player, opponent, mission_type, build_scores=None
+    ):
+        return self.targets
+
+    def add_unit(self, unit_id):
+        self.units.append(unit_id)
+
+    def remove_unit(self, unit_id):
+        self.units.remove(unit_id)
+
+
+class TestClass:
+    def test_negotiate_missions(self):
+        units = [
+            Unit(0, UNIT_TYPES.WORKER, "u_1", 0, 0, 0, 0, 0, 0),
+            Unit(0, UNIT_TYPES.WORKER, "u_2", 5, 0, 0, 0, 0, 0),
+        ]
+        missions = [Mission(unit.id, GUARD_CLUSTER) for unit in units]
+        targets = [(4, 2), (1, 2), (9, 9)]
+
+        assert manhattan_cost_matrix([(0, 0), (5, 0)], targets).tolist() == [
+            [6, 3, 18],
+            [3, 6, 13],
+        ]
+
+        negotiate_missions(missions, units, targets)
+        assert [mission.target_pos for mission in missions] == [
+            Position(1, 2),
+            Position(4, 2),
+        ]
+
+        # Penalties are added to the distances
+        negotiate_missions(missions, units, targets, np.array([[9, 0, 0], [0, 9, 9]]))
+        assert [mission.target_pos for mission in missions] == [
+            Position(1, 2),
+            Position(4, 2),
+        ]
+        negotiate_missions(missions, units, targets, np.array([[0, 9, 0], [9, 0, 0]]))
+        assert [mission.target_pos for mission in missions] == [
+            Position(4, 2),
+            Position(1, 2),
+        ]
+
+    def test_negotiate_missions_new_units(self):
+        # u_2 joined: u_1 gives up its former target (10 moves instead of 2)
+        first = Unit(0, UNIT_TYPES.WORKER, "u_1", 0, 0, 0, 0, 0, 0)
+        missions = [Mission("u_1", GUARD_CLUSTER)]
+        negotiate_missions(missions, [first], [(5, 0)])
+        assert missions[0].target_pos == Position(5, 0)
+
+        second = Unit(0, UNIT_TYPES.WORKER, "u_2", 5, 1, 0, 0, 0, 0)
+        missions.append(Mission("u_2", GUARD_CLUSTER))
+        negotiate_missions(missions, [first, second], [(5, 0), (1, 0)])
+        assert [mission.target_pos for mission in missions] == [
+            Position(1, 0),
+            Position(5, 0),
+        ]
+
+    def test_global_assignment_trades_targets(self):
+        near = Unit(0, UNIT_TYPES.WORKER, "u_1", 0, 0, 0, 0, 0, 0)
+        far = Unit(0, UNIT_TYPES.WORKER, "u_2", 20, 0, 0, 0, 0, 0)
+        # The first cluster's candidates are far from its unit, the
+        # second one's are next to both units
+        first = StubCluster([near], [(30, 0), (1, 0)])
+        second = StubCluster([far], [(21, 0), (2, 0), (1, 0)])
+
+        registry = MissionRegistry()
+        for cluster, unit in ((first, near), (second, far)):
+            registry.add(Mission(unit.id, BUILD_TILE), cluster)
+
+        clusters = [first, second]
+        assert assign_targets_globally(clusters, registry, None, None, None, BUILD_TILE) == 2
+        assert registry.of_unit("u_1").target_pos == Position(1, 0)
+        assert registry.of_unit("u_2").target_pos == Position(21, 0)
+        assert first.units == ["u_1"] and second.units == ["u_2"]
+
+        # Another cluster's target is worth CLUSTER_TRANSFER_COST moves
+        first.targets = ([near], [(30, 0)])
+        second.targets = ([far], [(21, 0), (2, 0)])
+        assign_targets_globally(clusters, registry, None, None, None, BUILD_TILE)
+        assert registry.of_unit("u_1").target_pos == Position(2, 0)
+        assert first.units == [] and second.units == ["u_2", "u_1"]
+        assert registry.cluster_of(registry.of_unit("u_1")) is second
@@ -0,0 +1,64 @@
+from Missions.Mission import Mission
+from Missions.MissionRegistry import MissionRegistry
+from Missions.constants import BUILD_TILE, EXPLORE, GUARD_CLUSTER
+
+
+class StubCluster:
+    def __init__(self, units):
+        self.units = units
+
+
+class TestClass:
+    def test_indexes(self):
+        registry = MissionRegistry()
+        first, second = StubCluster(["u_1", "u_2"]), StubCluster(["u_3"])
+        build = Mission("u_1", BUILD_TILE)
+        guard = Mission("u_2", GUARD_CLUSTER)
+        explore = Mission("u_3", EXPLORE)
+        registry.add(build, first)
+        registry.add(guard, first)
+        registry.add(explore, second)
+
+        assert len(registry) == 3
+        assert registry.of_unit("u_2") is guard
+        assert registry.of_type(EXPLORE) == [explore]
+        assert registry.of_cluster(first) == [build, guard]
+        assert registry.cluster_of(explore) is second
+
+        # The view follows the registry without copying
+        view = registry.view(first)
+        assert list(view) == [build, guard] and len(view) == 2
+        assert list(registry.view(StubCluster([]))) == []
+
+        # A unit has one mission: a new one replaces it
+        rebuild = Mission("u_1", BUILD_TILE)
+        registry.add(rebuild, first)
+        assert build not in registry
+        assert registry.of_cluster(first) == [guard, rebuild]
+        assert list(view) == [guard, rebuild]
+
+        registry.merge(second, first)
+        assert registry.of_cluster(first) == [guard, rebuild, explore]
+        assert registry.of_cluster(second) == []
+
+        registry.remove_unit("u_2")
+        assert registry.of_unit("u_2") is None
+        assert registry.of_type(GUARD_CLUSTER) == []
+
+        registry.clear(first)
+        assert len(registry) == 0
+
+    def test_missions_follow_their_units(self):
+        registry = MissionRegistry()
+        cluster = StubCluster(["u_1", "u_2"])
+        missions = [Mission("u_1", BUILD_TILE), Mission("u_2", GUARD_CLUSTER)]
+        for mission in missions:
+            registry.add(mission, cluster)
+
+        # Missions are kept while their units are in the cluster
+        assert registry.remove_orphans() == []
+        assert registry.of_cluster(cluster) == missions
+
+        cluster.units.remove("u_1")
+        assert registry.remove_orphans() == missions[:1]
+        assert registry.of_cluster(cluster) == missions[1:]
@@ -0,0 +1,71 @@
+import atexit
+import cProfile
+import json
+import os
+import time
+
+# Environment switches, both off by default
+PHASE_LOG_ENV = "LUX_PHASE_LOG"
+PROFILE_ENV = "LUX_PROFILE"
+
+
+class PhaseTimer:
+    """
+    Always-on per-phase timer of agent() turns
+
+    The turn is cut into consecutive phases with `lap(name)`, which charges the
+    time since the previous lap to `name`. Timing costs one perf_counter call
+    per phase; nothing is written unless an output is configured.
+
+    log_path        str     Append one JSON line per turn:
+                            {"step", "total_ms", "phases": {name: ms}}
+    profile_path    str     Run cProfile during the turns, stats are dumped
+                            there (pstats format) when the process exits
+    """
+
+    def __init__(self, log_path=None, profile_path=None, clock=time.perf_counter):
+        self.clock = clock
+        self.log = open(log_path, "a", buffering=1) if log_path else None
+        self.profiler = None
+        if profile_path:
+            self.profiler = cProfile.Profile()
+            atexit.register(self.profiler.dump_stats, profile_path)
+
+        self.step = None
+        self.turn_start = clock()
+        self.last_lap = self.turn_start
+        self.phases = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get(PHASE_LOG_ENV), os.environ.get(PROFILE_ENV))
+
+    def start_turn(self, step):
+        self.step = step
+        self.phases = {}
+        if self.profiler is not None:
+            self.profiler.enable()
+        self.turn_start = self.last_lap = self.clock()
+
+    def lap(self, name):
+        now = self.clock()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self.last_lap
+        self.last_lap = now
+
+    def end_turn(self, **extra):
+        """
+        Close the turn, return its record (extra keys are added to it)
+        """
+        total = self.clock() - self.turn_start
+        if self.profiler is not None:
+            self.profiler.disable()
+
+        record = {
+            "step": self.step,
+            "total_ms": total * 1000,
+            "phases": {name: seconds * 1000 for name, seconds in self.phases.items()},
+        }
+        record.update(extra)
+        if self.log is not None:
+            self.log.write(json.dumps(record) + "\n")
+        return record
@@ -0,0 +1,62 @@
+#
+#
+# Observation recorder
+#
+# Every turn is appended as one JSON line:
+#   {"step": 3, "player": 0, "updates": [...], "actions": [...]}
+# Paths ending with .gz are gzip compressed (each append is a gzip member,
+# so the file stays readable even if the game is killed mid-way).
+#
+#
+import gzip
+import json
+
+
+def open_recording(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class ObservationRecorder:
+    """
+    Appends the raw observation["updates"] block of each turn (and the
+    actions we answered) to a recording file
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def record(self, observation, actions):
+        record = {
+            "step": observation["step"],
+            "player": observation.player,
+            "updates": observation["updates"],
+            "actions": actions,
+        }
+        with open_recording(self.path, "a") as stream:
+            stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def read_recording(path):
+    """
+    Yield the recorded turns of a file, in order
+    """
+    with open_recording(path, "r") as stream:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_games(path):
+    """
+    Split a recording into games, a new game starts at step 0
+    """
+    game = []
+    for record in read_recording(path):
+        if record["step"] == 0 and game:
+            yield game
+            game = []
+        game.append(record)
+    if game:
+        yield game
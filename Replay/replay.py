@@ -0,0 +1,100 @@
+#
+#
+# Deterministic replay harness
+#
+#   python -m Replay.replay recording.jsonl.gz [--no-deadline] [--show 5]
+#
+# Streams recorded observations through agent() in-process, reports the
+# per-turn latency and checks the actions against the recorded ones.
+#
+#
+import argparse
+import time
+
+from Driver.turnDriver import Observation
+from Replay.recorder import read_games
+
+
+def replay_game(records, agent, configuration=None):
+    """
+    Run agent() over the turns of one recorded game
+
+    Return a list of per-turn results:
+        {"step", "latency", "actions", "expected", "match"}
+    """
+    results = []
+    for record in records:
+        observation = Observation(record["player"])
+        observation["updates"] = record["updates"]
+        observation["step"] = record["step"]
+
+        start = time.perf_counter()
+        actions = agent(observation, configuration)
+        latency = time.perf_counter() - start
+
+        expected = record.get("actions")
+        results.append(
+            {
+                "step": record["step"],
+                "latency": latency,
+                "actions": actions,
+                "expected": expected,
+                "match": expected is None or actions == expected,
+            }
+        )
+    return results
+
+
+def replay(path, agent, configuration=None):
+    """
+    Replay every game of a recording, return the results of each game
+    """
+    return [replay_game(records, agent, configuration) for records in read_games(path)]
+
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(int(len(values) * share), len(values) - 1)]
+
+
+def report(games, show=5):
+    for index, results in enumerate(games):
+        latencies = [result["latency"] * 1000 for result in results]
+        mismatches = [result for result in results if not result["match"]]
+        print(
+            f"game {index}: {len(results)} turns, "
+            f"mean {sum(latencies) / len(latencies):.2f} ms, "
+            f"p50 {percentile(latencies, 0.5):.2f} ms, "
+            f"p95 {percentile(latencies, 0.95):.2f} ms, "
+            f"max {max(latencies):.2f} ms, "
+            f"{len(mismatches)} mismatching turns"
+        )
+        for result in mismatches[:show]:
+            print(f"  step {result['step']}")
+            print(f"    recorded {result['expected']}")
+            print(f"    replayed {result['actions']}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("recording")
+    parser.add_argument(
+        "--no-deadline",
+        action="store_true",
+        help="replay without a per-turn time limit, so slow machines do not cut phases",
+    )
+    parser.add_argument("--show", type=int, default=5, help="mismatches shown per game")
+    args = parser.parse_args()
+
+    from agent import agent
+
+    configuration = {"actTimeout": float("inf")} if args.no_deadline else None
+    games = replay(args.recording, agent, configuration)
+    report(games, args.show)
+
+    if any(not result["match"] for results in games for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import io
+
+from agent import agent
+from Driver.turnDriver import TurnDriver
+from Replay.recorder import ObservationRecorder, read_games
+from Replay.replay import replay
+from Benchmarks.observations import generate_observations
+
+
+class TestClass:
+    def test_record_and_replay(self, tmp_path):
+        path = str(tmp_path / "game.jsonl.gz")
+        observations = generate_observations(12, 12, 5, 20)
+        stdin = io.BytesIO(
+            "".join("\n".join(updates) + "\n" for updates in observations).encode()
+        )
+
+        TurnDriver(
+            agent,
+            stdin=stdin,
+            stdout=io.StringIO(),
+            recorder=ObservationRecorder(path),
+        ).run()
+
+        games = list(read_games(path))
+        assert len(games) == 1
+        assert [record["updates"] for record in games[0]] == observations
+
+        results = replay(path, agent, {"actTimeout": float("inf")})
+        assert len(results[0]) == 20
+        assert all(result["match"] for result in results[0])
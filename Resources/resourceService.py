@@ -6,14 +6,36 @@ def get_resources(game_state):
     """
     Get all resource cells in the game map.
     """
-    resource_cells = []
-    width, height = game_state.map_width, game_state.map_height
-    for y in range(height):
-        for x in range(width):
-            cell = game_state.map.get_cell(x, y)
-            if cell.has_resource():
-                resource_cells.append(cell)
-    return resource_cells
+    return game_state.map.get_resource_cells()
+
+
+class ResourceCellIndex:
+    """
+    The resource cells of the map, in get_resources order (row by row),
+    kept up to date from the turn deltas (lux/delta.py) instead of
+    rescanning the map every turn
+    """
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.cells = get_resources(game_state)
+        game_state.subscribe(self.on_delta)
+
+    def on_delta(self, delta):
+        if delta.full:
+            self.cells = get_resources(self.game_state)
+            return
+
+        if delta.depleted:
+            depleted = set(delta.depleted)
+            self.cells = [
+                cell for cell in self.cells if (cell.pos.x, cell.pos.y) not in depleted
+            ]
+
+        if delta.regrown:
+            game_map = self.game_state.map
+            self.cells.extend(game_map.get_cell(x, y) for x, y in delta.regrown)
+            self.cells.sort(key=lambda cell: (cell.pos.y, cell.pos.x))
 
 
 def get_minable_resource_cells(player, resource_cells: List[Cell]) -> List[Cell]:
@@ -1,13 +1,16 @@
 # Python Modules imports
 import logging
+import os
 
 # Lux API imports
 from lux.game import Game
 
 # My imports
 from Cluster.clusterController import ClusterController
-from Resources.resourceService import get_resources, get_minable_resource_cells
+from Resources.resourceService import ResourceCellIndex, get_minable_resource_cells
 from Missions.Mission import Mission
+from Missions.MissionRegistry import MissionRegistry
+from Missions.MissionPlanner import assign_targets_globally
 from Missions.constants import BUILD_TILE, GUARD_CLUSTER, EXPLORE
 from helperFunctions.helper_functions import (
     negotiate_actions,
@@ -15,27 +18,63 @@ from helperFunctions.helper_functions import (
     get_city_actions,
 )
 from Map.mapService import get_occupied_positions
+from Map.pathfinding import Pathfinder
+from Map.moveResolver import MoveResolver
+from Map.distanceTransform import NearestPositionMap
+from Map.buildScoreMap import BuildScoreMap
+from Deadline.deadlineManager import DeadlineManager
+from Profiling.phaseTimer import PhaseTimer
 
 
 logging.basicConfig(filename="Game.log", level=logging.INFO, force=True)
 
+# Environment switch, off by default: keep the map as NumPy planes (lux/array_map.py)
+ARRAY_MAP_ENV = "LUX_ARRAY_MAP"
+
+deadline = DeadlineManager()
+phase_timer = PhaseTimer.from_env()
+
 
 def agent(observation, configuration):
     global game_state, game_stats
-    global cluster_controller
+    global cluster_controller, resource_index, pathfinder, move_resolver
+    global mission_registry
+
+    # The budget is set before the first turn's clock starts
+    if observation["step"] == 0:
+        if configuration is not None and "actTimeout" in configuration:
+            deadline.turn_budget = configuration["actTimeout"]
+
+    deadline.start_turn(observation["step"], observation.get("remainingOverageTime"))
+    phase_timer.start_turn(observation["step"])
 
     ### Do not edit ###
     if observation["step"] == 0:
         game_state = Game()
-        game_state._initialize(observation["updates"])
+        game_state._initialize(
+            observation["updates"],
+            incremental=True,
+            array_map=bool(os.environ.get(ARRAY_MAP_ENV)),
+        )
         game_state._update(observation["updates"][2:])
         game_state.id = observation.player
         width, height = game_state.map.width, game_state.map.height
+        phase_timer.lap("parsing")
 
-        cluster_controller = ClusterController(width, height, game_state)
+        # Both follow the map through the turn deltas from now on
+        resource_index = ResourceCellIndex(game_state)
+        mission_registry = MissionRegistry()
+        cluster_controller = ClusterController(
+            width, height, game_state, mission_registry
+        )
         cluster_controller.getClustersRolling(width, height, game_state)
+        game_state.subscribe(cluster_controller.on_delta)
+        pathfinder = Pathfinder(width, height)
+        move_resolver = MoveResolver(width, height)
+        phase_timer.lap("cluster_update")
     else:
         game_state._update(observation["updates"])
+        phase_timer.lap("parsing")
 
     actions = []
     game_stats = update_game_stats(observation["step"])
@@ -47,46 +86,67 @@ def agent(observation, configuration):
     opponent = game_state.players[(observation.player + 1) % 2]
 
     # Get resources and minable resources
-    resource_cells = get_resources(game_state)
+    resource_cells = resource_index.cells
     minable_resources = get_minable_resource_cells(player, resource_cells)
+    resource_transform = NearestPositionMap(
+        minable_resources, game_state.map.width, game_state.map.height
+    )
 
     # Update Clusters
     cluster_controller.update_clusters(game_state, player)
+    phase_timer.lap("cluster_update")
     cluster_controller.update_missions(game_state, player)
+    phase_timer.lap("mission_update")
 
     # Units without home cluster
     units_wo_clusters = cluster_controller.get_units_without_clusters(player)
 
     # Assign Missions to units without homes
-    for unit in units_wo_clusters:
-        assigned_cluster = cluster_controller.assign_worker(
-            unit, game_state, player, my_id, opponent
+    # Out of time: the units get a cluster next turn
+    if units_wo_clusters and not deadline.check("assign_worker"):
+        assigned_clusters = cluster_controller.assign_workers(
+            units_wo_clusters, game_state, player, my_id, opponent
         )
 
-        if assigned_cluster is not None:
-            assigned_cluster.add_unit(unit.id)
-            current_mission = Mission(responsible_unit=unit.id, mission_type=EXPLORE)
-            assigned_cluster.missions.append(current_mission)
+        for unit, assigned_cluster in zip(units_wo_clusters, assigned_clusters):
+            if assigned_cluster is not None:
+                cluster_controller.add_unit(assigned_cluster, unit.id)
+                current_mission = Mission(responsible_unit=unit.id, mission_type=EXPLORE)
+                mission_registry.add(current_mission, assigned_cluster)
 
-    # After assigning missions to units without homes, update the list
-    units_wo_clusters = cluster_controller.get_units_without_clusters(player)
+    phase_timer.lap("worker_assignment")
 
     # Now, all units have missions assigned to them
-    # Instruct Clusters to assign targets to missions
-    for cluster in cluster_controller.clusterDict.values():
-        cluster.assign_targets_to_missions(
-            game_state, player, opponent, BUILD_TILE, observation["step"]
-        )
-        cluster.assign_targets_to_missions(
-            game_state, player, opponent, GUARD_CLUSTER, observation["step"]
+    # Assign the targets of each mission type over all the clusters at once
+    clusters = list(cluster_controller.clusterDict.values())
+    build_scores = BuildScoreMap(
+        game_state, opponent, cluster_controller.resource_types
+    )
+    for mission_type in (BUILD_TILE, GUARD_CLUSTER, EXPLORE):
+        # Out of time: the remaining mission types keep last turn's targets
+        if deadline.check("assign_targets"):
+            break
+
+        if mission_type == EXPLORE:
+            for cluster in clusters:
+                cluster.handle_explore_missions(
+                    game_stats, minable_resources, player, resource_transform
+                )
+
+        assign_targets_globally(
+            clusters,
+            mission_registry,
+            game_state,
+            player,
+            opponent,
+            mission_type,
+            build_scores,
         )
 
-        cluster.handle_explore_missions(game_stats, minable_resources, player)
-        cluster.assign_targets_to_missions(
-            game_state, player, opponent, EXPLORE, observation["step"]
-        )
+    phase_timer.lap("target_assignment")
 
     occupied_positions = get_occupied_positions(player, opponent, cluster_controller)
+    pathfinder.update(game_state, my_id)
 
     for cluster in cluster_controller.clusterDict.values():
         if len(cluster.missions) == 0:
@@ -97,12 +157,21 @@ def agent(observation, configuration):
     # Getting the required movements for all clusters
     required_moves = list()
     for cluster in cluster_controller.clusterDict.values():
-        moves = cluster.get_required_moves(player)
+        moves = cluster.get_required_moves(player, pathfinder)
 
         required_moves.extend(moves)
 
     # Add the valid actions (those who have occupied positions are not valid)
-    actions.extend(negotiate_actions(occupied_positions, required_moves))
+    # Out of time: greedy negotiation instead of the planned moves
+    if deadline.check("move_resolution"):
+        actions.extend(negotiate_actions(occupied_positions, required_moves))
+    else:
+        actions.extend(
+            move_resolver.resolve(
+                occupied_positions, required_moves, game_state, my_id, pathfinder
+            )
+        )
+    phase_timer.lap("move_negotiation")
 
     actions.extend(
         get_city_actions(
@@ -113,6 +182,19 @@ def agent(observation, configuration):
             my_id,
             opponent,
             opponent_id,
+            deadline,
+            cluster_controller.features,
+            cluster_controller.ownership_grid(),
         )
     )
+
+    phase_timer.lap("city_actions")
+
+    deadline.end_turn()
+    phase_timer.end_turn(expired=deadline.expired_phases)
+    if deadline.expired_phases:
+        logging.info(
+            f"Turn {observation['step']} ran out of time in {deadline.expired_phases}"
+        )
+
     return actions
@@ -8,12 +8,15 @@ from lux.game_constants import GAME_CONSTANTS
 import math
 from functools import cmp_to_key
 
+import numpy as np
+
 from lux.game_map import Position
 from lux.constants import Constants
 
 from Map.mapService import get_perimeter
 from Units.unitsService import get_unit_by_id
-from Enemy.enemyService import get_enemy_coverage
+from Cluster.clusterFeatures import ClusterFeatureTable
+from Map.buildScoreMap import BuildScoreMap
 
 DIRECTIONS = Constants.DIRECTIONS
 
@@ -51,8 +54,13 @@ def get_build_position_score(game_state, opponent, pos, center):
     return final_score
 
 
-def get_important_positions(game_state, opponent, available_targets, missions, player):
-
+def get_important_positions(
+    game_state, opponent, available_targets, missions, player, score_map=None
+):
+    """
+    The len(missions) best build positions among available_targets
+    score_map is this turn's BuildScoreMap (built here if not given)
+    """
     sum_x = 0
     sum_y = 0
 
@@ -69,19 +77,10 @@ def get_important_positions(game_state, opponent, available_targets, missions, p
 
     center = Position(mean_x, mean_y)
 
-    def compare(pos1, pos2):
-        return pos2[0] - pos1[0]
+    if score_map is None:
+        score_map = BuildScoreMap(game_state, opponent)
 
-    pos_score_vector = []
-
-    for pos in available_targets:
-        score = get_build_position_score(game_state, opponent, pos, center)
-
-        pos_score_vector.append([score, pos])
-
-    pos_score_vector.sort(key=cmp_to_key(compare))
-
-    return [pos_score[1] for pos_score in pos_score_vector][: len(missions)]
+    return score_map.best_positions(list(available_targets), center, len(missions))
 
 
 def negotiate_actions(occupied_positions, requested_movements):
@@ -100,61 +99,48 @@ def negotiate_actions(occupied_positions, requested_movements):
     # unmovable_units or obstacles
     for requested_movement in requested_movements:
         for movement in requested_movement["movements"]:
-            if (
-                movement["next_pos"].x,
-                movement["next_pos"].y,
-            ) not in occupied_positions:
+            if movement["next_pos"] not in occupied_positions:
                 break
 
-            occupied_positions.add(
-                (requested_movement["unit"].pos.x, requested_movement["unit"].pos.y)
-            )
+            occupied_positions.add(requested_movement["unit"].pos)
             requested_movement["approved"] = False
 
     for requested_movement in requested_movements:
         if len(requested_movement["movements"]) == 1:
             movement = requested_movement["movements"][0]
-            if (
-                movement["next_pos"].x,
-                movement["next_pos"].y,
-            ) not in occupied_positions:
+            if movement["next_pos"] not in occupied_positions:
                 actions.append(requested_movement["unit"].move(movement["direction"]))
-                occupied_positions.add((movement["next_pos"].x, movement["next_pos"].y))
+                occupied_positions.add(movement["next_pos"])
                 requested_movement["approved"] = True
             else:
-                occupied_positions.add(
-                    (requested_movement["unit"].pos.x, requested_movement["unit"].pos.y)
-                )
+                occupied_positions.add(requested_movement["unit"].pos)
 
     for requested_movement in requested_movements:
         if len(requested_movement["movements"]) > 1:
             movements = requested_movement["movements"]
             for movement in movements:
-                if (
-                    movement["next_pos"].x,
-                    movement["next_pos"].y,
-                ) not in occupied_positions:
+                if movement["next_pos"] not in occupied_positions:
                     actions.append(
                         requested_movement["unit"].move(movement["direction"])
                     )
-                    occupied_positions.add(
-                        (movement["next_pos"].x, movement["next_pos"].y)
-                    )
+                    occupied_positions.add(movement["next_pos"])
                     requested_movement["approved"] = True
                     break
 
         if not requested_movement["approved"]:
-            occupied_positions.add(
-                (requested_movement["unit"].pos.x, requested_movement["unit"].pos.y)
-            )
+            occupied_positions.add(requested_movement["unit"].pos)
 
     return actions
 
 
-def get_closest_cluster_by_centroid(citytile, cluster_dict):
+def get_closest_cluster_by_centroid(citytile, cluster_dict, features=None):
     """
     We sort the clusters by the distance to the cluster center
+    features is this turn's ClusterFeatureTable (centroids computed here if None)
     """
+    if features is not None:
+        return features.closest_by_centroid(citytile.pos)
+
     closest_distance = math.inf
     closest_cluster = None
 
@@ -167,35 +153,29 @@ def get_closest_cluster_by_centroid(citytile, cluster_dict):
     return closest_cluster, closest_distance
 
 
-def get_citytile_score(cluster, game_state, player_id, opponent, opponent_id):
+def get_citytile_score(
+    cluster, game_state, player_id, opponent, opponent_id, features=None
+):
     """
     A simple mathematical model to calculate if a citytile should build a worker.
+    features is this turn's ClusterFeatureTable (built for this cluster if None)
     """
-    # directly proportional
-    resource_cell_score = len(cluster.resource_cells)
-    fuel_score = cluster.get_total_fuel() / 100
+    if features is None:
+        features = ClusterFeatureTable([cluster], player_id, game_state)
+    row = features.row(cluster)
 
-    perimeter = get_perimeter(cluster.resource_cells, game_state)
-    perimeter_score = len(perimeter)
-
-    opponent_citytiles, opponent_units = get_enemy_coverage(
-        [game_state.map.get_cell_by_pos(Position(pos[0], pos[1])) for pos in perimeter],
-        opponent,
-        opponent_id,
-    )
-    opponent_workers_score = len(opponent_units) + 1
-    opponent_citytiles_score = len(opponent_citytiles) + 1
+    # directly proportional
+    resource_cell_score = features.resource_cells[row]
+    fuel_score = features.fuel[row] / 100
+    perimeter_score = features.perimeter[row]
+    opponent_workers_score = features.perimeter_opponent_units[row] + 1
+    opponent_citytiles_score = features.opponent_citytiles[row] + 1
 
     # inversely proportional
-    player_citytiles = []
-    for p in perimeter:
-        cell = game_state.map.get_cell_by_pos(Position(p[0], p[1]))
-        if cell.citytile is not None:
-            if cell.citytile.team == player_id:
-                player_citytiles.append(cell.citytile)
+    player_citytiles = features.player_citytiles[row]
 
     player_workers_score = 10 * len(cluster.units) + 1
-    player_citytiles_score = len(player_citytiles) + 1
+    player_citytiles_score = player_citytiles + 1
 
     no_player_unit_bonus = 10 if len(cluster.units) == 0 else 1
 
@@ -215,12 +195,52 @@ def get_citytile_score(cluster, game_state, player_id, opponent, opponent_id):
     return citytile_score
 
 
+def get_citytile_scores(features):
+    """
+    get_citytile_score of every cluster of the feature table at once
+    (the per-cluster score cache of get_city_actions)
+    """
+    units = features.units()
+
+    player_workers_score = 10 * units + 1
+    player_citytiles_score = features.player_citytiles + 1
+    no_player_unit_bonus = np.where(units == 0, 10, 1)
+
+    numerator = (
+        features.resource_cells
+        * (features.fuel / 100)
+        * features.perimeter
+        * no_player_unit_bonus
+        * (features.perimeter_opponent_units + 1)
+        * (features.opponent_citytiles + 1)
+    )
+
+    denominator = player_workers_score * player_citytiles_score
+
+    return numerator / (denominator + 1.1)
+
+
 def get_city_actions(
-    game_state, game_state_info, player, clusters_dict, player_id, opponent, opponent_id
+    game_state,
+    game_state_info,
+    player,
+    clusters_dict,
+    player_id,
+    opponent,
+    opponent_id,
+    deadline=None,
+    features=None,
+    ownership=None,
 ):
     """
     Build worker if possible.
     If two tiles need to build, take the one with the highest score.
+    When the deadline expires, the citytiles that were not scored yet
+    get a score of 0 and are served after the scored ones.
+
+    With this turn's feature table and the ownership grid
+    (ClusterController.ownership_grid) the closest cluster of a citytile
+    is a lookup and every cluster is scored once.
     """
     actions = []
     units_capacity = sum([len(x.citytiles) for x in player.cities.values()])
@@ -232,17 +252,33 @@ def get_city_actions(
             if citytile.can_act():
                 actionable_citytiles.append(citytile)
 
+    cluster_scores = None
+    if features is not None and ownership is not None and actionable_citytiles:
+        cluster_scores = get_citytile_scores(features)
+
     citytiles_to_be_sorted = []
     for citytile in actionable_citytiles:
-        # We do not keep track of which cluster a citytile belongs to.
-        # So, we need to find it here.
-        closest_cluster, _ = get_closest_cluster_by_centroid(citytile, clusters_dict)
         citytile_score = 0
+        if deadline is not None and deadline.check("city_actions"):
+            citytiles_to_be_sorted.append({"citytile": citytile, "score": citytile_score})
+            continue
+
+        if cluster_scores is not None:
+            row = ownership[citytile.pos.x, citytile.pos.y]
+            if row >= 0:
+                citytile_score = cluster_scores[row]
+            citytiles_to_be_sorted.append({"citytile": citytile, "score": citytile_score})
+            continue
+
+        # Without the ownership grid we need to find the cluster here.
+        closest_cluster, _ = get_closest_cluster_by_centroid(
+            citytile, clusters_dict, features
+        )
 
         if closest_cluster is not None:
             closest_cluster = clusters_dict[closest_cluster]
             citytile_score = get_citytile_score(
-                closest_cluster, game_state, player_id, opponent, opponent_id
+                closest_cluster, game_state, player_id, opponent, opponent_id, features
             )
 
         citytiles_to_be_sorted.append({"citytile": citytile, "score": citytile_score})
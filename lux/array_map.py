@@ -0,0 +1,176 @@
+import numpy as np
+
+from .constants import Constants
+from .game_map import Position, Resource
+
+RESOURCE_TYPES = Constants.RESOURCE_TYPES
+
+# Resource type <-> plane code, -1 means no resource
+RESOURCE_CODES = {
+    RESOURCE_TYPES.WOOD: 0,
+    RESOURCE_TYPES.COAL: 1,
+    RESOURCE_TYPES.URANIUM: 2,
+}
+RESOURCE_NAMES = {code: name for name, code in RESOURCE_CODES.items()}
+NO_RESOURCE = -1
+NO_TEAM = -1
+
+
+def city_number(cityid):
+    """
+    "c_12" -> 12
+    """
+    return int(cityid[cityid.rfind("_") + 1:])
+
+
+class CellView:
+    """
+    Lightweight Cell look-alike reading and writing the planes of an ArrayGameMap
+    """
+
+    __slots__ = ("_map", "_x", "_y", "pos")
+
+    def __init__(self, game_map, x, y):
+        self._map = game_map
+        self._x = x
+        self._y = y
+        self.pos = Position(x, y)
+
+    @property
+    def resource(self):
+        game_map = self._map
+        code = game_map.resource_type[self._x, self._y]
+        if code == NO_RESOURCE:
+            return None
+        return Resource(
+            RESOURCE_NAMES[int(code)], int(game_map.resource_amount[self._x, self._y])
+        )
+
+    @resource.setter
+    def resource(self, resource):
+        game_map = self._map
+        if resource is None:
+            game_map.resource_type[self._x, self._y] = NO_RESOURCE
+            game_map.resource_amount[self._x, self._y] = 0
+        else:
+            game_map.resource_type[self._x, self._y] = RESOURCE_CODES[resource.type]
+            game_map.resource_amount[self._x, self._y] = resource.amount
+
+    @property
+    def citytile(self):
+        return self._map._citytiles[self._y * self._map.width + self._x]
+
+    @citytile.setter
+    def citytile(self, citytile):
+        game_map = self._map
+        game_map._citytiles[self._y * game_map.width + self._x] = citytile
+        if citytile is None:
+            game_map.citytile_team[self._x, self._y] = NO_TEAM
+            game_map.citytile_city[self._x, self._y] = -1
+        else:
+            game_map.citytile_team[self._x, self._y] = citytile.team
+            game_map.citytile_city[self._x, self._y] = city_number(citytile.cityid)
+
+    @property
+    def road(self):
+        return float(self._map.road[self._x, self._y])
+
+    @road.setter
+    def road(self, road):
+        self._map.road[self._x, self._y] = road
+
+    def has_resource(self):
+        game_map = self._map
+        return (
+            game_map.resource_type[self._x, self._y] != NO_RESOURCE
+            and game_map.resource_amount[self._x, self._y] > 0
+        )
+
+    def __str__(self):
+        return f"{self.pos}"
+
+    def __eq__(self, cell):
+        return self.pos == cell.pos and self.resource == cell.resource \
+            and self.citytile == cell.citytile and self.road == cell.road
+
+
+class ArrayGameMap:
+    """
+    GameMap backed by dense NumPy planes indexed [x, y], as every other
+    plane of the agent (occupancy, clusters, pathfinding), so they combine
+    without transposing
+
+    resource_type       int8[w, h]          RESOURCE_CODES value or NO_RESOURCE
+    resource_amount     int32[w, h]         Resource amount
+    citytile_team       int8[w, h]          Team owning the citytile or NO_TEAM
+    citytile_city       int32[w, h]         Number of the city owning the citytile or -1
+    road                float64[w, h]       Road level
+    units               int16[2, w, h]      Unit count of each team
+
+    get_cell / get_cell_by_pos return CellView objects, so callers written
+    against GameMap keep working while hot paths read the planes directly.
+    """
+
+    def __init__(self, width, height):
+        self.height = height
+        self.width = width
+
+        self.resource_type = np.full((width, height), NO_RESOURCE, dtype=np.int8)
+        self.resource_amount = np.zeros((width, height), dtype=np.int32)
+        self.citytile_team = np.full((width, height), NO_TEAM, dtype=np.int8)
+        self.citytile_city = np.full((width, height), -1, dtype=np.int32)
+        self.road = np.zeros((width, height), dtype=np.float64)
+        self.units = np.zeros((2, width, height), dtype=np.int16)
+
+        self._citytiles = [None] * (width * height)
+        self._cells = [None] * (width * height)
+
+    def get_cell(self, x, y) -> CellView:
+        index = y * self.width + x
+        cell = self._cells[index]
+        if cell is None:
+            cell = self._cells[index] = CellView(self, x, y)
+        return cell
+
+    def get_cell_by_pos(self, pos) -> CellView:
+        return self.get_cell(pos.x, pos.y)
+
+    def get_cell_by_position(self, pos):
+        return self.get_cell(pos.y, pos.x)
+
+    def _setResource(self, r_type, x, y, amount):
+        """
+        do not use this function, this is for internal tracking of state
+        Return whether the resource of the cell changed
+        """
+        code = RESOURCE_CODES[r_type]
+        if self.resource_type[x, y] == code and self.resource_amount[x, y] == amount:
+            return False
+        self.resource_type[x, y] = code
+        self.resource_amount[x, y] = amount
+        return True
+
+    def _setUnits(self, players):
+        """
+        do not use this function, this is for internal tracking of state
+        """
+        self.units.fill(0)
+        for player in players:
+            if len(player.units) == 0:
+                continue
+            xs = np.fromiter((unit.pos.x for unit in player.units), dtype=np.intp)
+            ys = np.fromiter((unit.pos.y for unit in player.units), dtype=np.intp)
+            np.add.at(self.units[player.team], (xs, ys), 1)
+
+    def resource_mask(self):
+        """
+        Boolean plane of the cells that have resources left
+        """
+        return (self.resource_type != NO_RESOURCE) & (self.resource_amount > 0)
+
+    def get_resource_cells(self):
+        """
+        All cells with resources, scanned row by row
+        """
+        ys, xs = np.nonzero(self.resource_mask().T)
+        return [self.get_cell(x, y) for y, x in zip(ys.tolist(), xs.tolist())]
@@ -0,0 +1,37 @@
+class TurnDelta:
+    """
+    What changed between two updates, built by Game._update and handed
+    to the listeners registered with Game.subscribe
+
+    full                bool                The state was rebuilt (first turn or
+                                            full update): consider everything changed
+    depleted            List[(x, y)]        Cells whose resources ran out
+    regrown             List[(x, y)]        Cells that got resources (wood regrowth)
+    amount_changed      List[(x, y)]        Cells whose resource amount changed
+                                            (still with resources)
+    new_citytiles       List[(x, y)]        Citytiles built this turn
+    removed_citytiles   List[(x, y)]        Citytiles gone this turn
+    spawned_units       List[List(str)]     Unit ids of each team that appeared
+    dead_units          List[Set(str)]      Unit ids of each team that disappeared
+    """
+
+    __slots__ = (
+        "full",
+        "depleted",
+        "regrown",
+        "amount_changed",
+        "new_citytiles",
+        "removed_citytiles",
+        "spawned_units",
+        "dead_units",
+    )
+
+    def __init__(self, full=False):
+        self.full = full
+        self.depleted = []
+        self.regrown = []
+        self.amount_changed = []
+        self.new_citytiles = []
+        self.removed_citytiles = []
+        self.spawned_units = [[], []]
+        self.dead_units = [set(), set()]
@@ -1,86 +1,219 @@
 from .constants import Constants
-from .game_map import GameMap
+from .game_map import GameMap, Position
+from .array_map import ArrayGameMap
 from .game_objects import Player, Unit, City, CityTile
+from .occupancy import OccupancyIndex
+from .delta import TurnDelta
+from .parser import parse_updates
 
 INPUT_CONSTANTS = Constants.INPUT_CONSTANTS
 
 
 class Game:
-    def _initialize(self, messages):
+    def _initialize(self, messages, incremental=False, array_map=False):
         """
         initialize state
+
+        incremental: keep the map, players, cities and units across turns
+        and only touch the cells / objects that changed (see `_update`)
+        array_map: store the map as NumPy planes (see lux/array_map.py)
         """
         self.id = int(messages[0])
         self.turn = -1
+        self.incremental = incremental
+        self.map_class = ArrayGameMap if array_map else GameMap
         # get some other necessary initial input
         mapInfo = messages[1].split(" ")
         self.map_width = int(mapInfo[0])
         self.map_height = int(mapInfo[1])
-        self.map = GameMap(self.map_width, self.map_height)
+        Position.intern(self.map_width, self.map_height)
+        self.map = self.map_class(self.map_width, self.map_height)
         self.players = [Player(0), Player(1)]
+        self.occupancy = OccupancyIndex(self.map_width, self.map_height, self.players)
+
+        # Cells that were set by the last update, used to reset the cells
+        # that no longer appear when updating incrementally
+        self._resource_positions = set()
+        self._citytile_positions = set()
+        self._road_positions = set()
+
+        # Listeners called with the TurnDelta of every update
+        self.listeners = []
+        self.delta = None
+
+    def subscribe(self, listener):
+        """
+        Call listener(delta) after every update, delta being the TurnDelta
+        of the turn (see lux/delta.py)
+        """
+        self.listeners.append(listener)
 
     def _end_turn(self):
         print("D_FINISH")
 
     def _reset_player_states(self):
-        self.players[0].units = []
-        self.players[0].cities = {}
-        self.players[0].city_tile_count = 0
-        self.players[1].units = []
-        self.players[1].cities = {}
-        self.players[1].city_tile_count = 0
+        for player in self.players:
+            player.units = []
+            player.units_by_id = {}
+            player.units_by_pos = {}
+            player.cities = {}
+            player.city_tile_count = 0
 
     def _update(self, messages):
         """
         update state
+
+        A full update throws the map away and rebuilds every object.
+        An incremental update reuses the map, units, cities and citytiles
+        of the previous turn, rewrites only the cells whose resource,
+        citytile or road changed and resets the cells that disappeared.
+        Both produce the same state.
+        The lines are parsed in bulk by lux/parser.py, then applied in
+        engine order (rp, r, u, c, ct, ccd), and the turn's occupancy index
+        (lux/occupancy.py) is built from the unit and citytile columns.
+        Finally the TurnDelta of the turn is handed to the listeners.
         """
-        self.map = GameMap(self.map_width, self.map_height)
         self.turn += 1
+        full = not self.incremental or self.turn == 0
+        previous_resource_positions = self._resource_positions
+        previous_citytile_positions = self._citytile_positions
+        previous_unit_ids = [player.units_by_id.keys() for player in self.players]
+
+        if self.incremental:
+            previous_units = [player.units_by_id for player in self.players]
+            previous_cities = [player.cities for player in self.players]
+        else:
+            self.map = self.map_class(self.map_width, self.map_height)
+            previous_units = [{}, {}]
+            previous_cities = [{}, {}]
+            self._resource_positions = set()
+            self._citytile_positions = set()
+            self._road_positions = set()
+
         self._reset_player_states()
 
-        for update in messages:
-            if update == "D_DONE":
-                break
-            strs = update.split(" ")
-            input_identifier = strs[0]
-            if input_identifier == INPUT_CONSTANTS.RESEARCH_POINTS:
-                team = int(strs[1])
-                self.players[team].research_points = int(strs[2])
-            elif input_identifier == INPUT_CONSTANTS.RESOURCES:
-                r_type = strs[1]
-                x = int(strs[2])
-                y = int(strs[3])
-                amt = int(float(strs[4]))
-                self.map._setResource(r_type, x, y, amt)
-            elif input_identifier == INPUT_CONSTANTS.UNITS:
-                unittype = int(strs[1])
-                team = int(strs[2])
-                unitid = strs[3]
-                x = int(strs[4])
-                y = int(strs[5])
-                cooldown = float(strs[6])
-                wood = int(strs[7])
-                coal = int(strs[8])
-                uranium = int(strs[9])
-                self.players[team].units.append(Unit(team, unittype, unitid, x, y, cooldown, wood, coal, uranium))
-            elif input_identifier == INPUT_CONSTANTS.CITY:
-                team = int(strs[1])
-                cityid = strs[2]
-                fuel = float(strs[3])
-                lightupkeep = float(strs[4])
-                self.players[team].cities[cityid] = City(team, cityid, fuel, lightupkeep)
-            elif input_identifier == INPUT_CONSTANTS.CITY_TILES:
-                team = int(strs[1])
-                cityid = strs[2]
-                x = int(strs[3])
-                y = int(strs[4])
-                cooldown = float(strs[5])
-                city = self.players[team].cities[cityid]
-                citytile = city._add_city_tile(x, y, cooldown)
-                self.map.get_cell(x, y).citytile = citytile
-                self.players[team].city_tile_count += 1;
-            elif input_identifier == INPUT_CONSTANTS.ROADS:
-                x = int(strs[1])
-                y = int(strs[2])
-                road = float(strs[3])
-                self.map.get_cell(x, y).road = road
+        updates = parse_updates(messages)
+        self._update_research_points(*updates[INPUT_CONSTANTS.RESEARCH_POINTS])
+        resource_positions, resource_changes = self._update_resources(
+            *updates[INPUT_CONSTANTS.RESOURCES]
+        )
+        self._update_units(previous_units, *updates[INPUT_CONSTANTS.UNITS])
+        self._update_cities(previous_cities, *updates[INPUT_CONSTANTS.CITY])
+        citytile_positions = self._update_city_tiles(*updates[INPUT_CONSTANTS.CITY_TILES])
+        road_positions = self._update_roads(*updates[INPUT_CONSTANTS.ROADS])
+
+        self._reset_missing_cells(resource_positions, citytile_positions, road_positions)
+
+        if self.map_class is ArrayGameMap:
+            self.map._setUnits(self.players)
+
+        self._update_occupancy(
+            updates[INPUT_CONSTANTS.UNITS], updates[INPUT_CONSTANTS.CITY_TILES]
+        )
+
+        self.delta = TurnDelta(full)
+        if not full:
+            self._update_delta(
+                self.delta,
+                previous_resource_positions,
+                resource_changes,
+                previous_citytile_positions,
+                previous_unit_ids,
+            )
+        for listener in self.listeners:
+            listener(self.delta)
+
+    def _update_delta(
+        self,
+        delta,
+        previous_resource_positions,
+        resource_changes,
+        previous_citytile_positions,
+        previous_unit_ids,
+    ):
+        delta.depleted = sorted(previous_resource_positions - self._resource_positions)
+        delta.regrown = sorted(self._resource_positions - previous_resource_positions)
+        delta.amount_changed = [
+            pos for pos in resource_changes if pos in previous_resource_positions
+        ]
+        delta.new_citytiles = sorted(self._citytile_positions - previous_citytile_positions)
+        delta.removed_citytiles = sorted(
+            previous_citytile_positions - self._citytile_positions
+        )
+        for player, previous_ids in zip(self.players, previous_unit_ids):
+            unit_ids = player.units_by_id.keys()
+            delta.spawned_units[player.team] = [
+                unit_id for unit_id in unit_ids if unit_id not in previous_ids
+            ]
+            delta.dead_units[player.team] = previous_ids - unit_ids
+
+    def _update_occupancy(self, units, citytiles):
+        unit_teams, unit_xs, unit_ys = units[1], units[3], units[4]
+        citytile_teams, citytile_xs, citytile_ys = citytiles[0], citytiles[2], citytiles[3]
+
+        self.occupancy = OccupancyIndex(self.map_width, self.map_height, self.players)
+        self.occupancy._set_units(unit_teams, unit_xs, unit_ys)
+        self.occupancy._set_citytiles(citytile_teams, citytile_xs, citytile_ys, self.map)
+
+    def _update_research_points(self, teams, points):
+        for team, research_points in zip(teams, points):
+            self.players[team].research_points = research_points
+
+    def _update_resources(self, r_types, xs, ys, amounts):
+        changes = []
+        for r_type, x, y, amt in zip(r_types, xs, ys, amounts):
+            if self.map._setResource(r_type, x, y, amt):
+                changes.append((x, y))
+        return set(zip(xs, ys)), changes
+
+    def _update_units(self, previous_units, unittypes, teams, unitids, xs, ys, cooldowns, woods, coals, uraniums):
+        for unittype, team, unitid, x, y, cooldown, wood, coal, uranium in zip(
+            unittypes, teams, unitids, xs, ys, cooldowns, woods, coals, uraniums
+        ):
+            unit = previous_units[team].get(unitid)
+            if unit is None or unit.type != unittype:
+                unit = Unit(team, unittype, unitid, x, y, cooldown, wood, coal, uranium)
+            else:
+                unit._update(x, y, cooldown, wood, coal, uranium)
+            self.players[team]._add_unit(unit)
+
+    def _update_cities(self, previous_cities, teams, cityids, fuels, lightupkeeps):
+        for team, cityid, fuel, lightupkeep in zip(teams, cityids, fuels, lightupkeeps):
+            city = previous_cities[team].get(cityid)
+            if city is None:
+                city = City(team, cityid, fuel, lightupkeep)
+            else:
+                city._update(fuel, lightupkeep)
+            self.players[team].cities[cityid] = city
+
+    def _update_city_tiles(self, teams, cityids, xs, ys, cooldowns):
+        for team, cityid, x, y, cooldown in zip(teams, cityids, xs, ys, cooldowns):
+            city = self.players[team].cities[cityid]
+            cell = self.map.get_cell(x, y)
+            citytile = cell.citytile
+            if citytile is not None and citytile.team == team and citytile.cityid == cityid:
+                city._keep_city_tile(citytile, cooldown)
+            else:
+                cell.citytile = city._add_city_tile(x, y, cooldown)
+            self.players[team].city_tile_count += 1
+        return set(zip(xs, ys))
+
+    def _update_roads(self, xs, ys, roads):
+        for x, y, road in zip(xs, ys, roads):
+            self.map.get_cell(x, y).road = road
+        return set(zip(xs, ys))
+
+    def _reset_missing_cells(self, resource_positions, citytile_positions, road_positions):
+        """
+        Reset the cells that were set last turn but did not appear in this update
+        """
+        for x, y in self._resource_positions - resource_positions:
+            self.map.get_cell(x, y).resource = None
+        for x, y in self._citytile_positions - citytile_positions:
+            self.map.get_cell(x, y).citytile = None
+        for x, y in self._road_positions - road_positions:
+            self.map.get_cell(x, y).road = 0
+
+        self._resource_positions = resource_positions
+        self._citytile_positions = citytile_positions
+        self._road_positions = road_positions
@@ -8,6 +8,8 @@ RESOURCE_TYPES = Constants.RESOURCE_TYPES
 
 
 class Resource:
+    __slots__ = ("type", "amount")
+
     def __init__(self, r_type: str, amount: int):
         self.type = r_type
         self.amount = amount
@@ -17,6 +19,8 @@ class Resource:
 
 
 class Cell:
+    __slots__ = ("pos", "resource", "citytile", "road")
+
     def __init__(self, x, y):
         self.pos = Position(x, y)
         self.resource: Resource = None
@@ -55,15 +59,94 @@ class GameMap:
     def _setResource(self, r_type, x, y, amount):
         """
         do not use this function, this is for internal tracking of state
+        Return whether the resource of the cell changed
         """
         cell = self.get_cell(x, y)
-        cell.resource = Resource(r_type, amount)
+        resource = cell.resource
+        if resource is None or resource.type != r_type or resource.amount != amount:
+            cell.resource = Resource(r_type, amount)
+            return True
+        return False
+
+    def get_resource_cells(self):
+        """
+        All cells with resources, scanned row by row
+        """
+        return [cell for row in self.map for cell in row if cell.has_resource()]
+
+
+# Flyweight cache of the positions inside the map, see Position.intern
+_interned_positions = []
+_interned_width = 0
+_interned_height = 0
+_interned_grids = {}
 
 
 class Position:
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+    """
+    Immutable, hashable map position
+
+    Positions inside the map size registered with Position.intern are
+    flyweights: Position(x, y) returns the same object every time, so they
+    are cheap to create and can be used directly as set / dict keys.
+    """
+
+    __slots__ = ("x", "y", "_hash")
+
+    def __new__(cls, x, y):
+        if (
+            x.__class__ is int
+            and y.__class__ is int
+            and 0 <= x < _interned_width
+            and 0 <= y < _interned_height
+        ):
+            return _interned_positions[y * _interned_width + x]
+        return cls._create(x, y)
+
+    @classmethod
+    def _create(cls, x, y):
+        pos = object.__new__(cls)
+        object.__setattr__(pos, "x", x)
+        object.__setattr__(pos, "y", y)
+        object.__setattr__(pos, "_hash", hash((x, y)))
+        return pos
+
+    @staticmethod
+    def intern(width, height):
+        """
+        Make the positions of a width x height map flyweights
+        The grid of each map size is built once and kept for later games
+        """
+        global _interned_positions, _interned_width, _interned_height
+
+        grid = _interned_grids.get((width, height))
+        if grid is None:
+            grid = [
+                Position._create(x, y) for y in range(height) for x in range(width)
+            ]
+            _interned_grids[(width, height)] = grid
+
+        _interned_positions = grid
+        _interned_width = width
+        _interned_height = height
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Position is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Position is immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Position, (self.x, self.y))
 
     def __sub__(self, pos) -> int:
         return abs(pos.x - self.x) + abs(pos.y - self.y)
@@ -78,6 +161,10 @@ class Position:
         return (self - pos) <= 1
 
     def __eq__(self, pos) -> bool:
+        if self is pos:
+            return True
+        if not isinstance(pos, Position):
+            return NotImplemented
         return self.x == pos.x and self.y == pos.y
 
     def equals(self, pos):
@@ -93,7 +180,7 @@ class Position:
         elif direction == DIRECTIONS.WEST:
             return Position(self.x - units, self.y)
         elif direction == DIRECTIONS.CENTER:
-            return Position(self.x, self.y)
+            return self
 
     def direction_to(self, target_pos: 'Position') -> DIRECTIONS:
         """
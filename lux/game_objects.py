@@ -12,8 +12,21 @@ class Player:
         self.team = team
         self.research_points = 0
         self.units: list[Unit] = []
+        self.units_by_id: Dict[str, Unit] = {}
+        self.units_by_pos: Dict[Position, list[Unit]] = {}
         self.cities: Dict[str, City] = {}
         self.city_tile_count = 0
+    def _add_unit(self, unit):
+        """
+        do not use this function, this is for internal tracking of state
+        """
+        self.units.append(unit)
+        self.units_by_id[unit.id] = unit
+        units_at_pos = self.units_by_pos.get(unit.pos)
+        if units_at_pos is None:
+            self.units_by_pos[unit.pos] = [unit]
+        else:
+            units_at_pos.append(unit)
     def researched_coal(self) -> bool:
         return self.research_points >= GAME_CONSTANTS["PARAMETERS"]["RESEARCH_REQUIREMENTS"]["COAL"]
     def researched_uranium(self) -> bool:
@@ -21,6 +34,8 @@ class Player:
 
 
 class City:
+    __slots__ = ("cityid", "team", "fuel", "citytiles", "light_upkeep")
+
     def __init__(self, teamid, cityid, fuel, light_upkeep):
         self.cityid = cityid
         self.team = teamid
@@ -31,11 +46,27 @@ class City:
         ct = CityTile(self.team, self.cityid, x, y, cooldown)
         self.citytiles.append(ct)
         return ct
+    def _keep_city_tile(self, citytile, cooldown):
+        """
+        re-attach a citytile from the previous turn (incremental updates)
+        """
+        citytile.cooldown = cooldown
+        self.citytiles.append(citytile)
+        return citytile
+    def _update(self, fuel, light_upkeep):
+        """
+        refresh this city for a new turn, its citytiles are re-added afterwards
+        """
+        self.fuel = fuel
+        self.light_upkeep = light_upkeep
+        self.citytiles = []
     def get_light_upkeep(self):
         return self.light_upkeep
 
 
 class CityTile:
+    __slots__ = ("cityid", "team", "pos", "cooldown")
+
     def __init__(self, teamid, cityid, x, y, cooldown):
         self.cityid = cityid
         self.team = teamid
@@ -64,6 +95,8 @@ class CityTile:
 
 
 class Cargo:
+    __slots__ = ("wood", "coal", "uranium")
+
     def __init__(self):
         self.wood = 0
         self.coal = 0
@@ -74,6 +107,8 @@ class Cargo:
 
 
 class Unit:
+    __slots__ = ("pos", "team", "id", "type", "cooldown", "cargo")
+
     def __init__(self, teamid, u_type, unitid, x, y, cooldown, wood, coal, uranium):
         self.pos = Position(x, y)
         self.team = teamid
@@ -84,6 +119,15 @@ class Unit:
         self.cargo.wood = wood
         self.cargo.coal = coal
         self.cargo.uranium = uranium
+    def _update(self, x, y, cooldown, wood, coal, uranium):
+        """
+        refresh this unit for a new turn (incremental updates)
+        """
+        self.pos = Position(x, y)
+        self.cooldown = cooldown
+        self.cargo.wood = wood
+        self.cargo.coal = coal
+        self.cargo.uranium = uranium
     def is_worker(self) -> bool:
         return self.type == UNIT_TYPES.WORKER
 
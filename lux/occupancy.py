@@ -0,0 +1,56 @@
+import numpy as np
+
+from .game_map import Position
+from .array_map import NO_TEAM
+
+
+class OccupancyIndex:
+    """
+    Who stands where this turn, built once per update by Game._update
+    from the parsed unit and citytile columns
+
+    unit_count          int16[2, width, height]     Units of each team on every cell
+    citytile_team       int8[width, height]         Team of the citytile on every cell
+                                                    (NO_TEAM elsewhere)
+    citytiles_by_pos    Dict[Position -> CityTile]  Citytiles of both teams
+    Units by position are kept by the players (Player.units_by_pos).
+
+    The region queries take the cells as coordinate arrays (xs, ys) and
+    cost O(|region|).
+    """
+
+    def __init__(self, width, height, players):
+        self.width = width
+        self.height = height
+        self.players = players
+        self.unit_count = np.zeros((2, width, height), dtype=np.int16)
+        self.citytile_team = np.full((width, height), NO_TEAM, dtype=np.int8)
+        self.citytiles_by_pos = {}
+
+    def _set_units(self, teams, xs, ys):
+        if len(teams):
+            np.add.at(self.unit_count, (teams, xs, ys), 1)
+
+    def _set_citytiles(self, teams, xs, ys, game_map):
+        if len(teams):
+            self.citytile_team[xs, ys] = teams
+        for x, y in zip(xs, ys):
+            self.citytiles_by_pos[Position(x, y)] = game_map.get_cell(x, y).citytile
+
+    def units_at(self, team, pos):
+        return self.players[team].units_by_pos.get(pos, [])
+
+    def citytile_at(self, pos):
+        return self.citytiles_by_pos.get(pos)
+
+    def count_units(self, team, xs, ys) -> int:
+        """
+        Units of `team` on the cells (xs, ys)
+        """
+        return int(self.unit_count[team, xs, ys].sum())
+
+    def count_citytiles(self, team, xs, ys) -> int:
+        """
+        Citytiles of `team` on the cells (xs, ys)
+        """
+        return int((self.citytile_team[xs, ys] == team).sum())
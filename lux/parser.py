@@ -0,0 +1,72 @@
+from .constants import Constants
+
+INPUT_CONSTANTS = Constants.INPUT_CONSTANTS
+
+
+def _amount(values):
+    try:
+        return list(map(int, values))
+    except ValueError:
+        return [int(float(value)) for value in values]
+
+
+def _ints(values):
+    return list(map(int, values))
+
+
+def _floats(values):
+    return list(map(float, values))
+
+
+def _strs(values):
+    return values
+
+
+# Column converters of every line type (the identifier excluded), in field order
+LINE_FORMATS = {
+    INPUT_CONSTANTS.RESEARCH_POINTS: (_ints, _ints),
+    INPUT_CONSTANTS.RESOURCES: (_strs, _ints, _ints, _amount),
+    INPUT_CONSTANTS.UNITS: (
+        _ints, _ints, _strs, _ints, _ints, _floats, _ints, _ints, _ints
+    ),
+    INPUT_CONSTANTS.CITY: (_ints, _strs, _floats, _floats),
+    INPUT_CONSTANTS.CITY_TILES: (_ints, _strs, _ints, _ints, _floats),
+    INPUT_CONSTANTS.ROADS: (_ints, _ints, _floats),
+}
+
+
+# Line types are told apart by their first two characters
+_LINE_KEYS = {
+    (identifier + " ")[:2]: identifier for identifier in LINE_FORMATS
+}
+
+
+def parse_updates(messages):
+    """
+    Parse one turn of update lines into columns
+
+    Lines are grouped through a table keyed by their first two characters,
+    then each group is joined, split once and its fields are converted
+    column by column.
+    Returns {identifier: [column, ...]}, every identifier of LINE_FORMATS
+    is present (with empty columns when the turn has no such line).
+    Unknown lines are ignored and parsing stops at D_DONE.
+    """
+    groups = {key: [] for key in _LINE_KEYS}
+    for update in messages:
+        group = groups.get(update[:2])
+        if group is not None:
+            group.append(update)
+        elif update == INPUT_CONSTANTS.DONE:
+            break
+
+    columns = {}
+    for key, identifier in _LINE_KEYS.items():
+        converters = LINE_FORMATS[identifier]
+        tokens = " ".join(groups[key]).split()
+        step = len(converters) + 1
+        columns[identifier] = [
+            convert(tokens[field::step])
+            for field, convert in enumerate(converters, start=1)
+        ]
+    return columns
@@ -0,0 +1,166 @@
+import pytest
+
+from lux.game import Game
+from lux.game_map import Position
+from lux.testing import snapshot
+
+
+TURNS = [
+    [
+        "rp 0 0",
+        "rp 1 0",
+        "r wood 0 0 400",
+        "r wood 1 0 20",
+        "r coal 3 3 300",
+        "u 0 0 u_1 1 1 0 0 0 0",
+        "u 0 1 u_2 2 2 1 10 0 0",
+        "c 0 c_1 100 23",
+        "ct 0 c_1 2 1 0",
+        "ccd 2 1 6",
+        "D_DONE",
+    ],
+    [
+        # wood at (1, 0) depleted, u_2 died, a second city appears
+        "rp 0 1",
+        "rp 1 0",
+        "r wood 0 0 410",
+        "r coal 3 3 300",
+        "u 0 0 u_1 1 2 1 20 0 0",
+        "u 0 0 u_3 2 1 0 0 0 0",
+        "c 0 c_1 90 23",
+        "c 1 c_2 50 23",
+        "ct 0 c_1 2 1 1",
+        "ct 1 c_2 0 3 0",
+        "ccd 2 1 6",
+        "ccd 0 3 6",
+        "D_DONE",
+    ],
+    [
+        # c_2 is gone, c_1 grew and the road at (0, 3) disappeared
+        "rp 0 2",
+        "rp 1 1",
+        "r wood 0 0 410",
+        "r coal 3 3 250",
+        "u 0 0 u_1 1 2 0 20 0 0",
+        "c 0 c_1 80 46",
+        "ct 0 c_1 2 1 0",
+        "ct 0 c_1 2 2 0",
+        "ccd 2 1 6",
+        "ccd 2 2 6",
+        "D_DONE",
+    ],
+]
+
+
+class TestClass:
+    def test_incremental_update_matches_full_rebuild(self):
+        full = Game()
+        full._initialize(["0", "4 4"])
+        incremental = Game()
+        incremental._initialize(["0", "4 4"], incremental=True)
+
+        for updates in TURNS:
+            full._update(updates)
+            incremental._update(updates)
+            assert snapshot(incremental) == snapshot(full)
+
+    def test_incremental_update_keeps_objects(self):
+        game = Game()
+        game._initialize(["0", "4 4"], incremental=True)
+
+        game._update(TURNS[0])
+        game_map = game.map
+        unit = game.players[0].units[0]
+        unit_pos = unit.pos
+        citytile = game.map.get_cell(2, 1).citytile
+
+        game._update(TURNS[1])
+
+        assert game.map is game_map
+        assert game.players[0].units[0] is unit
+        assert game.map.get_cell(2, 1).citytile is citytile
+        # positions handed out earlier do not follow the unit
+        assert (unit_pos.x, unit_pos.y) == (1, 1)
+        assert game.map.get_cell(1, 0).resource is None
+
+    def test_array_map_matches_object_map(self):
+        objects = Game()
+        objects._initialize(["0", "4 4"], incremental=True)
+        arrays = Game()
+        arrays._initialize(["0", "4 4"], incremental=True, array_map=True)
+
+        for updates in TURNS:
+            objects._update(updates)
+            arrays._update(updates)
+            assert snapshot(arrays) == snapshot(objects)
+
+        # The planes are [x, y], as the occupancy index
+        assert arrays.map.units[0, 1, 2] == 1
+        assert arrays.map.units.sum() == 1
+        assert (arrays.map.citytile_team == arrays.occupancy.citytile_team).all()
+        assert (arrays.map.units == arrays.occupancy.unit_count).all()
+        assert [cell.pos.x for cell in arrays.map.get_resource_cells()] == [0, 3]
+
+    def test_positions_are_interned(self):
+        game = Game()
+        game._initialize(["0", "4 4"], incremental=True)
+        game._update(TURNS[0])
+
+        unit = game.players[0].units[0]
+        assert Position(1, 1) is unit.pos
+        assert game.map.get_cell(1, 1).pos is unit.pos
+        assert game.players[0].units_by_pos[Position(1, 1)] == [unit]
+        assert Position(2, 1).translate("w", 1) is unit.pos
+        # outside the map positions are plain values
+        assert Position(-1, 1) == Position(-1, 1)
+        assert len({Position(-1, 1), Position(-1, 1), unit.pos}) == 2
+
+        with pytest.raises(AttributeError):
+            unit.pos.x = 3
+
+    def test_occupancy_index(self):
+        game = Game()
+        game._initialize(["0", "4 4"], incremental=True)
+        game._update(TURNS[0])
+        game._update(TURNS[1])
+
+        occupancy = game.occupancy
+        assert occupancy.unit_count[0, 1, 2] == 1
+        assert occupancy.unit_count[0, 2, 1] == 1
+        assert occupancy.unit_count.sum() == 2
+        assert occupancy.citytile_team[2, 1] == 0
+        assert occupancy.citytile_team[0, 3] == 1
+        assert occupancy.citytile_at(Position(0, 3)) is game.map.get_cell(0, 3).citytile
+        assert occupancy.units_at(0, Position(1, 2)) == [game.players[0].units_by_id["u_1"]]
+        assert occupancy.count_units(0, [1, 2, 3], [2, 1, 3]) == 2
+        assert occupancy.count_citytiles(1, [0, 2], [3, 1]) == 1
+
+        # Rebuilt every turn: c_2 and u_3 are gone
+        game._update(TURNS[2])
+        assert game.occupancy.count_citytiles(1, [0], [3]) == 0
+        assert game.occupancy.unit_count.sum() == 1
+
+    def test_turn_delta(self):
+        game = Game()
+        game._initialize(["0", "4 4"], incremental=True)
+        deltas = []
+        game.subscribe(deltas.append)
+        for updates in TURNS:
+            game._update(updates)
+
+        assert [delta.full for delta in deltas] == [True, False, False]
+
+        delta = deltas[1]
+        assert delta.depleted == [(1, 0)]
+        assert delta.regrown == []
+        assert delta.amount_changed == [(0, 0)]
+        assert delta.new_citytiles == [(0, 3)]
+        assert delta.spawned_units == [["u_3"], []]
+        assert delta.dead_units == [set(), {"u_2"}]
+
+        delta = deltas[2]
+        assert delta.amount_changed == [(3, 3)]
+        assert delta.new_citytiles == [(2, 2)]
+        assert delta.removed_citytiles == [(0, 3)]
+        assert delta.spawned_units == [[], []]
+        assert delta.dead_units == [{"u_3"}, set()]
@@ -0,0 +1,69 @@
+#
+#
+# Helpers shared by the unit tests
+#
+#
+from lux.game import Game
+
+
+def game_from_lines(width, height, lines=()):
+    """
+    Game of player 0 on a width x height map after one update with `lines`
+    """
+    game = Game()
+    game._initialize(["0", f"{width} {height}"], incremental=True)
+    game._update(list(lines) + ["D_DONE"])
+    return game
+
+
+def snapshot(game):
+    """
+    Plain data view of a game state, used to compare two update paths
+    """
+    cells = []
+    for y in range(game.map.height):
+        for x in range(game.map.width):
+            cell = game.map.get_cell(x, y)
+            resource = None
+            if cell.resource is not None:
+                resource = (cell.resource.type, cell.resource.amount)
+            citytile = None
+            if cell.citytile is not None:
+                citytile = (
+                    cell.citytile.team,
+                    cell.citytile.cityid,
+                    cell.citytile.cooldown,
+                )
+            cells.append((x, y, resource, citytile, cell.road))
+
+    players = []
+    for player in game.players:
+        units = [
+            (
+                unit.id,
+                unit.type,
+                unit.team,
+                unit.pos.x,
+                unit.pos.y,
+                unit.cooldown,
+                unit.cargo.wood,
+                unit.cargo.coal,
+                unit.cargo.uranium,
+            )
+            for unit in player.units
+        ]
+        cities = [
+            (
+                cityid,
+                city.team,
+                city.fuel,
+                city.light_upkeep,
+                [(ct.pos.x, ct.pos.y, ct.cooldown) for ct in city.citytiles],
+            )
+            for cityid, city in player.cities.items()
+        ]
+        players.append(
+            (player.research_points, player.city_tile_count, units, cities)
+        )
+
+    return game.turn, cells, players
@@ -0,0 +1,28 @@
+import agent as agent_module
+from agent import agent, ARRAY_MAP_ENV
+from lux.array_map import ArrayGameMap
+from Benchmarks.observations import generate_observations
+from Driver.turnDriver import Observation
+
+
+def play(observations):
+    actions = []
+    for step, updates in enumerate(observations):
+        observation = Observation(0)
+        observation["updates"] = updates
+        observation["step"] = step
+        actions.append(agent(observation, {"actTimeout": float("inf")}))
+    return actions
+
+
+class TestClass:
+    def test_array_map_plays_as_the_object_map(self, monkeypatch):
+        observations = generate_observations(16, 16, 10, 30)
+
+        monkeypatch.delenv(ARRAY_MAP_ENV, raising=False)
+        expected = play(observations)
+        assert sum(len(actions) for actions in expected) > 0
+
+        monkeypatch.setenv(ARRAY_MAP_ENV, "1")
+        assert play(observations) == expected
+        assert isinstance(agent_module.game_state.map, ArrayGameMap)